@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: serialização da resposta /api/stats/offense
+
+Monta o payload ofensivo completo a partir de um release sintético do
+nflverse (_offensive_records) e compara:
+- response: sanitize_for_json + jsonable_encoder do FastAPI (se instalado)
+  + json.dumps da JSONResponse (caminho antigo) vs. FastJSONResponse.render
+  (serialization.dumps, orjson em uma passada)
+- cache: sanitize_for_json + json.dump (write_cache antigo) vs. dumps
+
+Confere que os dois caminhos produzem o mesmo JSON depois de decodificado.
+
+Uso (a partir de backend/):
+    python -m benchmarks.json_serialization [--rows 20000 100000] [--repeat 5]
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.nflverse_columns import make_release  # noqa: E402
+from cache import sanitize_for_json  # noqa: E402
+from serialization import dumps, loads  # noqa: E402
+from sources import nflverse  # noqa: E402
+
+try:
+    from fastapi.encoders import jsonable_encoder
+except ImportError:  # FastAPI não instalado: mede só sanitize + json.dumps
+    jsonable_encoder = None
+
+
+def make_payload(rows: int) -> dict:
+    """Payload da rota /api/stats/offense para um release com `rows` linhas semanais"""
+    stats_df = make_release("player_stats", rows)
+    rosters_df = nflverse._normalize_dates(make_release("rosters", rows))
+    dimension = nflverse.build_roster_dimension(rosters_df, date(2025, 1, 1))
+    players = nflverse._offensive_records(stats_df, dimension)
+    return {
+        "source": "nflverse",
+        "cached": True,
+        "cache_age_seconds": 120,
+        "count": len(players),
+        "players": players,
+        "season": 2024,
+        "attribution": "Data from nflverse (CC-BY-SA 4.0)",
+    }
+
+
+def old_response(payload: dict) -> bytes:
+    content = sanitize_for_json(payload)
+    if jsonable_encoder is not None:
+        content = jsonable_encoder(content)
+    # Mesmo json.dumps de starlette.responses.JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def old_cache(payload: dict) -> bytes:
+    return json.dumps(sanitize_for_json(payload)).encode("utf-8")
+
+
+def best_of(fn, payload: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[20000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"jsonable_encoder: {'sim' if jsonable_encoder is not None else 'não (FastAPI ausente)'}")
+    print(f"{'rows':>8} {'players':>8} {'path':>9} {'old (s)':>10} {'orjson (s)':>11} {'speedup':>9} {'MB':>6}")
+    for rows in args.rows:
+        payload = make_payload(rows)
+        new_bytes = dumps(payload)
+        assert loads(new_bytes) == json.loads(old_response(payload)), "payloads diferentes"
+
+        for label, old in (("response", old_response), ("cache", old_cache)):
+            t_old = best_of(old, payload, args.repeat)
+            t_new = best_of(dumps, payload, args.repeat)
+            print(
+                f"{rows:>8} {payload['count']:>8} {label:>9} {t_old:>10.4f} {t_new:>11.4f} "
+                f"{t_old / t_new:>8.1f}x {len(new_bytes) / 1e6:>6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
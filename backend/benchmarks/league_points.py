@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: pontos exatos por liga (loop por jogador vs. produto de matrizes)
+
+Gera um pool sintético (benchmarks.value_engine.make_players) e N ligas com
+scoring_settings aleatórios no formato do Sleeper, e compara:
+- scalar: soma stat * peso por jogador e por liga em Python
+- matrix: build_stat_matrix uma vez + StatMatrix.ppg_many (um produto
+  jogadores x ligas)
+
+Confere que os dois caminhos dão os mesmos PPG. O caminho escalar roda em
+até --scalar-leagues ligas e é extrapolado linearmente para N.
+
+Uso (a partir de backend/):
+    python -m benchmarks.league_points [--players 2000] [--leagues 1 100 5000] [--repeat 3]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.value_engine import make_players  # noqa: E402
+from dynasty_pulse.league_points import (  # noqa: E402
+    IDP_STAT_MAP,
+    OFFENSIVE_STAT_MAP,
+    build_stat_matrix,
+    scoring_matrix,
+)
+from dynasty_pulse.scoring_adjust import SLEEPER_KEY_MAP  # noqa: E402
+
+_OUR_TO_SLEEPER = {our_key: sleeper_key for sleeper_key, our_key in SLEEPER_KEY_MAP.items()}
+
+
+def make_leagues(n: int, seed: int = 7) -> list[dict]:
+    """n scoring_settings no formato do Sleeper (PPR, TEP, 6pt, IDP variados)"""
+    rng = random.Random(seed)
+    leagues = []
+    for _ in range(n):
+        settings = {
+            "pass_yd": rng.choice([0.04, 0.05]),
+            "pass_td": rng.choice([4.0, 5.0, 6.0]),
+            "pass_int": rng.choice([-1.0, -2.0]),
+            "rush_yd": 0.1,
+            "rush_td": 6.0,
+            "rec": rng.choice([0.0, 0.5, 1.0]),
+            "rec_yd": 0.1,
+            "rec_td": 6.0,
+            "fum_lost": -2.0,
+        }
+        if rng.random() < 0.3:
+            settings["bonus_rec_te"] = rng.choice([0.5, 1.0])
+        if rng.random() < 0.5:
+            settings.update({
+                "idp_tkl_solo": rng.choice([1.0, 1.5, 2.0]),
+                "idp_tkl_ast": rng.choice([0.5, 0.75]),
+                "idp_tkl_loss": 1.0,
+                "idp_sack": rng.choice([2.0, 3.0, 4.0]),
+                "idp_qb_hit": 0.5,
+                "idp_ff": 2.0,
+                "idp_fum_rec": 2.0,
+                "idp_int": rng.choice([3.0, 4.0]),
+                "idp_pass_def": 1.0,
+                "idp_def_td": 6.0,
+            })
+        leagues.append(settings)
+    return leagues
+
+
+def scalar_ppg(offensive: list[dict], defensive: list[dict], settings: dict) -> list[float]:
+    """PPG de todos os jogadores em uma liga, jogador a jogador"""
+    rows = [(p, p["position"], OFFENSIVE_STAT_MAP) for p in offensive] + \
+        [(p, p["fantasyPosition"], IDP_STAT_MAP) for p in defensive]
+    result = []
+    for player, position, stat_map in rows:
+        stats = player["stats"]
+        points = 0.0
+        for key, stat_keys in stat_map.items():
+            if key == "bonus_rec_te" and position != "TE":
+                continue
+            weight = settings.get(_OUR_TO_SLEEPER[key], 0.0)
+            if key == "tkl_solo" and not stats.get("soloTackles"):
+                stat_keys = ("tackles",)
+            for stat_key in stat_keys:
+                points += (stats.get(stat_key) or 0) * weight
+        games = stats.get("games")
+        result.append(points / max(1, 17 if games is None else games))
+    return result
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--leagues", type=int, nargs="+", default=[1, 100, 5000])
+    parser.add_argument("--scalar-leagues", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    offensive, defensive = make_players(args.players)
+    matrix = build_stat_matrix(offensive, defensive)
+    print(f"matriz: {matrix.values.shape[0]} jogadores x {matrix.values.shape[1]} colunas")
+    print(f"{'leagues':>8} {'scalar (s)':>12} {'matrix (s)':>12} {'speedup':>9}")
+
+    for n in args.leagues:
+        leagues = make_leagues(n)
+        vectors = scoring_matrix(leagues)
+        sample = leagues[:args.scalar_leagues]
+
+        expected = np.array([scalar_ppg(offensive, defensive, settings) for settings in sample]).T
+        if not np.allclose(matrix.ppg_many(vectors)[:, :len(sample)], expected):
+            raise SystemExit(f"Mismatch nos PPG ({n} ligas)")
+
+        t_scalar = best_of(lambda: [scalar_ppg(offensive, defensive, s) for s in sample], args.repeat)
+        t_scalar *= n / len(sample)
+        t_matrix = best_of(lambda: matrix.ppg_many(scoring_matrix(leagues)), args.repeat)
+        print(f"{n:>8} {t_scalar:>12.4f} {t_matrix:>12.4f} {t_scalar / t_matrix:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
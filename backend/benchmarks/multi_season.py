@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: agregação multi-temporada por jogador vs. colunar
+
+Compara o caminho antigo do endpoint /api/dynasty-pulse/values/multi-season
+(aggregate_player_stats + get_player_trends por player_id) com
+aggregate_all_player_stats + get_all_player_trends, conferindo que os
+resultados são idênticos, para 3 a 12 temporadas.
+
+Uso (a partir de backend/):
+    python -m benchmarks.multi_season [--players 3000] [--seasons 3 5 10 12] [--repeat 3]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dynasty_pulse.multi_season import (  # noqa: E402
+    AGGREGATED_STATS,
+    aggregate_all_player_stats,
+    aggregate_player_stats,
+    get_all_player_trends,
+    get_current_season,
+    get_player_trends,
+)
+
+POSITIONS = ["QB", "RB", "WR", "TE", "K"]
+
+
+def make_seasons(num_players: int, num_seasons: int, seed: int = 42) -> dict:
+    """season -> player_id -> player, com ~80% dos jogadores em cada temporada"""
+    rng = random.Random(seed)
+    keys = list(dict.fromkeys(AGGREGATED_STATS))
+    positions = [rng.choice(POSITIONS) for _ in range(num_players)]
+    current = get_current_season()
+
+    data = {}
+    for season in range(current, current - num_seasons, -1):
+        players = {}
+        for i in range(num_players):
+            if rng.random() < 0.8:
+                stats = {k: rng.randint(0, 400) for k in keys}
+                players[f"p{i}"] = {"id": f"p{i}", "name": f"Player {i}", "position": positions[i], "stats": stats}
+        data[season] = players
+    return data
+
+
+def run_scalar(data: dict) -> dict:
+    player_ids = {player_id for players in data.values() for player_id in players}
+    results = {}
+    for player_id in player_ids:
+        aggregated, per_season = aggregate_player_stats(data, player_id)
+        results[player_id] = (aggregated, get_player_trends(per_season, aggregated["position"]))
+    return results
+
+
+def run_batch(data: dict) -> dict:
+    aggregated = aggregate_all_player_stats(data)
+    trends = get_all_player_trends(
+        {player_id: per_season for player_id, (_, per_season) in aggregated.items()},
+        {player_id: player["position"] for player_id, (player, _) in aggregated.items()},
+    )
+    return {player_id: (player, trends[player_id]) for player_id, (player, _) in aggregated.items()}
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=3000)
+    parser.add_argument("--seasons", type=int, nargs="+", default=[3, 5, 10, 12])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'seasons':>8} {'players':>8} {'scalar (s)':>12} {'batch (s)':>12} {'speedup':>9}")
+    for num_seasons in args.seasons:
+        data = make_seasons(args.players, num_seasons)
+        if run_scalar(data) != run_batch(data):
+            raise SystemExit(f"Mismatch com {num_seasons} temporadas")
+
+        t_scalar = _best_of(lambda: run_scalar(data), args.repeat)
+        t_batch = _best_of(lambda: run_batch(data), args.repeat)
+        print(f"{num_seasons:>8} {args.players:>8} {t_scalar:>12.4f} {t_batch:>12.4f} {t_scalar / t_batch:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: leitura do nflverse com e sem projeção de colunas
+
+Gera Parquets sintéticos no formato dos releases (stats ofensivas,
+defensivas e roster semanal, com as colunas extras que as transformações
+não usam) e compara, por dataset:
+- all: pd.read_parquet sem columns= (comportamento antigo)
+- projected: _read_parquet com PLAYER_STATS_COLUMNS / PLAYER_STATS_DEF_COLUMNS / ROSTER_COLUMNS
+
+Mede tamanho do arquivo de cache, tempo de leitura do cache e pico de RSS
+(cada medição roda em um subprocesso próprio), e confere que o payload
+transformado é idêntico.
+
+Uso (a partir de backend/):
+    python -m benchmarks.nflverse_columns [--rows 20000]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from sources import nflverse  # noqa: E402
+
+DATASETS = {
+    "player_stats": nflverse.PLAYER_STATS_COLUMNS,
+    "player_stats_def": nflverse.PLAYER_STATS_DEF_COLUMNS,
+    "rosters": nflverse.ROSTER_COLUMNS,
+}
+
+
+def make_release(name: str, rows: int, seed: int = 0) -> pd.DataFrame:
+    """DataFrame com as colunas usadas + ~40 colunas extras como nos releases"""
+    rng = np.random.default_rng(seed)
+    players = [f"00-{i % (rows // 15 + 1):07d}" for i in range(rows)]
+    df = pd.DataFrame({
+        "player_id": players,
+        "gsis_id": players,
+        "player_name": [f"P.Player{i % 997}" for i in range(rows)],
+        "player_display_name": [f"Player Name {i % 997}" for i in range(rows)],
+        "position": rng.choice(["QB", "RB", "WR", "TE", "DE", "LB", "CB", "S"], rows),
+        "recent_team": rng.choice(["KC", "BUF", "SF", "DAL"], rows),
+        "team": rng.choice(["KC", "BUF", "SF", "DAL"], rows),
+        "season": 2024,
+        "week": rng.integers(1, 19, rows),
+        "birth_date": pd.to_datetime("1990-01-01") + pd.to_timedelta(rng.integers(0, 4000, rows), unit="D"),
+        "headshot_url": [f"https://static.www.nfl.com/image/private/{i % 997}.png" for i in range(rows)],
+        "years_exp": rng.integers(0, 15, rows),
+        "jersey_number": rng.integers(1, 99, rows),
+    })
+    stat_columns = nflverse.OFFENSIVE_STAT_COLUMNS if name == "player_stats" else nflverse.DEFENSIVE_STAT_COLUMNS
+    if name != "rosters":
+        for column in stat_columns:
+            df[column] = rng.integers(0, 40, rows).astype(float)
+    # Colunas que nenhuma transformação usa
+    for i in range(25):
+        df[f"extra_num_{i}"] = rng.random(rows)
+    for i in range(15):
+        df[f"extra_text_{i}"] = [f"value-{i}-{j % 5000}" for j in range(rows)]
+    return df
+
+
+def measure(source: str, columns_json: str, cache_path: str) -> dict:
+    """Lê o release (todas as colunas ou projetado), escreve e relê o cache"""
+    columns = json.loads(columns_json)
+    df = pd.read_parquet(source) if columns is None else nflverse._read_parquet(source, columns)
+    df.to_parquet(cache_path, index=False)
+    start = time.perf_counter()
+    pd.read_parquet(cache_path)
+    load_seconds = time.perf_counter() - start
+    return {
+        "columns": len(df.columns),
+        "cache_bytes": Path(cache_path).stat().st_size,
+        "load_seconds": load_seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_isolated(source: str, columns, cache_path: str) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, "-m", "benchmarks.nflverse_columns", "--measure", source, json.dumps(columns), cache_path],
+        cwd=Path(__file__).parent.parent,
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--measure", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return
+
+    tmp = Path(tempfile.mkdtemp())
+    releases = {}
+    for name in DATASETS:
+        releases[name] = make_release(name, args.rows if name != "rosters" else args.rows // 4)
+        releases[name].to_parquet(tmp / f"{name}.parquet", index=False)
+
+    print(f"{'dataset':>17} {'read':>10} {'cols':>5} {'cache (KB)':>11} {'load (ms)':>10} {'peak RSS (MB)':>14}")
+    for name, columns in DATASETS.items():
+        source = str(tmp / f"{name}.parquet")
+        for label, cols in [("all", None), ("projected", columns)]:
+            result = run_isolated(source, cols, str(tmp / f"cache_{name}_{label}.parquet"))
+            print(
+                f"{name:>17} {label:>10} {result['columns']:>5} {result['cache_bytes'] / 1024:>11.0f} "
+                f"{result['load_seconds'] * 1000:>10.1f} {result['peak_rss_mb']:>14.1f}"
+            )
+
+    # Payload final idêntico com e sem projeção
+    rosters_all = pd.read_parquet(tmp / "rosters.parquet")
+    rosters_projected = nflverse._read_parquet(str(tmp / "rosters.parquet"), nflverse.ROSTER_COLUMNS)
+    for name, records in [("player_stats", nflverse._offensive_records), ("player_stats_def", nflverse._defensive_records)]:
+        source = str(tmp / f"{name}.parquet")
+        full = records(pd.read_parquet(source), rosters_all)
+        projected = records(nflverse._read_parquet(source, DATASETS[name]), rosters_projected)
+        if full != projected:
+            raise SystemExit(f"Payload diferente em {name}")
+    print("payloads idênticos")
+
+
+if __name__ == "__main__":
+    main()
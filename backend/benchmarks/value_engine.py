@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: pipeline escalar vs. batch (NumPy) do Dynasty Pulse
+
+Gera um pool sintético de jogadores (ofensa + IDP), confere que
+calculate_all_player_values_batch produz exatamente os mesmos breakdowns
+que calculate_all_player_values e mede os dois em 2k, 20k e 200k linhas.
+
+Duas medições por tamanho:
+- core: calculate_player_value por jogador vs. calculate_values_batch sobre
+  colunas já extraídas (só o pipeline numérico)
+- dicts: calculate_all_player_values vs. calculate_all_player_values_batch
+  (inclui extração das stats e montagem dos breakdowns)
+
+Uso (a partir de backend/):
+    python -m benchmarks.value_engine [--sizes 2000 20000 200000] [--repeat 3]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dynasty_pulse import (  # noqa: E402
+    calculate_all_player_values,
+    calculate_all_player_values_batch,
+    calculate_player_value,
+    calculate_values_batch,
+    stats_to_columns,
+)
+
+OFFENSE = ["QB", "RB", "WR", "TE", "K"]
+DEFENSE = ["DL", "LB", "DB"]
+
+
+def _maybe(rng: random.Random, value, missing: float = 0.15):
+    """Valor ou ausente/None, para exercitar os defaults de stats.get"""
+    roll = rng.random()
+    if roll < missing / 2:
+        return None
+    if roll < missing:
+        return 0
+    return value
+
+
+def make_players(n: int, seed: int = 42) -> tuple[list[dict], list[dict]]:
+    """Gera n jogadores sintéticos (~70% ofensa, ~30% IDP)"""
+    rng = random.Random(seed)
+    offensive, defensive = [], []
+    for i in range(n):
+        age = rng.choice([None] + list(range(20, 42)))
+        if rng.random() < 0.7:
+            stats = {
+                "games": _maybe(rng, rng.randint(1, 17)),
+                "fantasyPointsPpr": _maybe(rng, round(rng.uniform(0, 400), 1), 0.4),
+                "passingYards": rng.randint(0, 5000),
+                "passingTds": rng.randint(0, 45),
+                "interceptions": rng.randint(0, 20),
+                "rushingYards": rng.randint(-20, 1800),
+                "rushingTds": rng.randint(0, 20),
+                "receptions": rng.randint(0, 130),
+                "receivingYards": rng.randint(0, 1800),
+                "receivingTds": rng.randint(0, 18),
+                "fumblesLost": rng.randint(0, 6),
+            }
+            stats = {k: v for k, v in stats.items() if v is not None}
+            offensive.append({
+                "id": f"off-{i}",
+                "name": f"Player {i}",
+                "position": rng.choice(OFFENSE),
+                "team": "KC",
+                "age": age,
+                "stats": stats,
+            })
+        else:
+            stats = {
+                "games": _maybe(rng, rng.randint(1, 17)),
+                "soloTackles": _maybe(rng, rng.randint(0, 120)),
+                "tackles": rng.randint(0, 150),
+                "assistTackles": rng.randint(0, 60),
+                "sacks": round(rng.uniform(0, 18), 1),
+                "tfl": rng.randint(0, 25),
+                "qbHits": rng.randint(0, 40),
+                "interceptions": rng.randint(0, 8),
+                "passesDefended": rng.randint(0, 20),
+                "forcedFumbles": rng.randint(0, 6),
+                "fumbleRecoveryOpp": rng.randint(0, 3),
+                "fumbleRecoveryOwn": rng.randint(0, 2),
+                "defensiveTds": rng.randint(0, 3),
+            }
+            stats = {k: v for k, v in stats.items() if v is not None}
+            defensive.append({
+                "id": f"def-{i}",
+                "name": f"Player {i}",
+                "fantasyPosition": rng.choice(DEFENSE),
+                "teamAbbr": "BUF",
+                "age": age,
+                "stats": stats,
+            })
+    return offensive, defensive
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _report(size: int, label: str, t_scalar: float, t_batch: float) -> None:
+    print(f"{size:>8} {label:>14} {t_scalar:>12.4f} {t_batch:>12.4f} {t_scalar / t_batch:>8.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 20_000, 200_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'variant':>14} {'scalar (s)':>12} {'batch (s)':>12} {'speedup':>9}")
+    for size in args.sizes:
+        offensive, defensive = make_players(size)
+        for superflex, tep in [(False, False), (True, True)]:
+            variant = "sf+tep" if superflex else "1qb"
+
+            # Core numérico: mesmas linhas, colunas extraídas fora da medição
+            rows = [(p["position"], p) for p in offensive] + [(p["fantasyPosition"], p) for p in defensive]
+            positions = [pos for pos, _ in rows]
+            ages = [p["age"] for _, p in rows]
+            stats = [p["stats"] for _, p in rows]
+            columns = stats_to_columns(stats)
+
+            def run_scalar():
+                return [
+                    calculate_player_value(s, pos, age, superflex, tep)
+                    for pos, age, s in zip(positions, ages, stats)
+                ]
+
+            def run_batch():
+                return calculate_values_batch(positions, ages, columns, superflex, tep)
+
+            if run_scalar() != run_batch()["final_value"].tolist():
+                raise SystemExit(f"Mismatch no core ({size} linhas, {variant})")
+            _report(size, f"core {variant}", _best_of(run_scalar, args.repeat), _best_of(run_batch, args.repeat))
+
+            scalar = calculate_all_player_values(offensive, defensive, superflex, tep)
+            batch = calculate_all_player_values_batch(offensive, defensive, superflex, tep)
+            if scalar != batch:
+                mismatched = next(pid for pid in scalar if scalar[pid] != batch.get(pid))
+                raise SystemExit(f"Mismatch em {mismatched}:\n{scalar[mismatched]}\n{batch.get(mismatched)}")
+
+            t_scalar = _best_of(lambda: calculate_all_player_values(offensive, defensive, superflex, tep), args.repeat)
+            t_batch = _best_of(
+                lambda: calculate_all_player_values_batch(offensive, defensive, superflex, tep), args.repeat
+            )
+            _report(size, f"dicts {variant}", t_scalar, t_batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,108 @@
 """
 Cache local para dados de NFL stats
 Suporta diferentes TTLs para diferentes fontes de dados
+
+Dois níveis:
+- memória: LRU limitado por número de entradas, com o mesmo TTL do disco
+- disco (cache_data/), em formatos plugáveis via register_cache_storage:
+  - json: payloads pequenos (listas de temporadas, respostas já transformadas)
+  - parquet / arrow: DataFrames colunares, lidos sem criar objetos Python por linha
+
+Entradas baixadas de upstream guardam validadores (ETag, Last-Modified, hash
+do conteúdo) no sidecar .meta.json. Quando o TTL expira, o download vira um
+request condicional; se nada mudou (304), o TTL é renovado sem transferir nem
+reprocessar os dados, e a versão da entrada continua a mesma.
 """
 
-import json
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Any
+from typing import Callable, Optional, Any
+
+import pandas as pd
+
+from config import CACHE_FRAME_FORMAT, MEMORY_CACHE_MAX_ENTRIES, SLEEPER_LEAGUE_TTL, TANK01_PARTIAL_TTL
+from serialization import dumps, loads
 
 CACHE_DIR = Path(__file__).parent / "cache_data"
 
 # Default TTLs (pode ser sobrescrito via config)
 DEFAULT_TTL_SECONDS = 86400  # 24 horas
 TTL_TANK01 = 3600           # 1 hora - dados live
+TTL_TANK01_PARTIAL = TANK01_PARTIAL_TTL  # 5 min - sweep parcial (times falhando)
 TTL_NFLVERSE = 86400        # 24 horas - dados históricos
+TTL_SLEEPER = SLEEPER_LEAGUE_TTL  # 1 hora - configurações de liga
+
+
+# Registro de formatos: nome -> (extensão, leitor, escritor)
+_STORAGES: dict[str, tuple[str, Callable[[Path], Any], Callable[[Path, Any], None]]] = {}
+
+
+def register_cache_storage(
+    fmt: str,
+    suffix: str,
+    reader: Callable[[Path], Any],
+    writer: Callable[[Path, Any], None],
+) -> None:
+    """Registra um formato de armazenamento para o cache"""
+    _STORAGES[fmt] = (suffix, reader, writer)
+
+
+def _read_json(path: Path) -> Any:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def _write_json(path: Path, data: Any) -> None:
+    with open(path, "wb") as f:
+        f.write(dumps(data))
+
 
+def _read_parquet(path: Path) -> pd.DataFrame:
+    return pd.read_parquet(path)
 
-def get_cache_path(key: str, season: int) -> Path:
+
+def _write_parquet(path: Path, df: pd.DataFrame) -> None:
+    df.to_parquet(path, index=False)
+
+
+def _read_arrow(path: Path) -> pd.DataFrame:
+    # Arrow IPC (Feather v2) com memory map: leitura sem cópia por linha
+    import pyarrow.feather as feather
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+def _write_arrow(path: Path, df: pd.DataFrame) -> None:
+    import pyarrow.feather as feather
+    feather.write_feather(df.reset_index(drop=True), path)
+
+
+def get_cache_path(key: str, season: int, fmt: str = "json") -> Path:
     """Retorna o caminho do arquivo de cache"""
     CACHE_DIR.mkdir(exist_ok=True)
-    return CACHE_DIR / f"{key}_{season}.json"
+    suffix = _STORAGES[fmt][0]
+    return CACHE_DIR / f"{key}_{season}{suffix}"
+
+
+def _find_cache_file(key: str, season: int) -> tuple[Path, str]:
+    """Retorna (caminho, formato) do arquivo existente; JSON se nenhum existir"""
+    for fmt in _STORAGES:
+        path = get_cache_path(key, season, fmt)
+        if path.exists():
+            return path, fmt
+    return get_cache_path(key, season), "json"
+
+
+def find_cache_path(key: str, season: int) -> Path:
+    """
+    Retorna o arquivo de cache existente para key/season, em qualquer formato.
+    Se nenhum existir, retorna o caminho JSON (que não existe).
+    """
+    return _find_cache_file(key, season)[0]
 
 
 def get_cache_metadata_path(key: str, season: int) -> Path:
@@ -31,10 +113,14 @@ def get_cache_metadata_path(key: str, season: int) -> Path:
 
 def get_ttl_for_key(key: str) -> int:
     """Retorna o TTL apropriado baseado no key do cache"""
-    if key.startswith("tank01"):
+    if key.startswith("tank01_partial"):
+        return TTL_TANK01_PARTIAL
+    elif key.startswith("tank01"):
         return TTL_TANK01
     elif key.startswith("nflverse"):
         return TTL_NFLVERSE
+    elif key.startswith("sleeper"):
+        return TTL_SLEEPER
     return DEFAULT_TTL_SECONDS
 
 
@@ -62,19 +148,138 @@ def get_cache_age_seconds(cache_path: Path) -> int:
     return int(age.total_seconds())
 
 
-def read_cache(key: str, season: int) -> Optional[Any]:
-    """Lê dados do cache se existir e for válido"""
-    cache_path = get_cache_path(key, season)
+# ============================================
+# Tier em memória (LRU + TTL)
+# ============================================
+# Entradas: (key, season) -> (written_at, data), em ordem de uso.
+# Os dados são compartilhados entre requests: trate-os como somente leitura.
+
+_memory: "OrderedDict[tuple[str, int], tuple[float, Any]]" = OrderedDict()
+_memory_lock = threading.Lock()
+_memory_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _memory_get(key: str, season: int, include_stale: bool = False) -> Optional[tuple[float, Any]]:
+    """
+    Retorna (written_at, data) do tier em memória se presente e dentro do TTL
+    (ou mesmo expirada, com include_stale=True).
+    Entradas expiradas ficam até serem substituídas (ou saírem pelo LRU):
+    uma revalidação (304) as torna válidas de novo sem reler o disco.
+    """
+    validated_at = _get_validated_at(key, season)
+    with _memory_lock:
+        entry = _memory.get((key, season))
+        if entry is not None and (
+            include_stale or time.time() - max(entry[0], validated_at) < get_ttl_for_key(key)
+        ):
+            _memory.move_to_end((key, season))
+            _memory_stats["hits"] += 1
+            return entry
+        _memory_stats["misses"] += 1
+        return None
+
+
+def _memory_put(key: str, season: int, data: Any, written_at: float) -> None:
+    """Guarda dados no tier em memória, removendo as entradas menos usadas"""
+    if MEMORY_CACHE_MAX_ENTRIES <= 0:
+        return
+    with _memory_lock:
+        _memory[(key, season)] = (written_at, data)
+        _memory.move_to_end((key, season))
+        while len(_memory) > MEMORY_CACHE_MAX_ENTRIES:
+            _memory.popitem(last=False)
+            _memory_stats["evictions"] += 1
+
+
+def _memory_invalidate(key: Optional[str] = None, season: Optional[int] = None, prefix: Optional[str] = None) -> None:
+    """Remove entradas do tier em memória (todas, por key/season ou por prefixo)"""
+    with _memory_lock:
+        if key is not None and season is not None:
+            _memory.pop((key, season), None)
+        elif prefix is not None:
+            for entry_key in [k for k in _memory if k[0].startswith(prefix)]:
+                del _memory[entry_key]
+        else:
+            _memory.clear()
+
+
+def get_memory_cache_stats() -> dict:
+    """Retorna contadores do tier em memória"""
+    with _memory_lock:
+        lookups = _memory_stats["hits"] + _memory_stats["misses"]
+        return {
+            **_memory_stats,
+            "entries": len(_memory),
+            "max_entries": MEMORY_CACHE_MAX_ENTRIES,
+            "hit_rate": round(_memory_stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+def get_cache_version(key: str, season: int, include_stale: bool = False) -> Optional[float]:
+    """
+    Token de versão de uma entrada (momento da escrita), igual na memória e no disco.
+    Muda sempre que a entrada é reescrita. None se não existir ou se já expirou
+    (a não ser que include_stale=True).
+    """
+    with _memory_lock:
+        entry = _memory.get((key, season))
+    if entry is not None:
+        written_at = entry[0]
+    else:
+        try:
+            written_at = find_cache_path(key, season).stat().st_mtime
+        except OSError:
+            return None
+
+    if not include_stale and not _is_fresh(key, season, written_at):
+        return None
+    return written_at
+
 
-    if not is_cache_valid(cache_path, key):
+def get_cache_expiry(key: str, season: int) -> Optional[float]:
+    """
+    Momento (epoch) em que a entrada expira: escrita ou última revalidação + TTL.
+    None se a entrada não existir.
+    """
+    written_at = get_cache_version(key, season, include_stale=True)
+    if written_at is None:
         return None
+    return max(written_at, _get_validated_at(key, season)) + get_ttl_for_key(key)
+
+
+def _load(key: str, season: int, include_stale: bool = False) -> Optional[tuple[float, Any]]:
+    """
+    Busca (written_at, data) na memória e depois no disco.
+    Leituras do disco são promovidas para a memória com o mtime original.
+    include_stale=True retorna a entrada mesmo com o TTL expirado.
+    """
+    entry = _memory_get(key, season, include_stale)
+    if entry is not None:
+        return entry
 
+    cache_path, fmt = _find_cache_file(key, season)
     try:
-        with open(cache_path, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        written_at = cache_path.stat().st_mtime
+    except OSError:
+        return None
+    if not include_stale and not _is_fresh(key, season, written_at):
         return None
 
+    try:
+        data = _STORAGES[fmt][1](cache_path)
+    except Exception as e:
+        print(f"Erro ao ler cache {cache_path.name}: {e}")
+        return None
+
+    _memory_put(key, season, data, written_at)
+    return written_at, data
+
+
+def read_cache(key: str, season: int, include_stale: bool = False) -> Optional[Any]:
+    """Lê dados do cache se existir e for válido (ou expirado, com include_stale=True)"""
+    entry = _load(key, season, include_stale)
+    return entry[1] if entry is not None else None
+
 
 def read_cache_with_metadata(key: str, season: int) -> tuple[Optional[Any], dict]:
     """
@@ -83,25 +288,141 @@ def read_cache_with_metadata(key: str, season: int) -> tuple[Optional[Any], dict
     - cached: bool
     - cache_age_seconds: int
     """
-    cache_path = get_cache_path(key, season)
     metadata = {
         "cached": False,
         "cache_age_seconds": 0,
     }
 
-    if not is_cache_valid(cache_path, key):
+    entry = _load(key, season)
+    if entry is None:
         return None, metadata
 
+    written_at, data = entry
+    metadata["cached"] = True
+    metadata["cache_age_seconds"] = int(time.time() - written_at)
+
+    return data, metadata
+
+
+# ============================================
+# Revalidação condicional (ETag / Last-Modified)
+# ============================================
+# Sidecar {key}_{season}.meta.json: etag, last_modified, content_hash e
+# validated_at (última vez que o upstream confirmou o conteúdo). O TTL conta
+# a partir do mais recente entre a escrita e a última revalidação.
+
+# (key, season) -> validated_at (0.0 = nunca revalidado); espelho do sidecar
+_validated: dict[tuple[str, int], float] = {}
+_validated_lock = threading.Lock()
+
+
+def read_cache_metadata(key: str, season: int) -> dict:
+    """Lê o sidecar de metadata da entrada ({} se não existir)"""
     try:
-        with open(cache_path, "r") as f:
-            data = json.load(f)
+        return _read_json(get_cache_metadata_path(key, season))
+    except (OSError, ValueError):
+        return {}
 
-        metadata["cached"] = True
-        metadata["cache_age_seconds"] = get_cache_age_seconds(cache_path)
 
-        return data, metadata
-    except (json.JSONDecodeError, IOError):
-        return None, metadata
+def write_cache_metadata(key: str, season: int, metadata: dict) -> None:
+    """Escreve o sidecar de metadata da entrada"""
+    path = get_cache_metadata_path(key, season)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        _write_json(tmp_path, metadata)
+        os.replace(tmp_path, path)
+    except (IOError, TypeError, ValueError) as e:
+        print(f"Erro ao escrever metadata {path.name}: {e}")
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    with _validated_lock:
+        _validated[(key, season)] = metadata.get("validated_at", 0.0)
+
+
+def _get_validated_at(key: str, season: int) -> float:
+    with _validated_lock:
+        validated_at = _validated.get((key, season))
+    if validated_at is None:
+        validated_at = read_cache_metadata(key, season).get("validated_at", 0.0)
+        with _validated_lock:
+            _validated.setdefault((key, season), validated_at)
+    return validated_at
+
+
+def _is_fresh(key: str, season: int, written_at: float) -> bool:
+    """Dentro do TTL contado da escrita ou da última revalidação"""
+    fresh_since = max(written_at, _get_validated_at(key, season))
+    return time.time() - fresh_since < get_ttl_for_key(key)
+
+
+def content_hash(content: bytes) -> str:
+    """Hash (sha256 hex) usado para detectar conteúdo upstream igual ao cacheado"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_conditional_headers(key: str, season: int) -> dict[str, str]:
+    """If-None-Match / If-Modified-Since para revalidar a entrada (vazio se não há cache)"""
+    if not find_cache_path(key, season).exists():
+        return {}
+    metadata = read_cache_metadata(key, season)
+    headers = {}
+    if metadata.get("etag"):
+        headers["If-None-Match"] = metadata["etag"]
+    if metadata.get("last_modified"):
+        headers["If-Modified-Since"] = metadata["last_modified"]
+    return headers
+
+
+def store_cache_validators(key: str, season: int, headers: Any, digest: Optional[str] = None) -> None:
+    """
+    Guarda os validadores de uma resposta 200 (chamar depois de escrever os dados)
+    headers: headers da resposta (ETag / Last-Modified); digest: content_hash do corpo
+    """
+    write_cache_metadata(key, season, {
+        "etag": headers.get("etag"),
+        "last_modified": headers.get("last-modified"),
+        "content_hash": digest,
+        "validated_at": time.time(),
+    })
+
+
+def mark_cache_revalidated(key: str, season: int) -> None:
+    """Upstream confirmou que nada mudou: renova o TTL sem reescrever os dados"""
+    metadata = read_cache_metadata(key, season)
+    metadata["validated_at"] = time.time()
+    write_cache_metadata(key, season, metadata)
+
+
+def is_not_modified(key: str, season: int, response: Any, digest: Optional[str] = None) -> bool:
+    """
+    True se a resposta confirma o conteúdo cacheado (304, ou 200 com o mesmo
+    content_hash) e, nesse caso, renova o TTL da entrada.
+    response: resposta HTTP com status_code e content (ex: httpx.Response)
+    digest: content_hash do corpo já consumido; obrigatório em respostas de
+    streaming, cujo content não pode ser lido
+    """
+    if not find_cache_path(key, season).exists():
+        return False
+    if response.status_code != 304:
+        stored = read_cache_metadata(key, season).get("content_hash")
+        if response.status_code != 200 or not stored:
+            return False
+        if stored != (digest if digest is not None else content_hash(response.content)):
+            return False
+    mark_cache_revalidated(key, season)
+    return True
+
+
+def _validated_invalidate(key: Optional[str] = None, season: Optional[int] = None, prefix: Optional[str] = None) -> None:
+    with _validated_lock:
+        if key is not None and season is not None:
+            _validated.pop((key, season), None)
+        elif prefix is not None:
+            for entry_key in [k for k in _validated if k[0].startswith(prefix)]:
+                del _validated[entry_key]
+        else:
+            _validated.clear()
 
 
 def sanitize_for_json(obj: Any) -> Any:
@@ -119,37 +440,133 @@ def sanitize_for_json(obj: Any) -> Any:
     return obj
 
 
+def _write_atomic(cache_path: Path, fmt: str, data: Any) -> None:
+    """Escreve em arquivo temporário e renomeia (leitores nunca veem arquivo parcial)"""
+    writer = _STORAGES[fmt][2]
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        writer(tmp_path, data)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _remove_other_formats(key: str, season: int, keep: str) -> None:
+    """Remove arquivos do mesmo key/season em outros formatos"""
+    for fmt in _STORAGES:
+        if fmt != keep:
+            path = get_cache_path(key, season, fmt)
+            if path.exists():
+                path.unlink()
+
+
 def write_cache(key: str, season: int, data: Any) -> None:
-    """Escreve dados no cache, sanitizando valores inválidos para JSON"""
+    """
+    Escreve dados no cache em uma passada (orjson). Os dados chegam já
+    sanitizados da ingestão (NaN/Infinity -> 0.0, ver serialization.py).
+    """
     cache_path = get_cache_path(key, season)
 
+    written_at = time.time()
     try:
-        # Sanitiza dados para remover NaN/Infinity
-        sanitized = sanitize_for_json(data)
-        with open(cache_path, "w") as f:
-            json.dump(sanitized, f)
-    except IOError as e:
+        _write_atomic(cache_path, "json", data)
+        written_at = cache_path.stat().st_mtime
+    except (IOError, TypeError, ValueError) as e:
         print(f"Erro ao escrever cache: {e}")
 
+    _memory_put(key, season, data, written_at)
+
+
+def read_cache_frame(key: str, season: int, include_stale: bool = False) -> Optional[pd.DataFrame]:
+    """
+    Lê um DataFrame do cache se existir e for válido (ou expirado, com include_stale=True).
+    Aceita qualquer formato registrado (inclusive JSON legado em records).
+    """
+    entry = _load(key, season, include_stale)
+    if entry is None:
+        return None
+
+    written_at, data = entry
+    if not isinstance(data, pd.DataFrame):
+        # JSON legado (records): converte uma vez e mantém o DataFrame na memória
+        data = pd.DataFrame(data)
+        _memory_put(key, season, data, written_at)
+    return data
+
+
+def write_cache_frame(key: str, season: int, df: pd.DataFrame, fmt: Optional[str] = None) -> None:
+    """
+    Escreve um DataFrame no cache em formato colunar (parquet ou arrow).
+    Se o formato colunar falhar (ex: coluna object com tipos mistos), cai para JSON records.
+    """
+    fmt = fmt or CACHE_FRAME_FORMAT
+    if fmt not in _STORAGES:
+        fmt = "parquet"
+
+    written_at = time.time()
+    if fmt != "json":
+        try:
+            cache_path = get_cache_path(key, season, fmt)
+            _write_atomic(cache_path, fmt, df)
+            written_at = cache_path.stat().st_mtime
+        # pyarrow ausente, disco, ou colunas que o formato não representa
+        # (ArrowTypeError/ArrowInvalid/ArrowNotImplementedError herdam destes)
+        except (ImportError, OSError, TypeError, ValueError, NotImplementedError) as e:
+            print(f"[cache] {key}_{season}: {fmt} falhou ({e}), usando JSON")
+            fmt = "json"
+
+    if fmt == "json":
+        write_cache(key, season, df.to_dict(orient="records"))
+        written_at = get_cache_version(key, season) or written_at
+
+    _remove_other_formats(key, season, keep=fmt)
+    _memory_put(key, season, df, written_at)
+
+
+def _cache_files(pattern: str) -> list[Path]:
+    """Lista arquivos de cache (todos os formatos + sidecars .meta.json)"""
+    files = []
+    for suffix, _, _ in _STORAGES.values():
+        files.extend(CACHE_DIR.glob(f"{pattern}{suffix}"))
+    return files
+
 
 def clear_cache(key: Optional[str] = None, season: Optional[int] = None) -> None:
-    """Limpa cache específico ou todo o cache"""
+    """Limpa cache específico ou todo o cache (memória e disco)"""
+    if key and season is not None:
+        _memory_invalidate(key, season)
+        _validated_invalidate(key, season)
+    else:
+        _memory_invalidate()
+        _validated_invalidate()
+
     if not CACHE_DIR.exists():
         return
 
     if key and season is not None:
-        cache_path = get_cache_path(key, season)
-        if cache_path.exists():
-            cache_path.unlink()
+        paths = [get_cache_path(key, season, fmt) for fmt in _STORAGES]
+        paths.append(get_cache_metadata_path(key, season))
+        for cache_path in paths:
+            if cache_path.exists():
+                cache_path.unlink()
     else:
-        for file in CACHE_DIR.glob("*.json"):
-            file.unlink()
+        for file in _cache_files("*"):
+            file.unlink(missing_ok=True)
 
 
 def clear_source_cache(source: str) -> None:
     """Limpa todo o cache de uma fonte específica (tank01 ou nflverse)"""
+    _memory_invalidate(prefix=f"{source}_")
+    _validated_invalidate(prefix=f"{source}_")
+
     if not CACHE_DIR.exists():
         return
 
-    for file in CACHE_DIR.glob(f"{source}_*.json"):
-        file.unlink()
+    for file in _cache_files(f"{source}_*"):
+        file.unlink(missing_ok=True)
+
+
+register_cache_storage("json", ".json", _read_json, _write_json)
+register_cache_storage("parquet", ".parquet", _read_parquet, _write_parquet)
+register_cache_storage("arrow", ".arrow", _read_arrow, _write_arrow)
@@ -13,7 +13,23 @@ if env_path.exists():
 
 # RapidAPI / Tank01 Config
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY", "")
-TANK01_BASE_URL = "https://tank01-nfl-live-in-game-real-time-statistics-nfl.p.rapidapi.com"
+TANK01_BASE_URL = os.getenv(
+    "TANK01_BASE_URL",
+    "https://tank01-nfl-live-in-game-real-time-statistics-nfl.p.rapidapi.com",
+)
+
+# Tank01 roster fan-out (32 teams): parallel requests, retries per team
+TANK01_MAX_CONCURRENCY = int(os.getenv("TANK01_MAX_CONCURRENCY", "8"))
+TANK01_MAX_RETRIES = int(os.getenv("TANK01_MAX_RETRIES", "2"))
+TANK01_RETRY_BACKOFF = float(os.getenv("TANK01_RETRY_BACKOFF", "0.5"))  # seconds, doubles per attempt
+TANK01_PARTIAL_TTL = int(os.getenv("TANK01_PARTIAL_TTL", "300"))  # seconds - reuse of a sweep with failed teams
+
+# Sleeper API (league settings for the Dynasty Pulse league endpoints)
+SLEEPER_BASE_URL = os.getenv("SLEEPER_BASE_URL", "https://api.sleeper.app/v1")
+SLEEPER_LEAGUE_TTL = int(os.getenv("SLEEPER_LEAGUE_TTL", "3600"))  # seconds - leagues change rarely
+SLEEPER_TIMEOUT = float(os.getenv("SLEEPER_TIMEOUT", "10"))  # seconds
+SLEEPER_MAX_CONCURRENCY = int(os.getenv("SLEEPER_MAX_CONCURRENCY", "8"))
+SLEEPER_MAX_BATCH = int(os.getenv("SLEEPER_MAX_BATCH", "25"))  # leagues per batch request
 
 # Primary data source: "tank01" or "nflverse"
 # Will fallback to the other if primary fails
@@ -23,6 +39,36 @@ PRIMARY_SOURCE = os.getenv("PRIMARY_SOURCE", "tank01")
 CACHE_TTL_TANK01 = 3600      # 1 hour - live data
 CACHE_TTL_NFLVERSE = 86400   # 24 hours - historical data
 
+# Storage format for cached DataFrames: "parquet", "arrow" (Arrow IPC) or "json"
+CACHE_FRAME_FORMAT = os.getenv("CACHE_FRAME_FORMAT", "parquet").lower()
+
+# In-memory cache tier (LRU) in front of the file cache; 0 disables it
+MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "256"))
+
+# Worker threads for blocking nflverse work (Parquet downloads + pandas transforms)
+NFLVERSE_EXECUTOR_WORKERS = int(os.getenv("NFLVERSE_EXECUTOR_WORKERS", "4"))
+
+# Worker processes for CPU-bound nflverse transforms (one season each); 0 = use the thread pool
+NFLVERSE_PROCESS_WORKERS = int(os.getenv("NFLVERSE_PROCESS_WORKERS", "2"))
+
+# Background cache refresh (scheduler.py): warms seasons at startup and refreshes
+# tank01_*/nflverse_* entries shortly before their TTLs lapse
+CACHE_REFRESH_ENABLED = os.getenv("CACHE_REFRESH_ENABLED", "true").lower() == "true"
+# Comma-separated seasons to keep warm; empty = the latest CACHE_WARM_SEASON_COUNT available
+CACHE_WARM_SEASONS = [int(s) for s in os.getenv("CACHE_WARM_SEASONS", "").split(",") if s.strip()]
+CACHE_WARM_SEASON_COUNT = int(os.getenv("CACHE_WARM_SEASON_COUNT", "3"))
+CACHE_REFRESH_INTERVAL = int(os.getenv("CACHE_REFRESH_INTERVAL", "60"))  # seconds between checks
+CACHE_REFRESH_AHEAD = int(os.getenv("CACHE_REFRESH_AHEAD", "300"))       # refresh this long before expiry
+CACHE_REFRESH_JITTER = int(os.getenv("CACHE_REFRESH_JITTER", "120"))     # + random 0..jitter per entry
+
+# Pre-serialized response cache (response_cache.py): bytes + gzip/brotli per data version
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "64"))
+RESPONSE_MAX_AGE = int(os.getenv("RESPONSE_MAX_AGE", "300"))  # Cache-Control max-age (seconds)
+RESPONSE_STALE_WHILE_REVALIDATE = int(os.getenv("RESPONSE_STALE_WHILE_REVALIDATE", "3600"))
+
+# League value tables (one per season/Superflex/TEP/roster shape) kept in memory (LRU)
+VALUE_TABLE_MAX_LEAGUE_SHAPES = int(os.getenv("VALUE_TABLE_MAX_LEAGUE_SHAPES", "32"))
+
 # Request timeout (seconds)
 REQUEST_TIMEOUT = 30
 
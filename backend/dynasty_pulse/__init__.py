@@ -3,10 +3,11 @@
 Dynasty Pulse - Value calculation engine for Trade Calculator
 
 Calculates real player values (offense + IDP) using:
-- VORP (Value Over Replacement Player)
+- VORP (Value Over Replacement Player), with league-derived replacement levels
 - Position-based Aging Curves
 - Real stats from nflverse/Tank01
 - League-specific scoring adjustments (Premium)
+- Exact per-league fantasy points (stat matrix x scoring vectors)
 - Multi-season data aggregation
 
 Scale: 0-10000 (internal) / 0-100 (UI)
@@ -19,19 +20,47 @@ from .values import (
     calculate_all_player_values,
     get_player_value_breakdown,
 )
+from .batch import (
+    calculate_values_batch,
+    calculate_all_player_values_batch,
+    stats_to_columns,
+    BATCH_STAT_KEYS,
+)
 from .scoring_adjust import (
     calculate_scoring_multiplier,
     apply_scoring_adjustment,
+    compile_scoring_profile,
+    ScoringProfile,
     get_league_type_description,
     detect_superflex,
     STANDARD_SCORING,
 )
+from .league_points import (
+    StatMatrix,
+    build_stat_matrix,
+    scoring_vector,
+    scoring_matrix,
+    SCORING_KEYS,
+)
+from .replacement import (
+    roster_shape,
+    replacement_levels,
+    FLEX_SLOTS,
+)
+from .ranking import (
+    rank_players,
+    parse_rank,
+    PERCENTILE_TIERS,
+)
 from .multi_season import (
     get_current_season,
     get_default_seasons,
     aggregate_player_stats,
+    aggregate_all_player_stats,
     calculate_trend,
+    calculate_trends_batch,
     get_player_trends,
+    get_all_player_trends,
     enhanced_dynasty_window,
     SEASON_WEIGHTS,
 )
@@ -48,18 +77,42 @@ __all__ = [
     "calculate_player_value",
     "calculate_all_player_values",
     "get_player_value_breakdown",
+    # Batch (NumPy)
+    "calculate_values_batch",
+    "calculate_all_player_values_batch",
+    "stats_to_columns",
+    "BATCH_STAT_KEYS",
     # Scoring Adjust (Premium)
     "calculate_scoring_multiplier",
     "apply_scoring_adjustment",
+    "compile_scoring_profile",
+    "ScoringProfile",
     "get_league_type_description",
     "detect_superflex",
     "STANDARD_SCORING",
+    # League Points (exact scoring)
+    "StatMatrix",
+    "build_stat_matrix",
+    "scoring_vector",
+    "scoring_matrix",
+    "SCORING_KEYS",
+    # League Replacement Levels
+    "roster_shape",
+    "replacement_levels",
+    "FLEX_SLOTS",
+    # Ranks & Percentile Tiers
+    "rank_players",
+    "parse_rank",
+    "PERCENTILE_TIERS",
     # Multi-Season
     "get_current_season",
     "get_default_seasons",
     "aggregate_player_stats",
+    "aggregate_all_player_stats",
     "calculate_trend",
+    "calculate_trends_batch",
     "get_player_trends",
+    "get_all_player_trends",
     "enhanced_dynasty_window",
     "SEASON_WEIGHTS",
 ]
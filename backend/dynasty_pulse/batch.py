@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Value Engine
+
+Columnar counterpart of the scalar pipeline
+(calculate_ppg_from_stats -> calculate_vorp -> calculate_age_factor ->
+calculate_player_value) that evaluates the whole player pool at once.
+
+Inputs are NumPy arrays: positions, ages (whole years) and one float column
+per stat key. NaN marks a missing value, so the scalar `dict.get` defaults
+apply. Every float operation runs in the same order as the scalar code, so
+results are bit-for-bit identical; rounding is left to emission time
+(Python `round`), exactly like get_player_value_breakdown.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .vorp import (
+    REPLACEMENT_LEVEL,
+    SCARCITY_MULTIPLIER,
+    SF_QB_MULTIPLIER,
+    TEP_TE_MULTIPLIER,
+    VORP_TIER_THRESHOLDS,
+)
+from .aging import AGING_CURVES, MIN_AGE, MAX_AGE, DEFAULT_AGE
+from .values import (
+    POSITION_VALUE_BOOST,
+    VORP_MULTIPLIER,
+    YOUTH_BONUS_MULTIPLIER,
+    MIN_VALUE,
+    MAX_VALUE,
+)
+
+# Posições com constantes; qualquer outra recebe o código UNKNOWN
+POSITIONS: List[str] = list(REPLACEMENT_LEVEL)
+UNKNOWN = len(POSITIONS)
+OFFENSIVE_POSITIONS = ["QB", "RB", "WR", "TE", "K"]
+
+# Stat keys lidas pelo cálculo de PPG (ofensa + IDP)
+BATCH_STAT_KEYS: List[str] = [
+    "fantasyPointsPpr", "fantasy_points_ppr", "games", "games_played",
+    "passingYards", "passingTds", "interceptions",
+    "rushingYards", "rushingTds",
+    "receptions", "receivingYards", "receivingTds", "fumblesLost",
+    "soloTackles", "tackles", "assistTackles", "sacks", "tfl", "qbHits",
+    "passesDefended", "forcedFumbles", "fumbleRecoveryOpp", "fumbleRecoveryOwn",
+    "defensiveTds",
+]
+
+VORP_TIERS = np.array(["elite", "star", "starter", "depth", "replacement", "unknown"], dtype=object)
+AGE_TIERS = np.array(["rising", "prime", "declining", "veteran", "unknown"], dtype=object)
+RECOMMENDATIONS = np.array(["buy", "hold", "sell"], dtype=object)
+
+
+def _table(values: Mapping[str, float], default: float) -> np.ndarray:
+    """Constante por código de posição (último slot = posição desconhecida)"""
+    return np.array([values.get(pos, default) for pos in POSITIONS] + [default], dtype=float)
+
+
+_REPLACEMENT = _table(REPLACEMENT_LEVEL, 0.0)
+_SCARCITY = _table(SCARCITY_MULTIPLIER, 0.0)
+_BOOST = _table(POSITION_VALUE_BOOST, 1.0)
+_PEAK_START = _table({p: c["peak_start"] for p, c in AGING_CURVES.items()}, 0.0)
+_PEAK_END = _table({p: c["peak_end"] for p, c in AGING_CURVES.items()}, 0.0)
+_DECAY = _table({p: c["decay_rate"] for p, c in AGING_CURVES.items()}, 0.0)
+_GROWTH = _table({p: c["pre_peak_growth"] for p, c in AGING_CURVES.items()}, 0.0)
+_HAS_CURVE = np.array([pos in AGING_CURVES for pos in POSITIONS] + [False])
+_IS_OFFENSE = np.array([pos in OFFENSIVE_POSITIONS for pos in POSITIONS] + [False])
+_TIER_THRESHOLDS = np.array(
+    [[VORP_TIER_THRESHOLDS[pos][t] for t in ("elite", "star", "starter", "depth")] for pos in POSITIONS]
+    + [[np.inf] * 4],
+    dtype=float,
+)
+_HAS_TIERS = np.array([pos in VORP_TIER_THRESHOLDS for pos in POSITIONS] + [False])
+
+
+def position_codes(positions: Sequence[str]) -> np.ndarray:
+    """Converte posições (case-insensitive) em códigos inteiros"""
+    uniques, inverse = np.unique(np.asarray(positions, dtype=object).astype(str), return_inverse=True)
+    lookup = np.array(
+        [POSITIONS.index(p.upper()) if p.upper() in POSITIONS else UNKNOWN for p in uniques],
+        dtype=np.intp,
+    )
+    return lookup[inverse]
+
+
+def stats_to_columns(stats: Sequence[Mapping], keys: Sequence[str] = BATCH_STAT_KEYS) -> Dict[str, np.ndarray]:
+    """Extrai colunas float de uma lista de dicts de stats (ausente/None -> NaN)"""
+    nan = float("nan")
+    # Uma passada por dict (linha a linha) é bem mais rápida que uma por coluna
+    values = np.fromiter(
+        (nan if v is None else v for s in stats for v in map(s.get, keys)),
+        dtype=float,
+        count=len(stats) * len(keys),
+    ).reshape(len(stats), len(keys))
+    return {key: values[:, i] for i, key in enumerate(keys)}
+
+
+def _col(stats: Mapping[str, np.ndarray], key: str, n: int) -> np.ndarray:
+    """Coluna com NaN (ausente) mantido; coluna inexistente vira toda NaN"""
+    col = stats.get(key)
+    if col is None:
+        return np.full(n, np.nan)
+    return np.asarray(col, dtype=float)
+
+
+def _get(stats: Mapping[str, np.ndarray], key: str, n: int, default: float = 0.0) -> np.ndarray:
+    """Equivalente a stats.get(key, default)"""
+    col = _col(stats, key, n)
+    return np.where(np.isnan(col), default, col)
+
+
+def _truthy(col: np.ndarray) -> np.ndarray:
+    """Equivalente a bool(value) com NaN = ausente"""
+    return ~np.isnan(col) & (col != 0)
+
+
+def calculate_ppg_batch(codes: np.ndarray, stats: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Vectorized calculate_ppg_from_stats"""
+    n = len(codes)
+    get = lambda key, default=0.0: _get(stats, key, n, default)  # noqa: E731
+
+    # Ofensa: fantasy points direto quando disponível
+    fpp = _col(stats, "fantasyPointsPpr", n)
+    total_points = np.where(_truthy(fpp), fpp, get("fantasy_points_ppr"))
+    games_col = _col(stats, "games", n)
+    games = np.where(_truthy(games_col), games_col, get("games_played", 17.0))
+    direct = (games > 0) & (total_points > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        direct_ppg = total_points / games
+
+    # Fallback ofensivo (mesma ordem de somas de _calculate_offensive_ppg)
+    fallback_games = np.maximum(1.0, get("games", 17.0))
+    points = 0.0 + get("passingYards") * 0.04
+    points = points + get("passingTds") * 4
+    points = points + get("interceptions") * -2
+    points = points + get("rushingYards") * 0.1
+    points = points + get("rushingTds") * 6
+    points = points + get("receptions") * 1
+    points = points + get("receivingYards") * 0.1
+    points = points + get("receivingTds") * 6
+    points = points + get("fumblesLost") * -2
+    offensive_ppg = np.where(direct, direct_ppg, points / fallback_games)
+
+    # IDP (mesma ordem de somas de _calculate_idp_ppg)
+    solo_col = _col(stats, "soloTackles", n)
+    solo = np.where(_truthy(solo_col), solo_col, get("tackles"))
+    idp = 0.0 + solo * 1.0
+    idp = idp + get("assistTackles") * 0.5
+    idp = idp + get("sacks") * 2.0
+    idp = idp + get("tfl") * 1.0
+    idp = idp + get("qbHits") * 0.5
+    idp = idp + get("interceptions") * 3.0
+    idp = idp + get("passesDefended") * 1.0
+    idp = idp + get("forcedFumbles") * 2.0
+    idp = idp + (get("fumbleRecoveryOpp") + get("fumbleRecoveryOwn")) * 2.0
+    idp = idp + get("defensiveTds") * 6.0
+    idp_ppg = idp / fallback_games
+
+    return np.where(_IS_OFFENSE[codes], offensive_ppg, idp_ppg)
+
+
+def calculate_vorp_batch(
+    ppg: np.ndarray,
+    codes: np.ndarray,
+    is_superflex: bool = False,
+    is_tep: bool = False,
+    replacement: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Vectorized calculate_vorp (replacement: PPG por código de posição; None = REPLACEMENT_LEVEL)"""
+    scarcity = _SCARCITY[codes]
+    if is_superflex:
+        scarcity = np.where(codes == POSITIONS.index("QB"), SF_QB_MULTIPLIER, scarcity)
+    if is_tep:
+        scarcity = np.where(codes == POSITIONS.index("TE"), TEP_TE_MULTIPLIER, scarcity)
+    vorp = (ppg - (_REPLACEMENT if replacement is None else replacement)[codes]) * scarcity
+    return np.where(codes == UNKNOWN, 0.0, vorp)
+
+
+def vorp_tier_codes(vorp: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Vectorized get_vorp_tier (índices em VORP_TIERS)"""
+    thresholds = _TIER_THRESHOLDS[codes]
+    # Thresholds (elite, star, starter, depth) são decrescentes: o tier é
+    # 4 menos quantos deles o jogador atinge (0 = elite, 4 = replacement)
+    tier = 4 - (vorp[:, None] >= thresholds).sum(axis=1)
+    return np.where(_HAS_TIERS[codes], tier, 5)
+
+
+def calculate_age_factor_batch(ages: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_age_factor (NaN = idade desconhecida)"""
+    age = np.clip(np.where(np.isnan(ages), float(DEFAULT_AGE), ages), MIN_AGE, MAX_AGE)
+    peak_start = _PEAK_START[codes]
+    peak_end = _PEAK_END[codes]
+
+    growth = np.minimum(1.0, 0.80 + (age - MIN_AGE) * _GROWTH[codes])
+    decline = np.maximum(0.20, 1.0 - (age - peak_end) * _DECAY[codes])
+    factor = np.where(age < peak_start, growth, np.where(age <= peak_end, 1.0, decline))
+    return np.where(_HAS_CURVE[codes], factor, 1.0)
+
+
+def age_tier_codes(ages: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Vectorized get_age_tier (índices em AGE_TIERS)"""
+    peak_start = _PEAK_START[codes]
+    peak_end = _PEAK_END[codes]
+    tier = np.where(
+        ages < peak_start, 0,
+        np.where(ages <= peak_end, 1, np.where(ages <= peak_end + 3, 2, 3)),
+    )
+    return np.where(_HAS_CURVE[codes] & ~np.isnan(ages), tier, 4)
+
+
+def calculate_values_batch(
+    positions: Sequence[str],
+    ages: Sequence[Optional[float]],
+    stats: Mapping[str, np.ndarray],
+    is_superflex: bool = False,
+    is_tep: bool = False,
+    replacement: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Calculates the full value pipeline for a player pool in one pass
+
+    Args:
+        positions: Position per player (QB, RB, WR, TE, K, DL, LB, DB)
+        ages: Age per player (None/NaN = unknown)
+        stats: Stat key -> column (see BATCH_STAT_KEYS / stats_to_columns)
+        is_superflex: Superflex league
+        is_tep: TE premium league
+        replacement: Replacement PPG per position code (see
+            dynasty_pulse.replacement); None = REPLACEMENT_LEVEL
+
+    Returns:
+        Dict of unrounded arrays: ppg, vorp, vorp_tier, age_factor, age_tier,
+        raw_value, final_value, peak_years_left, projected_3yr, window_tier,
+        recommendation
+    """
+    codes = position_codes(positions)
+    ages = np.array(ages, dtype=float)
+
+    ppg = calculate_ppg_batch(codes, stats)
+    vorp = calculate_vorp_batch(ppg, codes, is_superflex, is_tep, replacement)
+    age_factor = calculate_age_factor_batch(ages, codes)
+
+    # Youth bonus + position boost + escala 0-10000
+    youth_bonus = np.where(~np.isnan(ages) & (ages < 25) & (vorp > 0), YOUTH_BONUS_MULTIPLIER, 1.0)
+    raw_value = np.where(vorp > 0, vorp, 0.0) * age_factor * youth_bonus * _BOOST[codes] * VORP_MULTIPLIER
+    final_value = np.clip(raw_value, MIN_VALUE, MAX_VALUE).astype(np.int64)
+
+    # Janela dynasty (get_dynasty_window usa DEFAULT_AGE para idade desconhecida)
+    window_ages = np.where(np.isnan(ages), float(DEFAULT_AGE), ages)
+    peak_end = _PEAK_END[codes]
+    peak_years_left = np.where(_HAS_CURVE[codes] & (window_ages <= peak_end), peak_end - window_ages, 0.0)
+    projected_3yr = calculate_age_factor_batch(window_ages + 3, codes)
+    window_tier = age_tier_codes(window_ages, codes)
+    recommendation = np.where(
+        (window_tier == 0) & (peak_years_left >= 3), 0,
+        np.where((window_tier == 1) & (peak_years_left >= 2), 1, 2),
+    )
+
+    return {
+        "ppg": ppg,
+        "vorp": vorp,
+        "vorp_tier": VORP_TIERS[vorp_tier_codes(vorp, codes)],
+        "age_factor": age_factor,
+        "age_tier": AGE_TIERS[age_tier_codes(ages, codes)],
+        "raw_value": raw_value,
+        "final_value": final_value,
+        "peak_years_left": peak_years_left.astype(np.int64),
+        "projected_3yr": projected_3yr,
+        "window_tier": AGE_TIERS[window_tier],
+        "recommendation": RECOMMENDATIONS[recommendation],
+    }
+
+
+def calculate_all_player_values_batch(
+    offensive_players: List[Dict],
+    defensive_players: List[Dict],
+    is_superflex: bool = False,
+    is_tep: bool = False,
+    replacement: Optional[np.ndarray] = None,
+) -> Dict[str, Dict]:
+    """
+    Drop-in replacement for calculate_all_player_values
+
+    Same filtering, ordering and breakdown dicts (including rounding), with
+    the numeric pipeline evaluated by calculate_values_batch. replacement
+    swaps the fixed REPLACEMENT_LEVEL for league-derived levels.
+    """
+    rows = []
+    for player in offensive_players:
+        if player.get("id", "") and player.get("position", "") in OFFENSIVE_POSITIONS:
+            rows.append((player, player.get("position", "")))
+    for player in defensive_players:
+        position = player.get("fantasyPosition", player.get("position", ""))
+        if player.get("id", "") and position in ["DL", "LB", "DB"]:
+            rows.append((player, position))
+
+    if not rows:
+        return {}
+
+    players = [player for player, _ in rows]
+    positions = [position for _, position in rows]
+    ages = [player.get("age") for player in players]
+    batch = calculate_values_batch(
+        positions,
+        ages,
+        stats_to_columns([player.get("stats", {}) for player in players]),
+        is_superflex,
+        is_tep,
+        replacement,
+    )
+
+    # NaN/inf -> 0.0 aqui, uma vez por coluna (contrato da API, ver serialization.py)
+    finite = lambda key: np.nan_to_num(batch[key], nan=0.0, posinf=0.0, neginf=0.0).tolist()  # noqa: E731
+    columns = zip(
+        finite("ppg"), finite("vorp"), batch["vorp_tier"].tolist(),
+        finite("age_factor"), batch["age_tier"].tolist(),
+        finite("raw_value"), batch["final_value"].tolist(),
+        batch["peak_years_left"].tolist(), finite("projected_3yr"),
+        batch["window_tier"].tolist(), batch["recommendation"].tolist(),
+    )
+
+    values = {}
+    for player, position, age, row in zip(players, positions, ages, columns):
+        ppg, vorp, vorp_tier, age_factor, age_tier, raw_value, final_value, \
+            peak_years, projected, window_tier, recommendation = row
+        player_id = player.get("id", "")
+        values[player_id] = {
+            "player_id": player_id,
+            "name": player.get("name", "Unknown"),
+            "position": position.upper(),
+            "team": player.get("team") or player.get("teamAbbr"),
+            "age": age,
+            "ppg": round(ppg, 2),
+            "vorp": round(vorp, 2),
+            "vorp_tier": vorp_tier,
+            "age_factor": round(age_factor, 3),
+            "age_tier": age_tier,
+            "raw_value": round(raw_value, 2),
+            "final_value": final_value,
+            "display_value": round(final_value / 100, 1),
+            "dynasty_window": {
+                "current_factor": age_factor,
+                "peak_years_left": peak_years,
+                "projected_3yr": projected,
+                "tier": window_tier,
+                "recommendation": recommendation,
+            },
+        }
+
+    return values
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+League Points Engine
+
+Exact fantasy points for any league, instead of the fixed PPR/IDP system of
+_calculate_offensive_ppg/_calculate_idp_ppg or the heuristic multipliers of
+scoring_adjust.
+
+A season's player pool becomes a dense stat matrix (players x SCORING_KEYS,
+the STANDARD_SCORING keys) and a league becomes a scoring vector over the
+same keys, so league points are a single product:
+- one league: matrix @ vector
+- many leagues: matrix @ vectors.T (one BLAS call for the whole batch)
+
+The bonus_rec_te column holds receptions masked to TEs, so TE premium is
+just another weight. Like the base IDP PPG, tkl_solo falls back to total
+tackles when a feed has no solo tackles. Stats the sources do not provide (kicking, 2pt,
+safeties) are zero columns.
+
+The matrix also carries the pool's base PPG (calculate_ppg_batch, the PPG
+behind VORP) and memoizes league replacement levels per roster shape.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import OFFENSIVE_POSITIONS, calculate_ppg_batch, position_codes, stats_to_columns
+from .replacement import RosterShape, replacement_levels
+from .scoring_adjust import SLEEPER_KEY_MAP, STANDARD_SCORING
+
+# Colunas da matriz (mesma ordem de STANDARD_SCORING)
+SCORING_KEYS: List[str] = list(STANDARD_SCORING)
+_COLUMN = {key: i for i, key in enumerate(SCORING_KEYS)}
+
+# Scoring key -> stat keys somadas (ofensa e IDP têm mapas próprios:
+# "interceptions" é INT sofrida no ataque e INT feita na defesa)
+OFFENSIVE_STAT_MAP: Dict[str, Tuple[str, ...]] = {
+    "pass_yd": ("passingYards",),
+    "pass_td": ("passingTds",),
+    "pass_int": ("interceptions",),
+    "rush_yd": ("rushingYards",),
+    "rush_td": ("rushingTds",),
+    "rec": ("receptions",),
+    "rec_yd": ("receivingYards",),
+    "rec_td": ("receivingTds",),
+    "bonus_rec_te": ("receptions",),  # só TEs (máscara em build_stat_matrix)
+    "fum_lost": ("fumblesLost",),
+}
+
+IDP_STAT_MAP: Dict[str, Tuple[str, ...]] = {
+    "tkl_solo": ("soloTackles",),
+    "tkl_ast": ("assistTackles",),
+    "tkl_loss": ("tfl",),
+    "tkl": ("tackles",),
+    "sack": ("sacks",),
+    "qb_hit": ("qbHits",),
+    "ff": ("forcedFumbles",),
+    "fum_rec": ("fumbleRecoveryOpp", "fumbleRecoveryOwn"),
+    "int": ("interceptions",),
+    "pass_def": ("passesDefended",),
+    "def_td": ("defensiveTds",),
+}
+
+IDP_POSITIONS = ["DL", "LB", "DB"]
+
+# STANDARD_SCORING como vetor; "tkl" (tackle combinado) é alternativa a
+# solo/assist e somaria os tackles duas vezes, então fica fora do padrão
+STANDARD_VECTOR = np.array([0.0 if key == "tkl" else STANDARD_SCORING[key] for key in SCORING_KEYS])
+
+
+class StatMatrix:
+    """A season's player pool as a dense (players x SCORING_KEYS) matrix"""
+
+    def __init__(
+        self,
+        player_ids: List[str],
+        positions: List[str],
+        games: np.ndarray,
+        values: np.ndarray,
+        base_ppg: np.ndarray,
+    ):
+        self.player_ids = player_ids
+        self.positions = positions
+        self.codes = position_codes(positions)
+        self.games = games
+        self.values = values
+        self.base_ppg = base_ppg
+        # player_id -> linha (última ocorrência, como o dict de valores)
+        self.index = {player_id: i for i, player_id in enumerate(player_ids)}
+        # RosterShape -> replacement levels (a matriz já é por temporada/versão)
+        self._replacement: Dict[RosterShape, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def points(self, vector: np.ndarray) -> np.ndarray:
+        """Season points of every player for one scoring vector"""
+        return self.values @ vector
+
+    def points_many(self, vectors: np.ndarray) -> np.ndarray:
+        """Season points (players x leagues) for a (leagues x SCORING_KEYS) matrix"""
+        return self.values @ np.asarray(vectors, dtype=float).T
+
+    def ppg(self, vector: np.ndarray) -> np.ndarray:
+        """Points per game of every player for one scoring vector"""
+        return self.points(vector) / self.games
+
+    def ppg_many(self, vectors: np.ndarray) -> np.ndarray:
+        """Points per game (players x leagues) for many scoring vectors"""
+        return self.points_many(vectors) / self.games[:, None]
+
+    def replacement_levels(self, shape: RosterShape) -> np.ndarray:
+        """Replacement PPG per position code for a league roster shape (memoized)"""
+        levels = self._replacement.get(shape)
+        if levels is None:
+            levels = replacement_levels(self.base_ppg, self.codes, shape)
+            levels.flags.writeable = False
+            self._replacement[shape] = levels
+        return levels
+
+
+def _fill(stats: Mapping[str, np.ndarray], stat_map: Mapping[str, Sequence[str]], n: int) -> np.ndarray:
+    values = np.zeros((n, len(SCORING_KEYS)))
+    for key, stat_keys in stat_map.items():
+        for stat_key in stat_keys:
+            values[:, _COLUMN[key]] += np.nan_to_num(stats[stat_key], nan=0.0)
+    return values
+
+
+def _stat_keys(stat_map: Mapping[str, Sequence[str]]) -> List[str]:
+    return sorted({stat_key for stat_keys in stat_map.values() for stat_key in stat_keys} | {"games"})
+
+
+def build_stat_matrix(offensive_players: List[Dict], defensive_players: List[Dict]) -> StatMatrix:
+    """
+    Stat matrix of the same pool as calculate_all_player_values_batch
+
+    Rows: offensive players (QB/RB/WR/TE/K), then IDP players (DL/LB/DB).
+    Games default to 17 when missing, with a minimum of 1.
+    """
+    offense = [p for p in offensive_players if p.get("id", "") and p.get("position", "") in OFFENSIVE_POSITIONS]
+    defense = []
+    for player in defensive_players:
+        position = player.get("fantasyPosition", player.get("position", ""))
+        if player.get("id", "") and position in IDP_POSITIONS:
+            defense.append((player, position))
+
+    offense_stats = stats_to_columns([p.get("stats", {}) for p in offense], _stat_keys(OFFENSIVE_STAT_MAP))
+    offense_values = _fill(offense_stats, OFFENSIVE_STAT_MAP, len(offense))
+    is_te = np.array([p.get("position") == "TE" for p in offense], dtype=bool)
+    offense_values[~is_te, _COLUMN["bonus_rec_te"]] = 0.0
+
+    defense_stats = stats_to_columns([p.get("stats", {}) for p, _ in defense], _stat_keys(IDP_STAT_MAP))
+    defense_values = _fill(defense_stats, IDP_STAT_MAP, len(defense))
+    # Fonte sem soloTackles: o total de tackles conta como solo (mesmo
+    # fallback de _calculate_idp_ppg, para o vetor padrão reproduzir base_ppg)
+    solo = defense_stats["soloTackles"]
+    no_solo = np.isnan(solo) | (solo == 0)
+    defense_values[no_solo, _COLUMN["tkl_solo"]] = np.nan_to_num(defense_stats["tackles"][no_solo], nan=0.0)
+
+    games = np.concatenate([offense_stats["games"], defense_stats["games"]])
+    games = np.maximum(1.0, np.where(np.isnan(games), 17.0, games))
+
+    positions = [p["position"] for p in offense] + [position for _, position in defense]
+    base_ppg = calculate_ppg_batch(
+        position_codes(positions),
+        stats_to_columns([p.get("stats", {}) for p in offense] + [p.get("stats", {}) for p, _ in defense]),
+    )
+
+    return StatMatrix(
+        player_ids=[p["id"] for p in offense] + [p["id"] for p, _ in defense],
+        positions=positions,
+        games=games,
+        values=np.vstack([offense_values, defense_values]),
+        base_ppg=base_ppg,
+    )
+
+
+def scoring_vector(scoring_settings: Optional[Mapping] = None) -> np.ndarray:
+    """
+    League scoring vector over SCORING_KEYS
+
+    Sleeper scoring_settings list every stat the league scores, so keys
+    missing from the settings score 0 (mapped through SLEEPER_KEY_MAP).
+    None returns STANDARD_SCORING.
+    """
+    if scoring_settings is None:
+        return STANDARD_VECTOR.copy()
+    vector = np.zeros(len(SCORING_KEYS))
+    for sleeper_key, our_key in SLEEPER_KEY_MAP.items():
+        value = scoring_settings.get(sleeper_key)
+        if value is not None:
+            vector[_COLUMN[our_key]] = float(value)
+    return vector
+
+
+def scoring_matrix(leagues: Sequence[Mapping]) -> np.ndarray:
+    """(leagues x SCORING_KEYS) matrix of scoring vectors"""
+    if not leagues:
+        return np.zeros((0, len(SCORING_KEYS)))
+    return np.vstack([scoring_vector(settings) for settings in leagues])
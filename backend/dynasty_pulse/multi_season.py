@@ -14,6 +14,8 @@ Default: Last 3 seasons with weighted average (recent = more weight)
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
 # Current season detection
 def get_current_season() -> int:
     """
@@ -53,6 +55,30 @@ SEASON_WEIGHTS: Dict[int, float] = {
 }
 
 
+# Offensive stats to aggregate (keys match Tank01/nflverse API)
+OFFENSIVE_AGGREGATED_STATS: List[str] = [
+    # Passing
+    "passingYards", "passingTds", "interceptions", "attempts", "completions",
+    # Rushing
+    "rushingYards", "rushingTds", "carries",
+    # Receiving
+    "receivingYards", "receivingTds", "receptions", "targets",
+    # Other
+    "games", "fumblesLost", "fantasyPointsPpr",
+]
+
+# Defensive stats to aggregate
+DEFENSIVE_AGGREGATED_STATS: List[str] = [
+    "tackles", "soloTackles", "assistTackles", "tfl",
+    "sacks", "interceptions", "passesDefended", "forcedFumbles",
+    "fumbleRecoveryOpp", "fumbleRecoveryOwn", "defensiveTds",
+    "qbHits", "games",
+]
+
+# Ordem de acumulação (interceptions/games aparecem nas duas listas)
+AGGREGATED_STATS: List[str] = OFFENSIVE_AGGREGATED_STATS + DEFENSIVE_AGGREGATED_STATS
+
+
 def calculate_weight(years_ago: int) -> float:
     """
     Returns weight for a season based on how many years ago it was.
@@ -104,35 +130,13 @@ def aggregate_player_stats(
     aggregated_stats = {}
     total_weight = 0.0
 
-    # Offensive stats to aggregate (keys match Tank01/nflverse API)
-    offensive_stats = [
-        # Passing
-        "passingYards", "passingTds", "interceptions", "attempts", "completions",
-        # Rushing
-        "rushingYards", "rushingTds", "carries",
-        # Receiving
-        "receivingYards", "receivingTds", "receptions", "targets",
-        # Other
-        "games", "fumblesLost", "fantasyPointsPpr",
-    ]
-
-    # Defensive stats to aggregate
-    defensive_stats = [
-        "tackles", "soloTackles", "assistTackles", "tfl",
-        "sacks", "interceptions", "passesDefended", "forcedFumbles",
-        "fumbleRecoveryOpp", "fumbleRecoveryOwn", "defensiveTds",
-        "qbHits", "games",
-    ]
-
-    all_stats = offensive_stats + defensive_stats
-
     for season in seasons_found:
         years_ago = current_season - season
         weight = calculate_weight(years_ago)
         total_weight += weight
 
         stats = per_season_stats.get(season, {})
-        for stat_key in all_stats:
+        for stat_key in AGGREGATED_STATS:
             if stat_key in stats and stats[stat_key] is not None:
                 if stat_key not in aggregated_stats:
                     aggregated_stats[stat_key] = 0.0
@@ -153,6 +157,113 @@ def aggregate_player_stats(
     return base_player, per_season_stats
 
 
+def _stat_matrix(stats: List[dict], keys: List[str]) -> np.ndarray:
+    """Matriz float (linhas x keys) de uma lista de dicts de stats (ausente/None -> NaN)"""
+    nan = float("nan")
+    return np.fromiter(
+        (nan if v is None else v for s in stats for v in map(s.get, keys)),
+        dtype=float,
+        count=len(stats) * len(keys),
+    ).reshape(len(stats), len(keys))
+
+
+def aggregate_all_player_stats(
+    multi_season_data: Dict[int, Dict[str, dict]],
+) -> Dict[str, Tuple[dict, Dict[int, dict]]]:
+    """
+    Columnar version of aggregate_player_stats for every player at once.
+
+    Seasons are stacked into one (season, player, stat) array and the
+    SEASON_WEIGHTS average is reduced per player, accumulating in the same
+    season/stat order as aggregate_player_stats so results are identical.
+    Work is linear in players x seasons.
+
+    Args:
+        multi_season_data: Dict mapping season -> player_id -> player_data
+
+    Returns:
+        Dict mapping player_id -> (aggregated player, season -> raw stats),
+        same values aggregate_player_stats returns for each player found
+    """
+    current_season = get_current_season()
+    seasons = list(multi_season_data)
+
+    # Índice global de jogadores (ordem de primeira aparição)
+    index: Dict[str, int] = {}
+    for players in multi_season_data.values():
+        for player_id in players:
+            index.setdefault(player_id, len(index))
+    if not index:
+        return {}
+
+    keys = list(dict.fromkeys(AGGREGATED_STATS))
+    key_pos = [keys.index(k) for k in AGGREGATED_STATS]
+    n_players, n_seasons = len(index), len(seasons)
+
+    values = np.full((n_seasons, n_players, len(keys)), np.nan)
+    present = np.zeros((n_seasons, n_players), dtype=bool)
+    per_season: List[Dict[int, dict]] = [{} for _ in range(n_players)]
+
+    for s, season in enumerate(seasons):
+        players = multi_season_data[season]
+        rows = np.fromiter((index[pid] for pid in players), dtype=np.intp, count=len(players))
+        stats = [player.get("stats", {}) for player in players.values()]
+        values[s, rows] = _stat_matrix(stats, keys)
+        present[s, rows] = True
+        for row, player_stats in zip(rows.tolist(), stats):
+            per_season[row][season] = player_stats
+
+    # Soma ponderada na mesma ordem (temporada, stat) do cálculo escalar
+    weights = [calculate_weight(current_season - season) for season in seasons]
+    totals = np.zeros((n_players, len(keys)))
+    total_weight = np.zeros(n_players)
+    for s, weight in enumerate(weights):
+        total_weight = np.where(present[s], total_weight + weight, total_weight)
+        season_values = values[s]
+        for k in key_pos:
+            column = season_values[:, k]
+            totals[:, k] = np.where(np.isnan(column), totals[:, k], totals[:, k] + column * weight)
+
+    # Todo jogador aparece em alguma temporada, então total_weight > 0
+    averages = totals / total_weight[:, None]
+    has_value = ~np.isnan(values)
+    found = has_value.any(axis=0)
+
+    # Ordem das chaves no dict: temporada em que a stat apareceu primeiro, depois ordem de keys
+    first_season = np.where(found, has_value.argmax(axis=0), n_seasons)
+    patterns, pattern_of = np.unique(first_season, axis=0, return_inverse=True)
+    key_orders = [
+        [k for k in np.lexsort((np.arange(len(keys)), pattern)).tolist() if pattern[k] < n_seasons]
+        for pattern in patterns
+    ]
+
+    counts = present.sum(axis=0).tolist()
+    # Temporada mais recente em que o jogador aparece (maior ano)
+    latest = np.where(present, np.array(seasons)[:, None], -1).argmax(axis=0).tolist()
+
+    averages_rows = averages.tolist()
+    pattern_of = pattern_of.reshape(-1).tolist()
+    results: Dict[str, Tuple[dict, Dict[int, dict]]] = {}
+    for player_id, row in index.items():
+        player_seasons = per_season[row]
+        if counts[row] == 1:
+            (season,) = player_seasons
+            results[player_id] = (multi_season_data[season][player_id], player_seasons)
+            continue
+
+        player = dict(multi_season_data[seasons[latest[row]]][player_id])
+        average = averages_rows[row]
+        player["stats"] = {keys[k]: round(average[k], 2) for k in key_orders[pattern_of[row]]}
+        player["seasons_aggregated"] = sorted(player_seasons, reverse=True)
+        player["aggregation_weights"] = {
+            season: calculate_weight(current_season - season)
+            for season in player_seasons
+        }
+        results[player_id] = (player, player_seasons)
+
+    return results
+
+
 def calculate_trend(
     per_season_stats: Dict[int, dict],
     stat_key: str,
@@ -225,23 +336,112 @@ def get_player_trends(
 
     Returns dict mapping stat_key -> trend info
     """
+    trends = {}
+    for stat in get_trend_stats(position):
+        trends[stat] = calculate_trend(per_season_stats, stat)
+
+    return trends
+
+
+def get_trend_stats(position: str) -> List[str]:
+    """Key stats tracked for trends by position (keys match API)"""
     pos = position.upper()
 
-    # Key stats by position (keys match API)
     if pos == "QB":
-        key_stats = ["passingYards", "passingTds", "interceptions"]
+        return ["passingYards", "passingTds", "interceptions"]
     elif pos == "RB":
-        key_stats = ["rushingYards", "rushingTds", "receptions"]
+        return ["rushingYards", "rushingTds", "receptions"]
     elif pos in ["WR", "TE"]:
-        key_stats = ["receivingYards", "receivingTds", "receptions"]
+        return ["receivingYards", "receivingTds", "receptions"]
     elif pos in ["DL", "LB", "DB"]:
-        key_stats = ["soloTackles", "sacks", "interceptions"]
-    else:
-        key_stats = []
+        return ["soloTackles", "sacks", "interceptions"]
+    return []
+
+
+def calculate_trends_batch(
+    per_season_stats: List[Dict[int, dict]],
+    stat_key: str,
+) -> List[Dict[str, float]]:
+    """
+    Vectorized calculate_trend over many players.
+
+    Builds a (player, season) matrix with seasons newest first; missing
+    seasons and None values are NaN and get compacted out, exactly like
+    the scalar version skips them. Same float operations, same results.
+    """
+    stable = {"direction": "stable", "magnitude": 0.0, "consistency": 1.0}
+    n_players = len(per_season_stats)
+    if not n_players:
+        return []
+
+    seasons = sorted({season for player in per_season_stats for season in player}, reverse=True)
+    column = {season: j for j, season in enumerate(seasons)}
+    cells, values = [], []
+    for i, player in enumerate(per_season_stats):
+        for season, stats in player.items():
+            value = stats.get(stat_key, 0)
+            if value is not None:
+                cells.append(i * len(seasons) + column[season])
+                values.append(value)
+
+    matrix = np.full(n_players * len(seasons), np.nan)
+    matrix[cells] = values
+    matrix = matrix.reshape(n_players, len(seasons))
+
+    # Compacta valores presentes à esquerda (mantendo a ordem)
+    order = np.argsort(np.isnan(matrix), axis=1, kind="stable")
+    matrix = np.take_along_axis(matrix, order, axis=1)
+    current, previous = matrix[:, :-1], matrix[:, 1:]
+
+    valid = ~np.isnan(current) & ~np.isnan(previous) & (previous != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        changes = np.where(valid, (current - previous) / previous, 0.0)
+
+    # Soma sequencial (como sum()) para manter o mesmo arredondamento
+    total = np.zeros(n_players)
+    for j in range(changes.shape[1]):
+        total = total + changes[:, j]
+    n_changes = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_change = total / n_changes
+        same_direction = (valid & ((changes > 0) == (avg_change > 0)[:, None])).sum(axis=1)
+        consistency = np.where(n_changes > 1, same_direction / n_changes, 1.0)
+
+    direction = np.where(avg_change > 0.05, "up", np.where(avg_change < -0.05, "down", "stable"))
+    use_default = (np.array([len(player) for player in per_season_stats]) < 2) | (n_changes == 0)
+
+    return [
+        dict(stable) if default else {
+            "direction": direction_,
+            "magnitude": round(avg * 100, 1),  # As percentage
+            "consistency": round(consistency_, 2),
+        }
+        for default, direction_, avg, consistency_ in zip(
+            use_default.tolist(), direction.tolist(), avg_change.tolist(), consistency.tolist()
+        )
+    ]
 
-    trends = {}
-    for stat in key_stats:
-        trends[stat] = calculate_trend(per_season_stats, stat)
+
+def get_all_player_trends(
+    per_season_by_player: Dict[str, Dict[int, dict]],
+    positions: Dict[str, str],
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Bulk get_player_trends: player_id -> stat_key -> trend info
+
+    Players are grouped by their tracked stats and each stat is computed
+    for the whole group with calculate_trends_batch.
+    """
+    groups: Dict[Tuple[str, ...], List[str]] = {}
+    for player_id, position in positions.items():
+        groups.setdefault(tuple(get_trend_stats(position)), []).append(player_id)
+
+    trends: Dict[str, Dict[str, Dict[str, float]]] = {player_id: {} for player_id in positions}
+    for key_stats, player_ids in groups.items():
+        per_season = [per_season_by_player[player_id] for player_id in player_ids]
+        for stat in key_stats:
+            for player_id, trend in zip(player_ids, calculate_trends_batch(per_season, stat)):
+                trends[player_id][stat] = trend
 
     return trends
 
@@ -251,6 +451,7 @@ def enhanced_dynasty_window(
     age: Optional[int],
     position: str,
     per_season_stats: Dict[int, dict],
+    trends: Optional[Dict[str, Dict[str, float]]] = None,
 ) -> Dict:
     """
     Enhanced dynasty window calculation using multi-season trends.
@@ -259,6 +460,9 @@ def enhanced_dynasty_window(
     - Players declining faster than expected (injury risk, etc.)
     - Players still improving (late bloomers)
     - Stable performers
+
+    trends: precomputed get_player_trends result (e.g. from
+    get_all_player_trends); computed here when omitted.
     """
     from .aging import get_dynasty_window
 
@@ -266,7 +470,8 @@ def enhanced_dynasty_window(
     base_window = get_dynasty_window(age, position)
 
     # Get performance trends
-    trends = get_player_trends(per_season_stats, position)
+    if trends is None:
+        trends = get_player_trends(per_season_stats, position)
 
     # Adjust recommendation based on trends
     adjustment_factor = 1.0
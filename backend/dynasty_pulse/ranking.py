@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Positional Ranks and Percentile Tiers
+
+get_vorp_tier uses absolute VORP thresholds per position, and clients had to
+re-sort the value lists to get ranks. rank_players sorts the pool once (value
+desc, stable: ties keep the pool order) and derives every rank from that
+single order:
+
+- overall_rank: 1-based rank in the whole pool
+- pos_rank: 1-based rank within the position group
+- percentile: 100 = best of the position, 100/n = last
+- percentile_tier: the "top X%" tiers that get_vorp_tier documents
+  (elite 5%, star 15%, starter 30%, depth 50%, replacement below)
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .batch import POSITIONS
+
+# Tier -> top X% do grupo da posição (fração de jogadores à frente < X)
+PERCENTILE_TIERS: Dict[str, float] = {
+    "elite": 0.05,
+    "star": 0.15,
+    "starter": 0.30,
+    "depth": 0.50,
+}
+PERCENTILE_TIER_NAMES = np.array(list(PERCENTILE_TIERS) + ["replacement"], dtype=object)
+_TIER_CUTOFFS = np.array(list(PERCENTILE_TIERS.values()))
+
+_RANK_LABEL = re.compile(r"^([A-Za-z]*)(\d+)$")
+
+
+def rank_players(values: np.ndarray, codes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Ranks of a player pool from one stable sort
+
+    Args:
+        values: Value per player (higher = better)
+        codes: Position codes (dynasty_pulse.batch.position_codes)
+
+    Returns:
+        Dict of per-player arrays (same order as the inputs): overall_rank,
+        pos_rank, percentile, percentile_tier; plus order (rows by value)
+        and groups (position code -> rows by value within the position)
+    """
+    n = len(values)
+    order = np.argsort(-np.asarray(values, dtype=float), kind="stable")
+
+    overall_rank = np.empty(n, dtype=np.int64)
+    overall_rank[order] = np.arange(1, n + 1)
+
+    # Agrupa a ordem global por posição (sort estável: mantém a ordem de valor)
+    sorted_codes = codes[order]
+    by_code = np.argsort(sorted_codes, kind="stable")
+    counts = np.bincount(codes, minlength=len(POSITIONS) + 1)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    grouped = order[by_code]
+
+    pos_rank = np.empty(n, dtype=np.int64)
+    pos_rank[grouped] = np.arange(n) - starts[sorted_codes[by_code]] + 1
+
+    group_size = counts[codes]
+    # Fração do grupo à frente do jogador: o 1º de cada posição é sempre elite
+    ahead = (pos_rank - 1) / np.maximum(group_size, 1)
+    percentile = 100.0 * (1.0 - ahead)
+    tier = np.searchsorted(_TIER_CUTOFFS, ahead, side="right")
+
+    groups = {
+        code: grouped[starts[code]:starts[code] + counts[code]]
+        for code in range(len(counts)) if counts[code]
+    }
+    return {
+        "order": order,
+        "groups": groups,
+        "overall_rank": overall_rank,
+        "pos_rank": pos_rank,
+        "percentile": percentile,
+        "percentile_tier": PERCENTILE_TIER_NAMES[tier],
+    }
+
+
+def rank_fields(ranks: Dict[str, np.ndarray], i: int) -> Dict:
+    """Rank fields of row i, ready to merge into a player breakdown"""
+    return {
+        "overall_rank": int(ranks["overall_rank"][i]),
+        "pos_rank": int(ranks["pos_rank"][i]),
+        "percentile": round(float(ranks["percentile"][i]), 1),
+        "percentile_tier": ranks["percentile_tier"][i],
+    }
+
+
+def ranked_rows(ranks: Dict[str, np.ndarray], position: Optional[str] = None) -> np.ndarray:
+    """
+    Rows by value, optionally of one position (overall ranks stay those of
+    the whole pool); unknown position -> empty
+    """
+    if not position:
+        return ranks["order"]
+    position = position.upper()
+    empty = ranks["order"][:0]
+    return ranks["groups"].get(POSITIONS.index(position), empty) if position in POSITIONS else empty
+
+
+def parse_rank(label: str) -> Optional[Tuple[Optional[str], int]]:
+    """'WR24' -> ("WR", 24); '7' -> (None, 7) (overall); invalid -> None"""
+    match = _RANK_LABEL.match(label.strip())
+    if match is None or int(match.group(2)) < 1:
+        return None
+    position = match.group(1).upper() or None
+    return position, int(match.group(2))
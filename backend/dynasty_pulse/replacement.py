@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+League-aware Replacement Levels
+
+REPLACEMENT_LEVEL (vorp.py) is a fixed table for a 12-team 1QB league. Here
+the replacement level of each position is derived from the league's roster:
+
+- starters per position = dedicated slots x teams
+- flex slots (FLEX, SUPER_FLEX, ...) go, one at a time in order of
+  eligibility (most restrictive first), to the best players not yet counted
+  as starters
+- replacement level = PPG of the best non-starter at the position
+
+Each position is a partial sort (np.partition) of the season's PPG array,
+so only the top of the pool is ordered. Positions without a starting slot
+in the league keep the REPLACEMENT_LEVEL baseline.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import POSITIONS, UNKNOWN
+from .vorp import REPLACEMENT_LEVEL
+
+# Slots flex do Sleeper -> posições elegíveis, do mais restrito ao mais amplo
+FLEX_SLOTS: Dict[str, Tuple[str, ...]] = {
+    "WRRB_FLEX": ("RB", "WR"),
+    "REC_FLEX": ("WR", "TE"),
+    "FLEX": ("RB", "WR", "TE"),
+    "IDP_FLEX": ("DL", "LB", "DB"),
+    "SUPER_FLEX": ("QB", "RB", "WR", "TE"),
+}
+
+# Aliases de slot usados por outras plataformas/ligas antigas
+_SLOT_ALIASES = {"OP": "SUPER_FLEX", "QB/WR/RB/TE": "SUPER_FLEX"}
+
+DEFAULT_TEAMS = 12
+
+# (teams, ((slot, count), ...)): hashable, chave de memoização
+RosterShape = Tuple[int, Tuple[Tuple[str, int], ...]]
+
+
+def roster_shape(roster_positions: Optional[Sequence[str]], total_rosters: Optional[int] = None) -> RosterShape:
+    """
+    Starting lineup of a league as a hashable shape
+
+    Bench/IR/taxi slots and slots that are neither a position nor a known
+    flex (e.g. team DEF) are ignored.
+    """
+    counts: Dict[str, int] = {}
+    for slot in roster_positions or []:
+        slot = _SLOT_ALIASES.get(slot.upper(), slot.upper())
+        if slot in POSITIONS or slot in FLEX_SLOTS:
+            counts[slot] = counts.get(slot, 0) + 1
+    teams = int(total_rosters) if total_rosters else DEFAULT_TEAMS
+    return teams, tuple(sorted(counts.items()))
+
+
+def _top(ppg: np.ndarray, k: int) -> np.ndarray:
+    """Top k values, descending (partial sort: only the top k are ordered)"""
+    k = min(k, len(ppg))
+    if k <= 0:
+        return ppg[:0]
+    top = np.partition(ppg, len(ppg) - k)[len(ppg) - k:]
+    return np.sort(top)[::-1]
+
+
+def starter_counts(ppg: np.ndarray, codes: np.ndarray, shape: RosterShape) -> np.ndarray:
+    """Starters per position code (last slot = unknown position, always 0)"""
+    teams, slots = shape
+    slots = dict(slots)
+    by_position = [ppg[codes == code] for code in range(len(POSITIONS))]
+
+    starters = np.zeros(len(POSITIONS) + 1, dtype=np.int64)
+    for code, position in enumerate(POSITIONS):
+        starters[code] = slots.get(position, 0) * teams
+
+    for slot, eligible in FLEX_SLOTS.items():
+        needed = slots.get(slot, 0) * teams
+        if not needed:
+            continue
+        # Candidatos: os `needed` melhores ainda não titulares de cada posição elegível
+        candidates: List[np.ndarray] = []
+        owners: List[np.ndarray] = []
+        for position in eligible:
+            code = POSITIONS.index(position)
+            ranked = _top(by_position[code], starters[code] + needed)[starters[code]:]
+            candidates.append(ranked)
+            owners.append(np.full(len(ranked), code))
+        pool = np.concatenate(candidates)
+        owner = np.concatenate(owners)
+        if len(pool) > needed:
+            chosen = np.argpartition(pool, len(pool) - needed)[len(pool) - needed:]
+            owner = owner[chosen]
+        starters += np.bincount(owner, minlength=len(starters))[:len(starters)]
+
+    starters[UNKNOWN] = 0
+    return starters
+
+
+def replacement_levels(ppg: np.ndarray, codes: np.ndarray, shape: RosterShape) -> np.ndarray:
+    """
+    Replacement PPG per position code for a league shape
+
+    Args:
+        ppg: Season PPG of the player pool
+        codes: Position codes (dynasty_pulse.batch.position_codes)
+        shape: roster_shape() of the league
+
+    Returns:
+        Array indexed by position code (last slot = unknown position), ready
+        for calculate_values_batch(replacement=...)
+    """
+    starters = starter_counts(ppg, codes, shape)
+    levels = np.array([REPLACEMENT_LEVEL.get(pos, 0.0) for pos in POSITIONS] + [0.0])
+    for code in range(len(POSITIONS)):
+        n = int(starters[code])
+        pool = ppg[codes == code]
+        if n == 0 or len(pool) == 0:
+            continue
+        # Melhor não titular = (n+1)-ésimo maior; sem ele, o último do pool
+        levels[code] = _top(pool, n + 1)[-1]
+    return levels
+
+
+def levels_to_dict(levels: np.ndarray) -> Dict[str, float]:
+    """Replacement levels by position name (for API responses)"""
+    return {pos: round(float(levels[code]), 2) for code, pos in enumerate(POSITIONS)}
@@ -11,9 +11,19 @@ Example adjustments:
 - Superflex: QBs worth more (already handled in vorp.py)
 - IDP Scoring: Adjust DL/LB/DB based on tackle/sack/INT points
 - PPR vs Standard: Adjust WR/RB value based on reception points
+
+Multipliers depend only on (league settings, position): compile_scoring_profile
+turns a league's scoring_settings into a ScoringProfile once (cached by
+settings hash), and the profile adjusts a whole value column at once.
 """
 
-from typing import Dict, Optional, Tuple
+import hashlib
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import POSITIONS, position_codes
 
 # Standard scoring values (baseline for comparison)
 STANDARD_SCORING: Dict[str, float] = {
@@ -130,9 +140,11 @@ def calculate_scoring_multiplier(
         - multiplier: Float to multiply base value by
         - breakdown_dict: Explanation of adjustments made
     """
-    settings = normalize_scoring_settings(scoring_settings)
-    pos = position.upper()
+    return _position_adjustment(normalize_scoring_settings(scoring_settings), position.upper())
 
+
+def _position_adjustment(settings: Dict[str, float], pos: str) -> Tuple[float, Dict[str, float]]:
+    """Multiplier rules for normalized settings and an upper-case position"""
     multiplier = 1.0
     breakdown: Dict[str, float] = {}
 
@@ -253,13 +265,91 @@ def apply_scoring_adjustment(
     Returns:
         Tuple of (adjusted_value, multiplier, breakdown)
     """
-    multiplier, breakdown = calculate_scoring_multiplier(scoring_settings, position)
+    profile = compile_scoring_profile(scoring_settings)
+    multiplier = profile.multiplier(position)
+    breakdown = profile.breakdown(position)
     adjusted_value = int(base_value * multiplier)
     adjusted_value = max(0, min(10000, adjusted_value))
 
     return adjusted_value, multiplier, breakdown
 
 
+class ScoringProfile:
+    """
+    Compiled league scoring: one multiplier per position code.
+
+    Immutable and hashable (by settings hash). The multiplier vector is
+    indexed like dynasty_pulse.batch codes (last slot = unknown position);
+    breakdowns are only built when asked for.
+    """
+
+    __slots__ = ("key", "settings", "multipliers")
+
+    def __init__(self, settings: Tuple[Tuple[str, float], ...]):
+        self.settings = settings
+        self.key = hashlib.sha256(repr(settings).encode()).hexdigest()[:16]
+        normalized = dict(settings)
+        multipliers = np.array(
+            [_position_adjustment(normalized, pos)[0] for pos in POSITIONS + [""]],
+            dtype=float,
+        )
+        multipliers.flags.writeable = False
+        self.multipliers = multipliers
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ScoringProfile) and self.settings == other.settings
+
+    def __hash__(self) -> int:
+        return hash(self.settings)
+
+    def __repr__(self) -> str:
+        return f"ScoringProfile({self.key})"
+
+    def multiplier(self, position: str) -> float:
+        """Multiplier for a single position"""
+        pos = position.upper()
+        return float(self.multipliers[POSITIONS.index(pos) if pos in POSITIONS else -1])
+
+    def breakdown(self, position: str) -> Dict[str, float]:
+        """Explanation of the adjustments for a position (new dict per call)"""
+        return _position_adjustment(dict(self.settings), position.upper())[1]
+
+    def apply(self, base_values: np.ndarray, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Adjusts a whole value column at once.
+
+        Args:
+            base_values: Base dynasty values (0-10000)
+            codes: Position codes (dynasty_pulse.batch.position_codes)
+
+        Returns:
+            Tuple of (adjusted_values, multipliers), same as
+            apply_scoring_adjustment element-wise
+        """
+        multipliers = self.multipliers[codes]
+        adjusted = np.clip(np.trunc(np.asarray(base_values, dtype=float) * multipliers), 0, 10000)
+        return adjusted.astype(np.int64), multipliers
+
+    def apply_positions(self, base_values: np.ndarray, positions: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """apply() for position names instead of codes"""
+        return self.apply(base_values, position_codes(positions))
+
+
+@lru_cache(maxsize=256)
+def _compile(settings: Tuple[Tuple[str, float], ...]) -> ScoringProfile:
+    return ScoringProfile(settings)
+
+
+def compile_scoring_profile(scoring_settings: Dict) -> ScoringProfile:
+    """
+    Compiles league scoring settings into a (cached) ScoringProfile.
+
+    Settings are normalized first, so leagues that only differ in keys the
+    multiplier rules ignore share the same profile.
+    """
+    return _compile(tuple(sorted(normalize_scoring_settings(scoring_settings).items())))
+
+
 def get_league_type_description(scoring_settings: Dict) -> str:
     """
     Returns a human-readable description of the league type.
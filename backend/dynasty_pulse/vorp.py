@@ -42,6 +42,18 @@ SCARCITY_MULTIPLIER: Dict[str, float] = {
     "DB": 0.8,
 }
 
+# Thresholds de tier por posição (ajustados para PPR)
+VORP_TIER_THRESHOLDS: Dict[str, Dict[str, float]] = {
+    "QB": {"elite": 12, "star": 8, "starter": 4, "depth": 0},
+    "RB": {"elite": 10, "star": 6, "starter": 3, "depth": 0},
+    "WR": {"elite": 8, "star": 5, "starter": 2, "depth": 0},
+    "TE": {"elite": 6, "star": 4, "starter": 2, "depth": 0},
+    "K": {"elite": 3, "star": 2, "starter": 1, "depth": 0},
+    "DL": {"elite": 5, "star": 3, "starter": 1.5, "depth": 0},
+    "LB": {"elite": 6, "star": 4, "starter": 2, "depth": 0},
+    "DB": {"elite": 4, "star": 2.5, "starter": 1, "depth": 0},
+}
+
 # Superflex multiplier para QB
 SF_QB_MULTIPLIER = 1.8
 
@@ -201,23 +213,11 @@ def get_vorp_tier(vorp: float, position: str) -> str:
     - Depth: Top 50%
     - Replacement: Abaixo de 50%
     """
-    # Thresholds por posição (ajustados para PPR)
-    thresholds = {
-        "QB": {"elite": 12, "star": 8, "starter": 4, "depth": 0},
-        "RB": {"elite": 10, "star": 6, "starter": 3, "depth": 0},
-        "WR": {"elite": 8, "star": 5, "starter": 2, "depth": 0},
-        "TE": {"elite": 6, "star": 4, "starter": 2, "depth": 0},
-        "K": {"elite": 3, "star": 2, "starter": 1, "depth": 0},
-        "DL": {"elite": 5, "star": 3, "starter": 1.5, "depth": 0},
-        "LB": {"elite": 6, "star": 4, "starter": 2, "depth": 0},
-        "DB": {"elite": 4, "star": 2.5, "starter": 1, "depth": 0},
-    }
-
     pos = position.upper()
-    if pos not in thresholds:
+    if pos not in VORP_TIER_THRESHOLDS:
         return "unknown"
 
-    t = thresholds[pos]
+    t = VORP_TIER_THRESHOLDS[pos]
 
     if vorp >= t["elite"]:
         return "elite"
@@ -0,0 +1,157 @@
+"""
+Executor dedicado para trabalho bloqueante (pandas, downloads do nflverse)
+
+Os handlers FastAPI são async; qualquer read_parquet/transformação pandas
+rodando direto no event loop congela todos os outros requests (inclusive
+health checks). run_blocking envia esse trabalho para um pool de threads
+de tamanho fixo (NFLVERSE_EXECUTOR_WORKERS) e mede a fila.
+
+run_cpu_bound envia transformações puramente CPU (DataFrame -> payload)
+para um pool de processos (NFLVERSE_PROCESS_WORKERS), para que várias
+temporadas sejam transformadas em paralelo apesar do GIL. Com 0 workers
+o trabalho cai no pool de threads.
+
+Os dois pools são criados sob demanda e recriados depois de
+shutdown_executor, então um novo startup da API no mesmo processo
+(TestClient, --reload) volta a ter executores vivos.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from config import NFLVERSE_EXECUTOR_WORKERS, NFLVERSE_PROCESS_WORKERS
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+# spawn: seguro com as threads do pool acima já rodando
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+_lock = threading.Lock()
+_metrics = {
+    "queued": 0,           # aguardando thread livre
+    "running": 0,          # executando agora
+    "completed": 0,
+    "failed": 0,
+    "max_queue_depth": 0,  # maior fila observada
+    "total_wait_seconds": 0.0,
+}
+_process_metrics = {"submitted": 0, "completed": 0, "failed": 0}
+
+
+async def run_blocking(fn: Callable[..., T], *args) -> T:
+    """Executa fn(*args) no pool dedicado sem bloquear o event loop"""
+    loop = asyncio.get_running_loop()
+    submitted_at = time.perf_counter()
+    state = {"started": False, "abandoned": False}
+
+    with _lock:
+        _metrics["queued"] += 1
+        _metrics["max_queue_depth"] = max(_metrics["max_queue_depth"], _metrics["queued"])
+
+    def task() -> T:
+        with _lock:
+            state["started"] = True
+            if not state["abandoned"]:
+                _metrics["queued"] -= 1
+            _metrics["running"] += 1
+            _metrics["total_wait_seconds"] += time.perf_counter() - submitted_at
+        try:
+            result = fn(*args)
+        except BaseException:
+            with _lock:
+                _metrics["running"] -= 1
+                _metrics["failed"] += 1
+            raise
+        with _lock:
+            _metrics["running"] -= 1
+            _metrics["completed"] += 1
+        return result
+
+    try:
+        return await loop.run_in_executor(_get_executor(), task)
+    except asyncio.CancelledError:
+        # Cancelado antes de começar: a tarefa pode nunca sair da fila sozinha
+        with _lock:
+            if not state["started"]:
+                state["abandoned"] = True
+                _metrics["queued"] -= 1
+        raise
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, NFLVERSE_EXECUTOR_WORKERS),
+                thread_name_prefix="nflverse",
+            )
+        return _executor
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=NFLVERSE_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+async def run_cpu_bound(fn: Callable[..., T], *args) -> T:
+    """
+    Executa fn(*args) no pool de processos (fn e args precisam ser picklable).
+    Sem processos configurados, usa run_blocking.
+    """
+    if NFLVERSE_PROCESS_WORKERS <= 0:
+        return await run_blocking(fn, *args)
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        _process_metrics["submitted"] += 1
+    try:
+        result = await loop.run_in_executor(_get_process_pool(), fn, *args)
+    except asyncio.CancelledError:
+        raise
+    except BaseException:
+        with _lock:
+            _process_metrics["failed"] += 1
+        raise
+    with _lock:
+        _process_metrics["completed"] += 1
+    return result
+
+
+def get_executor_stats() -> dict:
+    """Retorna profundidade da fila e contadores do pool"""
+    with _lock:
+        stats = dict(_metrics)
+    stats["workers"] = max(1, NFLVERSE_EXECUTOR_WORKERS)
+    # A espera na fila conta para toda tarefa que começou (concluída ou com falha)
+    started = stats["completed"] + stats["failed"]
+    stats["avg_wait_ms"] = round(stats["total_wait_seconds"] / started * 1000, 2) if started else 0.0
+    stats["total_wait_seconds"] = round(stats["total_wait_seconds"], 3)
+    with _lock:
+        stats["processes"] = {"workers": NFLVERSE_PROCESS_WORKERS, **_process_metrics}
+    return stats
+
+
+def shutdown_executor() -> None:
+    """Encerra os pools (chamado no shutdown da API); o próximo uso cria novos"""
+    global _executor, _process_pool
+    with _lock:
+        executor, process_pool = _executor, _process_pool
+        _executor = None
+        _process_pool = None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    if process_pool is not None:
+        process_pool.shutdown(wait=False, cancel_futures=True)
@@ -8,10 +8,13 @@ Suporta múltiplas fontes de dados com fallback automático:
 Licença nflverse: CC-BY-SA 4.0 - https://github.com/nflverse/nflverse-data
 """
 
-from fastapi import FastAPI, Query, HTTPException
+import asyncio
+import numpy as np
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query, Path, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
-import httpx
+from typing import Annotated, Optional
+from pydantic import BaseModel, Field, StringConstraints
 
 from stats import (
     get_defensive_stats,
@@ -19,33 +22,73 @@ from stats import (
     get_available_seasons,
     get_historical_offensive_stats,
     get_historical_defensive_stats,
+    find_player,
 )
-from cache import clear_cache, clear_source_cache, sanitize_for_json, read_cache, write_cache
-from config import PRIMARY_SOURCE
-from sources import is_tank01_configured
-from dynasty_pulse import calculate_all_player_values, get_player_value_breakdown
+from cache import (
+    clear_cache,
+    clear_source_cache,
+    get_memory_cache_stats,
+)
+from singleflight import get_singleflight_stats
+from value_table import ValueTable, get_value_table, get_stat_matrix
+from executor import get_executor_stats, shutdown_executor
+from scheduler import start_scheduler, stop_scheduler, get_scheduler_stats
+from responses import FastJSONResponse
+from response_cache import cached_json_response, clear_response_cache, get_response_cache_stats
+from pagination import ListQuery
+from config import PRIMARY_SOURCE, SLEEPER_MAX_BATCH
+from sources import (
+    is_tank01_configured,
+    close_tank01_client,
+    close_nflverse_client,
+    get_sleeper_league,
+    get_sleeper_leagues,
+    close_sleeper_client,
+    SleeperUnavailableError,
+)
+from dynasty_pulse import get_player_value_breakdown, calculate_all_player_values_batch
+from dynasty_pulse.league_points import StatMatrix, scoring_matrix, scoring_vector
+from dynasty_pulse.replacement import roster_shape, levels_to_dict
+from dynasty_pulse.ranking import rank_players, rank_fields, ranked_rows, parse_rank
+from dynasty_pulse.batch import position_codes
 from dynasty_pulse.values import get_pick_values, value_to_display
 from dynasty_pulse.scoring_adjust import (
     apply_scoring_adjustment,
+    compile_scoring_profile,
+    ScoringProfile,
     get_league_type_description,
     detect_superflex,
 )
 from dynasty_pulse.multi_season import (
     get_current_season,
     get_default_seasons,
-    aggregate_player_stats,
-    get_player_trends,
+    aggregate_all_player_stats,
+    get_all_player_trends,
     enhanced_dynasty_window,
     SEASON_WEIGHTS,
 )
 
-# Sleeper API base URL
-SLEEPER_API = "https://api.sleeper.app/v1"
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup/shutdown da API: inicia o scheduler de refresh do cache no startup;
+    no shutdown para o scheduler e fecha clientes HTTP e o executor
+    """
+    start_scheduler()
+    yield
+    await stop_scheduler()
+    await close_tank01_client()
+    await close_nflverse_client()
+    await close_sleeper_client()
+    shutdown_executor()
+
 
 app = FastAPI(
     title="NFL Stats API",
     description="API para stats de jogadores NFL com fallback automático entre fontes",
     version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # CORS para permitir chamadas do frontend React
@@ -70,7 +113,7 @@ app.add_middleware(
 @app.get("/")
 async def root():
     """Health check e info da API"""
-    seasons = get_available_seasons()
+    seasons = await get_available_seasons()
     return {
         "status": "ok",
         "message": "NFL Stats API with multi-source fallback",
@@ -94,16 +137,32 @@ async def root():
 @app.get("/api/seasons")
 async def available_seasons():
     """Retorna lista de temporadas disponíveis"""
-    seasons = get_available_seasons()
+    seasons = await get_available_seasons()
     return {
         "seasons": seasons,
         "latest": seasons[0] if seasons else 2024,
     }
 
 
+def _stats_payload(result, season: int, page: ListQuery) -> dict:
+    """Payload das rotas de stats (página pedida) com metadata e attribution da fonte"""
+    response = result.to_dict()
+    response.update(page.payload(result.players, version=result.version))
+    response["season"] = season
+
+    # Adiciona attribution baseado na fonte
+    if result.source == "tank01":
+        response["attribution"] = "Data from Tank01 NFL API via RapidAPI"
+    else:
+        response["attribution"] = "Data from nflverse (CC-BY-SA 4.0)"
+    return response
+
+
 @app.get("/api/stats/defense")
 async def defense_stats(
-    season: int = Query(default=2024, ge=2016, le=2025, description="Temporada NFL")
+    request: Request,
+    season: int = Query(default=2024, ge=2016, le=2025, description="Temporada NFL"),
+    page: ListQuery = Depends(),
 ):
     """
     Retorna stats defensivas de jogadores (tackles, sacks, TFL, INT, FF, PD)
@@ -112,25 +171,21 @@ async def defense_stats(
     - source: "tank01" | "nflverse" - fonte dos dados
     - cached: bool - se veio do cache
     - cache_age_seconds: int - idade do cache em segundos
+    - total / next_cursor: paginação (limit, cursor) sobre a lista ordenada; fields= projeta campos
     """
     result = await get_defensive_stats(season)
 
-    response = result.to_dict()
-    response["season"] = season
-
-    # Adiciona attribution baseado na fonte
-    if result.source == "tank01":
-        response["attribution"] = "Data from Tank01 NFL API via RapidAPI"
-    else:
-        response["attribution"] = "Data from nflverse (CC-BY-SA 4.0)"
-
-    # Sanitiza valores inválidos para JSON (NaN, Infinity)
-    return sanitize_for_json(response)
+    # Bytes (e gzip/br) reaproveitados enquanto a versão dos dados não mudar; ETag/304
+    return await cached_json_response(
+        request, ("stats_defense", season, page.key), result.version, lambda: _stats_payload(result, season, page)
+    )
 
 
 @app.get("/api/stats/offense")
 async def offense_stats(
-    season: int = Query(default=2024, ge=2016, le=2025, description="Temporada NFL")
+    request: Request,
+    season: int = Query(default=2024, ge=2016, le=2025, description="Temporada NFL"),
+    page: ListQuery = Depends(),
 ):
     """
     Retorna stats ofensivas de jogadores (passing, rushing, receiving yards/TDs)
@@ -139,31 +194,26 @@ async def offense_stats(
     - source: "tank01" | "nflverse" - fonte dos dados
     - cached: bool - se veio do cache
     - cache_age_seconds: int - idade do cache em segundos
+    - total / next_cursor: paginação (limit, cursor) sobre a lista ordenada; fields= projeta campos
     """
     result = await get_offensive_stats(season)
 
-    response = result.to_dict()
-    response["season"] = season
-
-    if result.source == "tank01":
-        response["attribution"] = "Data from Tank01 NFL API via RapidAPI"
-    else:
-        response["attribution"] = "Data from nflverse (CC-BY-SA 4.0)"
-
-    # Sanitiza valores inválidos para JSON (NaN, Infinity)
-    return sanitize_for_json(response)
+    return await cached_json_response(
+        request, ("stats_offense", season, page.key), result.version, lambda: _stats_payload(result, season, page)
+    )
 
 
 @app.post("/api/cache/clear")
 async def clear_cache_endpoint(
     key: Optional[str] = Query(default=None, description="Chave específica para limpar"),
     season: Optional[int] = Query(default=None, description="Temporada específica para limpar"),
-    source: Optional[str] = Query(default=None, description="Fonte específica (tank01 ou nflverse)"),
+    source: Optional[str] = Query(default=None, description="Fonte específica (tank01, nflverse ou sleeper)"),
 ):
     """
     Limpa o cache de dados
     Útil para forçar atualização dos dados
     """
+    clear_response_cache()
     if source:
         clear_source_cache(source)
         return {"status": "ok", "message": f"Cache de {source} limpo com sucesso"}
@@ -172,16 +222,49 @@ async def clear_cache_endpoint(
         return {"status": "ok", "message": "Cache limpo com sucesso"}
 
 
+@app.get("/api/cache/stats")
+async def cache_stats_endpoint():
+    """
+    Contadores do cache em memória (hits, misses, evictions, entradas),
+    do cache de respostas pré-serializadas e da deduplicação de fetches
+    concorrentes (single-flight)
+    """
+    return {
+        "memory": get_memory_cache_stats(),
+        "responses": get_response_cache_stats(),
+        "singleflight": get_singleflight_stats(),
+    }
+
+
+@app.get("/api/executor/stats")
+async def executor_stats_endpoint():
+    """
+    Métricas do executor do nflverse (fila, threads ocupadas, espera média)
+    """
+    return get_executor_stats()
+
+
+@app.get("/api/scheduler/stats")
+async def scheduler_stats_endpoint():
+    """
+    Estado do scheduler de refresh do cache (última rodada, duração,
+    expiração e falhas de cada entrada mantida quente)
+    """
+    return get_scheduler_stats()
+
+
 # ============================================
 # Dynasty Pulse Endpoints
 # ============================================
 
 @app.get("/api/dynasty-pulse/values")
 async def get_player_values(
+    request: Request,
     season: int = Query(default=2024, ge=2016, le=2025, description="Temporada NFL"),
     position: Optional[str] = Query(default=None, description="Filtrar por posição"),
     superflex: bool = Query(default=False, description="Liga Superflex (boost QBs)"),
     tep: bool = Query(default=False, description="Liga TEP (boost TEs)"),
+    page: ListQuery = Depends(),
 ):
     """
     Dynasty Pulse - Valores calculados de todos os jogadores
@@ -191,45 +274,64 @@ async def get_player_values(
     - Aging Curves por posição
     - Stats reais da temporada
 
+    Cada jogador inclui overall_rank, pos_rank, percentile e percentile_tier.
+
     Parâmetros:
     - season: Temporada para stats (default: 2024)
     - position: Filtrar por posição (QB, RB, WR, TE, K, DL, LB, DB)
     - superflex: Liga Superflex (multiplica valor de QBs)
     - tep: Liga TEP - Tight End Premium (multiplica valor de TEs)
+    - limit / cursor: paginação (top-N) sobre a ordem por valor
+    - fields: campos por jogador (ex: player_id,name,position,display_value)
     """
-    # Busca stats ofensivas e defensivas
-    offense_result = await get_offensive_stats(season)
-    defense_result = await get_defensive_stats(season)
-
-    # Calcula valores
-    all_values = calculate_all_player_values(
-        offensive_players=offense_result.players,
-        defensive_players=defense_result.players,
-        is_superflex=superflex,
-        is_tep=tep,
+    # Tabela materializada (recalculada só quando o cache de stats muda)
+    table = await get_value_table(season, superflex, tep)
+
+    # Já ordenada por valor (maior primeiro); filtra por posição se especificado
+    sorted_values = table.ranked(position)
+
+    return await cached_json_response(
+        request,
+        ("dynasty_values", season, superflex, tep, position.upper() if position else None, page.key),
+        table.version,
+        lambda: {
+            "season": season,
+            "superflex": superflex,
+            "tep": tep,
+            **page.payload(sorted_values, version=table.version),
+        },
     )
 
-    # Filtra por posição se especificado
-    if position:
-        pos_upper = position.upper()
-        all_values = {
-            pid: val for pid, val in all_values.items()
-            if val.get("position") == pos_upper
-        }
 
-    # Ordena por valor (maior primeiro)
-    sorted_values = sorted(
-        all_values.values(),
-        key=lambda x: x.get("final_value", 0),
-        reverse=True
-    )
+@app.get("/api/dynasty-pulse/values/rank/{rank}")
+async def get_player_at_rank(
+    rank: str,
+    season: int = Query(default=2024, ge=2016, le=2025, description="Temporada NFL"),
+    superflex: bool = Query(default=False, description="Liga Superflex"),
+    tep: bool = Query(default=False, description="Liga TEP (boost TEs)"),
+):
+    """
+    Dynasty Pulse - Jogador em um rank (ex: WR24, QB1; só o número = rank geral)
+
+    Os ranks vêm da tabela materializada (uma ordenação por variante), então
+    a consulta é O(1).
+    """
+    parsed = parse_rank(rank)
+    if parsed is None:
+        raise HTTPException(status_code=400, detail=f"Invalid rank: {rank}")
+    position, number = parsed
 
-    return sanitize_for_json({
+    table = await get_value_table(season, superflex, tep)
+    player = table.at_rank(number, position)
+    if player is None:
+        raise HTTPException(status_code=404, detail=f"No player at rank {rank.upper()}")
+
+    return FastJSONResponse({
         "season": season,
         "superflex": superflex,
         "tep": tep,
-        "count": len(sorted_values),
-        "players": sorted_values,
+        "rank": rank.upper(),
+        "player": player,
     })
 
 
@@ -243,25 +345,8 @@ async def get_single_player_value(
     """
     Retorna valor detalhado de um jogador específico com breakdown completo
     """
-    # Busca stats
-    offense_result = await get_offensive_stats(season)
-    defense_result = await get_defensive_stats(season)
-
-    # Procura jogador nas listas
-    player = None
-    is_defense = False
-
-    for p in offense_result.players:
-        if p.get("id") == player_id:
-            player = p
-            break
-
-    if not player:
-        for p in defense_result.players:
-            if p.get("id") == player_id:
-                player = p
-                is_defense = True
-                break
+    # Procura jogador no índice da temporada (ofensa, depois defesa)
+    player, is_defense = await find_player(season, player_id)
 
     if not player:
         return {"error": "Player not found", "player_id": player_id}
@@ -279,7 +364,7 @@ async def get_single_player_value(
         is_tep=tep,
     )
 
-    return sanitize_for_json({
+    return FastJSONResponse({
         "season": season,
         "superflex": superflex,
         "tep": tep,
@@ -340,6 +425,7 @@ async def get_multi_season_values(
     position: Optional[str] = Query(default=None, description="Filter by position"),
     superflex: bool = Query(default=False, description="Superflex league"),
     tep: bool = Query(default=False, description="TEP league"),
+    page: ListQuery = Depends(),
 ):
     """
     Dynasty Pulse - Multi-season aggregated player values
@@ -363,6 +449,9 @@ async def get_multi_season_values(
     - position: Filter by position
     - superflex: Superflex league boost for QBs
     - tep: TE Premium league boost
+    - limit / cursor: pagination (top-N) over the value order
+    - fields: per-player fields; trends and dynasty_window are only built
+      for the returned page, and only when requested
     """
     seasons = get_default_seasons(num_seasons)
     current_season = get_current_season()
@@ -372,11 +461,17 @@ async def get_multi_season_values(
     multi_season_offense: dict = {}
     multi_season_defense: dict = {}
 
-    for season in seasons:
+    async def load_season(season: int):
         # Use historical (nflverse) source for accurate per-season data
-        offense_result = get_historical_offensive_stats(season)
-        defense_result = get_historical_defensive_stats(season)
+        return await asyncio.gather(
+            get_historical_offensive_stats(season),
+            get_historical_defensive_stats(season),
+        )
+
+    # All seasons load concurrently (downloads overlap, transforms run in worker processes)
+    season_results = await asyncio.gather(*(load_season(season) for season in seasons))
 
+    for season, (offense_result, defense_result) in zip(seasons, season_results):
         # Index by player_id for easy lookup
         multi_season_offense[season] = {
             p.get("id"): p for p in offense_result.players if p.get("id")
@@ -385,80 +480,82 @@ async def get_multi_season_values(
             p.get("id"): p for p in defense_result.players if p.get("id")
         }
 
-    # Get all unique player IDs across all seasons
-    all_player_ids = set()
-    for season_data in multi_season_offense.values():
-        all_player_ids.update(season_data.keys())
-    for season_data in multi_season_defense.values():
-        all_player_ids.update(season_data.keys())
-
-    # Calculate values for each player using aggregated stats
-    all_values = {}
-
-    for player_id in all_player_ids:
-        # Try offense first
-        aggregated, per_season = aggregate_player_stats(multi_season_offense, player_id)
-        is_defense = False
-
-        if not aggregated:
-            # Try defense
-            aggregated, per_season = aggregate_player_stats(multi_season_defense, player_id)
-            is_defense = True
-
-        if not aggregated:
-            continue
-
-        pos = aggregated.get("fantasyPosition" if is_defense else "position", "")
-        if not pos or pos not in ["QB", "RB", "WR", "TE", "K", "DL", "LB", "DB"]:
-            continue
-
-        # Filter by position if specified
-        if position and pos != position.upper():
-            continue
-
-        # Calculate value breakdown
-        breakdown = get_player_value_breakdown(
-            player_id=player_id,
-            name=aggregated.get("name", "Unknown"),
-            stats=aggregated.get("stats", {}),
-            position=pos,
-            team=aggregated.get("team") or aggregated.get("teamAbbr"),
-            age=aggregated.get("age"),
-            is_superflex=superflex,
-            is_tep=tep,
-        )
+    # Aggregate every player at once (offense takes precedence over defense)
+    offense_aggregated = aggregate_all_player_stats(multi_season_offense)
+    defense_aggregated = aggregate_all_player_stats(multi_season_defense)
 
-        # Add trends and enhanced dynasty window
-        trends = get_player_trends(per_season, pos)
-        enhanced_window = enhanced_dynasty_window(
-            age=aggregated.get("age"),
-            position=pos,
-            per_season_stats=per_season,
-        )
+    offensive_players: list = []
+    defensive_players: list = []
+    per_season_by_player: dict = {}
+    positions: dict = {}
 
-        breakdown["trends"] = trends
-        breakdown["dynasty_window"] = enhanced_window
-        breakdown["seasons_aggregated"] = aggregated.get("seasons_aggregated", [])
-        breakdown["aggregation_weights"] = aggregated.get("aggregation_weights", {})
+    for aggregated_players, is_defense in [(offense_aggregated, False), (defense_aggregated, True)]:
+        for player_id, (aggregated, per_season) in aggregated_players.items():
+            if is_defense and player_id in offense_aggregated:
+                continue
+
+            pos = aggregated.get("fantasyPosition" if is_defense else "position", "")
+            if not pos or pos not in ["QB", "RB", "WR", "TE", "K", "DL", "LB", "DB"]:
+                continue
 
-        all_values[player_id] = breakdown
+            (defensive_players if pos in ["DL", "LB", "DB"] else offensive_players).append(aggregated)
+            per_season_by_player[player_id] = per_season
+            positions[player_id] = pos
+
+    # Value breakdowns for the whole pool in bulk (the ranking needs every value)
+    all_values = calculate_all_player_values_batch(
+        offensive_players=offensive_players,
+        defensive_players=defensive_players,
+        is_superflex=superflex,
+        is_tep=tep,
+    )
 
-    # Sort by value
-    sorted_values = sorted(
-        all_values.values(),
-        key=lambda x: x.get("final_value", 0),
-        reverse=True
+    # Sort the whole pool by value once (ranks come from the same order), filter
+    # that ranking by position if specified, then enrich only the requested page
+    items = list(all_values.items())
+    ranks = rank_players(
+        np.array([breakdown.get("final_value", 0) for _, breakdown in items], dtype=float),
+        position_codes([breakdown.get("position") or "" for _, breakdown in items]),
     )
+    # Cursors are tied to the stats of every aggregated season
+    versions = [result.version for results in season_results for result in results]
+    data_version = None if None in versions else tuple(versions)
+    ranking = ranked_rows(ranks, position)
+    page_rows, next_cursor = page.page_of(ranking, data_version)
+    page_items = [items[i] for i in page_rows]
+    for i in page_rows:
+        items[i][1].update(rank_fields(ranks, i))
+
+    with_trends = page.wants("trends")
+    with_window = page.wants("dynasty_window")
+    if with_trends or with_window:
+        page_trends = get_all_player_trends(
+            {player_id: per_season_by_player[player_id] for player_id, _ in page_items},
+            {player_id: positions[player_id] for player_id, _ in page_items},
+        )
+
+    for player_id, breakdown in page_items:
+        aggregated, per_season = offense_aggregated.get(player_id) or defense_aggregated[player_id]
+        if with_trends:
+            breakdown["trends"] = page_trends[player_id]
+        if with_window:
+            breakdown["dynasty_window"] = enhanced_dynasty_window(
+                age=aggregated.get("age"),
+                position=positions[player_id],
+                per_season_stats=per_season,
+                trends=page_trends[player_id],
+            )
+        breakdown["seasons_aggregated"] = aggregated.get("seasons_aggregated", [])
+        breakdown["aggregation_weights"] = aggregated.get("aggregation_weights", {})
 
-    return sanitize_for_json({
+    return FastJSONResponse({
         "seasons": seasons,
         "current_season": current_season,
         "num_seasons": num_seasons,
         "superflex": superflex,
         "tep": tep,
         "weights": SEASON_WEIGHTS,
-        "count": len(sorted_values),
-        "players": sorted_values,
+        **page.payload(ranking, [breakdown for _, breakdown in page_items], next_cursor),
     })
 
 
@@ -466,32 +563,113 @@ async def get_multi_season_values(
 # Dynasty Pulse Premium Endpoints
 # ============================================
 
+# Sleeper league IDs are numeric; they end up in the Sleeper URL and in the
+# sleeper_league_{id} cache file name
+LEAGUE_ID_PATTERN = r"^\d{1,32}$"
+LeagueId = Annotated[str, StringConstraints(pattern=LEAGUE_ID_PATTERN)]
+LeagueIdPath = Annotated[str, Path(pattern=LEAGUE_ID_PATTERN, description="Sleeper league ID")]
+
+
 async def fetch_league_settings(league_id: str) -> dict:
     """
-    Fetches league settings from Sleeper API with caching.
+    Fetches league settings from Sleeper (cached, see sources/sleeper.py).
+    Raises 404 if the league does not exist, 503 if Sleeper is unavailable
+    (rate limit, timeout, 5xx) and the league is not cached.
+    """
+    try:
+        league_data = await get_sleeper_league(league_id)
+    except SleeperUnavailableError:
+        raise HTTPException(status_code=503, detail=f"Sleeper unavailable for league {league_id}")
+    if league_data is None:
+        raise HTTPException(status_code=404, detail=f"League not found: {league_id}")
+    return league_data
+
+
+def _league_variant(league_data: dict) -> tuple:
+    """
+    (is_superflex, is_tep, roster shape) of a league: selects its base value table.
+    The roster shape (teams x starting slots) sets the league's replacement levels.
     """
-    cache_key = f"sleeper_league_{league_id}"
-    cached = read_cache(cache_key, 0)
-    if cached:
-        return cached
+    scoring_settings = league_data.get("scoring_settings", {})
+    roster_positions = league_data.get("roster_positions", [])
+    is_superflex = detect_superflex(scoring_settings, roster_positions)
+    is_tep = scoring_settings.get("bonus_rec_te", 0) > 0
+    shape = roster_shape(roster_positions, league_data.get("total_rosters"))
+    return is_superflex, is_tep, shape
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{SLEEPER_API}/league/{league_id}")
-            response.raise_for_status()
-            data = response.json()
-            # Cache for 1 hour
-            write_cache(cache_key, 0, data)
-            return data
-        except httpx.HTTPError as e:
-            raise HTTPException(status_code=404, detail=f"League not found: {league_id}")
+
+def _league_ranking(table: ValueTable, profile: ScoringProfile) -> tuple[np.ndarray, np.ndarray, dict]:
+    """
+    Applies the compiled scoring profile to every player of the table at once
+    and ranks them (overall and positional) by the adjusted value.
+    Returns (adjusted values, multipliers, ranks), aligned with table.rows.
+    """
+    _, base_values, codes = table.columns()
+    adjusted, multipliers = profile.apply(base_values, codes)
+    return adjusted, multipliers, rank_players(adjusted, codes)
+
+
+def _league_values_payload(
+    league_id: str,
+    league_data: dict,
+    table: ValueTable,
+    season: int,
+    position: Optional[str],
+    page: ListQuery,
+    matrix: StatMatrix,
+    league_ppg: np.ndarray,
+) -> dict:
+    """
+    League-adjusted values (requested page) from the value table of the league variant.
+    league_ppg: exact points per game in this league, aligned with the matrix rows.
+    """
+    scoring_settings = league_data.get("scoring_settings", {})
+    is_superflex, is_tep, shape = _league_variant(league_data)
+
+    profile = compile_scoring_profile(scoring_settings)
+    players = table.rows
+    adjusted, multipliers, ranks = _league_ranking(table, profile)
+
+    # Filter the adjusted ranking by position if specified (overall ranks stay
+    # full-pool), then build player data only for the requested page. Cursors
+    # are tied to the stats version (shared by every league, so the batch
+    # endpoint can page all leagues with one cursor)
+    ranking = ranked_rows(ranks, position)
+    page_rows, next_cursor = page.page_of(ranking, table.version)
+
+    page_values = []
+    for i in page_rows:
+        player_data = players[i]
+        adjusted_value = int(adjusted[i])
+        adjusted_player = dict(player_data)
+        adjusted_player["base_value"] = player_data.get("final_value", 0)
+        adjusted_player["final_value"] = adjusted_value
+        adjusted_player["display_value"] = round(adjusted_value / 100, 1)
+        adjusted_player["scoring_multiplier"] = round(float(multipliers[i]), 3)
+        adjusted_player["scoring_adjustments"] = profile.breakdown(player_data.get("position", ""))
+        adjusted_player.update(rank_fields(ranks, i))
+        row = matrix.index.get(player_data.get("player_id"))
+        adjusted_player["league_ppg"] = round(float(league_ppg[row]), 2) if row is not None else None
+        page_values.append(adjusted_player)
+
+    return {
+        "league_id": league_id,
+        "league_name": league_data.get("name", "Unknown League"),
+        "league_type": get_league_type_description(scoring_settings),
+        "is_superflex": is_superflex,
+        "is_tep": is_tep,
+        "season": season,
+        "replacement_levels": levels_to_dict(matrix.replacement_levels(shape)),
+        **page.payload(ranking, page_values, next_cursor),
+    }
 
 
 @app.get("/api/dynasty-pulse/league/{league_id}/values")
 async def get_league_adjusted_values(
-    league_id: str,
+    league_id: LeagueIdPath,
     season: int = Query(default=2024, ge=2016, le=2025, description="NFL Season"),
     position: Optional[str] = Query(default=None, description="Filter by position"),
+    page: ListQuery = Depends(),
 ):
     """
     Dynasty Pulse Premium - League-adjusted player values
@@ -502,9 +680,10 @@ async def get_league_adjusted_values(
     The endpoint:
     1. Fetches league settings from Sleeper API
     2. Detects league type (Superflex, TEP, IDP settings)
-    3. Calculates base values using VORP + Aging
+    3. Calculates base values using VORP + Aging, with replacement levels
+       derived from the league's teams and starting slots
     4. Applies scoring multipliers based on league settings
-    5. Returns adjusted values with breakdown
+    5. Returns adjusted values with breakdown and exact league points per game
 
     Parameters:
     - league_id: Sleeper league ID
@@ -514,80 +693,76 @@ async def get_league_adjusted_values(
     # Fetch league settings from Sleeper
     league_data = await fetch_league_settings(league_id)
 
-    scoring_settings = league_data.get("scoring_settings", {})
-    roster_positions = league_data.get("roster_positions", [])
-    league_name = league_data.get("name", "Unknown League")
+    # Base values from the materialized table for this league variant
+    is_superflex, is_tep, shape = _league_variant(league_data)
+    table = await get_value_table(season, is_superflex, is_tep, shape)
 
-    # Detect league type
-    is_superflex = detect_superflex(scoring_settings, roster_positions)
-    is_tep = scoring_settings.get("bonus_rec_te", 0) > 0
-    league_type = get_league_type_description(scoring_settings)
-
-    # Fetch stats
-    offense_result = await get_offensive_stats(season)
-    defense_result = await get_defensive_stats(season)
+    # Exact league points: stat matrix x league scoring vector
+    matrix = await get_stat_matrix(season)
+    league_ppg = matrix.ppg(scoring_vector(league_data.get("scoring_settings", {})))
 
-    # Calculate base values
-    base_values = calculate_all_player_values(
-        offensive_players=offense_result.players,
-        defensive_players=defense_result.players,
-        is_superflex=is_superflex,
-        is_tep=is_tep,
+    return FastJSONResponse(
+        _league_values_payload(league_id, league_data, table, season, position, page, matrix, league_ppg)
     )
 
-    # Apply scoring adjustments
-    adjusted_values = {}
-    for player_id, player_data in base_values.items():
-        base_value = player_data.get("final_value", 0)
-        pos = player_data.get("position", "")
-
-        # Apply scoring adjustment
-        adjusted_value, multiplier, breakdown = apply_scoring_adjustment(
-            base_value=base_value,
-            scoring_settings=scoring_settings,
-            position=pos,
-        )
 
-        # Create adjusted player data
-        adjusted_player = dict(player_data)
-        adjusted_player["base_value"] = base_value
-        adjusted_player["final_value"] = adjusted_value
-        adjusted_player["display_value"] = round(adjusted_value / 100, 1)
-        adjusted_player["scoring_multiplier"] = round(multiplier, 3)
-        adjusted_player["scoring_adjustments"] = breakdown
+class LeagueValuesRequest(BaseModel):
+    """Body of the batch league values endpoint"""
+    league_ids: list[LeagueId] = Field(min_length=1, max_length=SLEEPER_MAX_BATCH, description="Sleeper league IDs")
+    season: int = Field(default=2024, ge=2016, le=2025, description="NFL Season")
+    position: Optional[str] = Field(default=None, description="Filter by position")
 
-        adjusted_values[player_id] = adjusted_player
 
-    # Filter by position if specified
-    if position:
-        pos_upper = position.upper()
-        adjusted_values = {
-            pid: val for pid, val in adjusted_values.items()
-            if val.get("position") == pos_upper
-        }
+@app.post("/api/dynasty-pulse/leagues/values")
+async def get_leagues_adjusted_values(
+    body: LeagueValuesRequest,
+    page: ListQuery = Depends(),
+):
+    """
+    Dynasty Pulse Premium - League-adjusted values for several leagues at once
+
+    Fetches all league settings from Sleeper in parallel (cached leagues are
+    not requested again) and computes the base values once per league
+    variant (Superflex/TEP/roster shape), shared by every league of that variant. Exact
+    league points for all leagues come from one stat matrix product.
+    limit / cursor / fields (query) apply to each league's player list.
+
+    Returns:
+    - leagues: one /league/{league_id}/values payload per league found
+    - not_found: league IDs that do not exist on Sleeper
+    - unavailable: league IDs Sleeper did not answer (rate limit, timeout, 5xx) and not cached; retry later
+    """
+    leagues, unavailable = await get_sleeper_leagues(body.league_ids)
+    found = {league_id: data for league_id, data in leagues.items() if data is not None}
 
-    # Sort by adjusted value
-    sorted_values = sorted(
-        adjusted_values.values(),
-        key=lambda x: x.get("final_value", 0),
-        reverse=True
+    variants = sorted({_league_variant(data) for data in found.values()})
+    tables = await asyncio.gather(
+        *(get_value_table(body.season, *variant) for variant in variants)
     )
-
-    return sanitize_for_json({
-        "league_id": league_id,
-        "league_name": league_name,
-        "league_type": league_type,
-        "is_superflex": is_superflex,
-        "is_tep": is_tep,
-        "season": season,
-        "count": len(sorted_values),
-        "players": sorted_values,
+    tables_by_variant = dict(zip(variants, tables))
+
+    # Exact points of every player in every league: one (players x leagues) product
+    matrix = await get_stat_matrix(body.season)
+    league_ppg = matrix.ppg_many(scoring_matrix([data.get("scoring_settings", {}) for data in found.values()]))
+
+    return FastJSONResponse({
+        "season": body.season,
+        "count": len(found),
+        "leagues": [
+            _league_values_payload(
+                league_id, data, tables_by_variant[_league_variant(data)], body.season, body.position, page,
+                matrix, league_ppg[:, column],
+            )
+            for column, (league_id, data) in enumerate(found.items())
+        ],
+        "not_found": [league_id for league_id, data in leagues.items() if data is None],
+        "unavailable": unavailable,
     })
 
 
 @app.get("/api/dynasty-pulse/league/{league_id}/player/{player_id}")
 async def get_league_adjusted_player(
-    league_id: str,
+    league_id: LeagueIdPath,
     player_id: str,
     season: int = Query(default=2024, ge=2016, le=2025),
 ):
@@ -597,47 +772,40 @@ async def get_league_adjusted_player(
     # Fetch league settings
     league_data = await fetch_league_settings(league_id)
     scoring_settings = league_data.get("scoring_settings", {})
-    roster_positions = league_data.get("roster_positions", [])
 
-    is_superflex = detect_superflex(scoring_settings, roster_positions)
-    is_tep = scoring_settings.get("bonus_rec_te", 0) > 0
+    is_superflex, is_tep, shape = _league_variant(league_data)
     league_type = get_league_type_description(scoring_settings)
 
-    # Fetch stats
-    offense_result = await get_offensive_stats(season)
-    defense_result = await get_defensive_stats(season)
-
-    # Find player
-    player = None
-    is_defense = False
-
-    for p in offense_result.players:
-        if p.get("id") == player_id:
-            player = p
-            break
-
-    if not player:
-        for p in defense_result.players:
-            if p.get("id") == player_id:
-                player = p
-                is_defense = True
-                break
-
-    if not player:
-        raise HTTPException(status_code=404, detail=f"Player not found: {player_id}")
-
-    # Calculate base breakdown
-    position = player.get("fantasyPosition" if is_defense else "position", "")
-    breakdown = get_player_value_breakdown(
-        player_id=player_id,
-        name=player.get("name", "Unknown"),
-        stats=player.get("stats", {}),
-        position=position,
-        team=player.get("team") or player.get("teamAbbr"),
-        age=player.get("age"),
-        is_superflex=is_superflex,
-        is_tep=is_tep,
-    )
+    # Base breakdown from the league's value table (league replacement levels)
+    table = await get_value_table(season, is_superflex, is_tep, shape)
+    row = table.index.get(player_id)
+    if row is not None:
+        breakdown = dict(table.rows[row])
+        position = breakdown.get("position", "")
+        # Ranks by adjusted value, same ranking as /league/{league_id}/values
+        _, _, ranks = _league_ranking(table, compile_scoring_profile(scoring_settings))
+        breakdown.update(rank_fields(ranks, row))
+    else:
+        # Not in the valued pool: find player via the per-season index
+        # (offense first, then defense), valued with the same league
+        # replacement levels as the table
+        player, is_defense = await find_player(season, player_id)
+        replacement = (await get_stat_matrix(season)).replacement_levels(shape) if shape is not None else None
+        values = calculate_all_player_values_batch(
+            offensive_players=[] if is_defense else [player],
+            defensive_players=[player] if is_defense else [],
+            is_superflex=is_superflex,
+            is_tep=is_tep,
+            replacement=replacement,
+        ) if player else {}
+
+        if player_id not in values:
+            raise HTTPException(status_code=404, detail=f"Player not found: {player_id}")
+
+        breakdown = values[player_id]
+        position = breakdown.get("position", "")
+        # Outside the valued pool: no league ranking
+        breakdown.update(dict.fromkeys(("overall_rank", "pos_rank", "percentile", "percentile_tier")))
 
     # Apply scoring adjustment
     base_value = breakdown.get("final_value", 0)
@@ -654,7 +822,7 @@ async def get_league_adjusted_player(
     breakdown["scoring_multiplier"] = round(multiplier, 3)
     breakdown["scoring_adjustments"] = scoring_breakdown
 
-    return sanitize_for_json({
+    return FastJSONResponse({
         "league_id": league_id,
         "league_type": league_type,
         "is_superflex": is_superflex,
@@ -665,7 +833,7 @@ async def get_league_adjusted_player(
 
 
 @app.get("/api/dynasty-pulse/league/{league_id}/info")
-async def get_league_info(league_id: str):
+async def get_league_info(league_id: LeagueIdPath):
     """
     Returns league info and detected settings.
     Useful for showing users what adjustments will be applied.
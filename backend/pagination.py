@@ -0,0 +1,140 @@
+"""
+Paginação, top-N e projeção de campos das rotas de lista
+
+As listas de jogadores já vêm ordenadas (valor ou stat principal, desc).
+- limit: tamanho da página (top-N quando usado sem cursor)
+- cursor: posição na ordem da lista + tag da versão dos dados que a
+  ordenaram; opaco para o cliente, que só repassa o next_cursor da página
+  anterior (null = última página). Se os dados mudaram desde a página
+  anterior (refresh das stats, rebuild da tabela), a posição não vale mais
+  para a lista nova: 409, e o cliente recomeça da primeira página
+- fields: campos de cada jogador, separados por vírgula; "stats.tackles"
+  projeta um campo aninhado (ex: fields=player_id,name,display_value nos valores)
+
+Sem parâmetros a resposta é a lista inteira, como antes. As rotas que montam
+campos caros por jogador (trends, dynasty_window, ajustes de liga) usam
+ListQuery.page_of e ListQuery.wants para só montar o que vai na página.
+"""
+
+import hashlib
+from typing import Hashable, Optional
+
+from fastapi import HTTPException, Query
+
+MAX_LIMIT = 1000
+
+
+def parse_fields(fields: Optional[str]) -> Optional[dict[str, Optional[set[str]]]]:
+    """'id,stats.tackles' -> {"id": None, "stats": {"tackles"}} (None = campo inteiro)"""
+    if not fields:
+        return None
+    plan: dict[str, Optional[set[str]]] = {}
+    for field in fields.split(","):
+        name, _, nested = field.strip().partition(".")
+        if not name:
+            continue
+        if not nested or plan.get(name, set()) is None:
+            plan[name] = None
+        else:
+            plan.setdefault(name, set()).add(nested)
+    return plan or None
+
+
+def project(items: list[dict], plan: Optional[dict[str, Optional[set[str]]]]) -> list[dict]:
+    """Copia só os campos do plano (ordem do plano) de cada item"""
+    if plan is None:
+        return items
+    projected = []
+    for item in items:
+        row = {}
+        for name, nested in plan.items():
+            if name not in item:
+                continue
+            value = item[name]
+            if nested is not None and isinstance(value, dict):
+                value = {key: value[key] for key in nested if key in value}
+            row[name] = value
+        projected.append(row)
+    return projected
+
+
+def version_tag(version: Hashable) -> Optional[str]:
+    """Tag curta e estável (entre processos) da versão dos dados; None = sem versão"""
+    if version is None:
+        return None
+    return hashlib.blake2b(repr(version).encode(), digest_size=6).hexdigest()
+
+
+class ListQuery:
+    """Parâmetros limit/cursor/fields comuns às rotas de lista (use com Depends())"""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(default=None, ge=1, le=MAX_LIMIT, description="Tamanho da página (top-N)"),
+        cursor: Optional[str] = Query(default=None, description="next_cursor da página anterior"),
+        fields: Optional[str] = Query(default=None, description="Campos por jogador (ex: id,name,stats.tackles)"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+        self.plan = parse_fields(fields)
+        self.offset, self.tag = self._parse_cursor(cursor)
+
+    @staticmethod
+    def _parse_cursor(cursor: Optional[str]) -> tuple[int, Optional[str]]:
+        """'120.3fa9c1' -> (120, '3fa9c1'); '120' -> (120, None) (dados sem versão)"""
+        if not cursor:
+            return 0, None
+        offset, _, tag = cursor.partition(".")
+        if not offset.isdigit() or (tag and not tag.isalnum()):
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+        return int(offset), tag or None
+
+    @property
+    def key(self) -> Hashable:
+        """Identifica a página/projeção (ex: parte da chave do cache de respostas)"""
+        return (self.limit, self.offset, self.tag, self.fields)
+
+    def wants(self, field: str) -> bool:
+        """Se o campo vai na resposta (para pular a montagem dos que não vão)"""
+        return self.plan is None or field in self.plan
+
+    def page_of(self, items: list, version: Hashable = None) -> tuple[list, Optional[str]]:
+        """
+        Fatia da lista ordenada para a página pedida e o cursor da próxima
+        version: versão dos dados que ordenaram items (vai no cursor)
+        """
+        tag = version_tag(version)
+        if self.cursor and tag is not None and self.tag != tag:
+            raise HTTPException(
+                status_code=409,
+                detail="Stale cursor: the list changed since the previous page; restart without cursor",
+            )
+        if self.offset > len(items):
+            raise HTTPException(status_code=400, detail=f"Cursor out of range: {self.cursor}")
+        end = len(items) if self.limit is None else min(self.offset + self.limit, len(items))
+        next_cursor = None
+        if end < len(items):
+            next_cursor = str(end) if tag is None else f"{end}.{tag}"
+        return items[self.offset:end], next_cursor
+
+    def payload(
+        self,
+        items: list[dict],
+        page: Optional[list[dict]] = None,
+        next_cursor: Optional[str] = None,
+        version: Hashable = None,
+    ) -> dict:
+        """
+        count/total/next_cursor/players da página de items, já projetada
+        page/next_cursor: página já montada com page_of (senão fatia items aqui)
+        version: versão dos dados de items (ver page_of)
+        """
+        if page is None:
+            page, next_cursor = self.page_of(items, version)
+        return {
+            "count": len(page),
+            "total": len(items),
+            "next_cursor": next_cursor,
+            "players": project(page, self.plan),
+        }
@@ -0,0 +1,186 @@
+"""
+Cache de respostas pré-serializadas (ETag / 304 / gzip / brotli)
+
+Os payloads das temporadas são iguais para todos os clientes até o cache de
+dados mudar, mas cada request serializava milhares de dicts de novo. Aqui
+cada (endpoint, params) guarda, para a versão atual dos dados:
+- os bytes JSON (serializados uma vez, fora do event loop)
+- as variantes gzip/br, comprimidas na primeira vez que um cliente as aceita
+- um ETag forte (hash dos bytes)
+
+Requests seguintes viram uma cópia de memória; If-None-Match com o ETag
+atual recebe 304. Cache-Control/Vary deixam o Worker do Cloudflare e os
+browsers cachearem a resposta. Como os bytes são congelados por versão, a
+metadata do payload (ex: cache_age_seconds) é a do momento da serialização.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_MAX_AGE, RESPONSE_STALE_WHILE_REVALIDATE
+from executor import run_blocking
+from responses import FastJSONResponse
+from serialization import dumps
+from singleflight import run_once
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, só gzip
+    brotli = None
+
+# Preferência quando o cliente aceita mais de uma
+_ENCODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def _compress(encoding: str, content: bytes) -> bytes:
+    if encoding == "br":
+        return brotli.compress(content, quality=6)
+    return gzip.compress(content, compresslevel=6)
+
+
+class _Body:
+    """Bytes de uma resposta para uma versão dos dados, por content-coding"""
+
+    def __init__(self, version: Hashable, content: bytes):
+        self.version = version
+        self.etag = hashlib.sha256(content).hexdigest()[:32]
+        self.encoded = {"identity": content}
+
+    def header_etag(self, encoding: str) -> str:
+        # Um ETag forte por representação (a codificação muda os bytes)
+        return f'"{self.etag}"' if encoding == "identity" else f'"{self.etag}-{encoding}"'
+
+
+# (endpoint, params) -> _Body, em ordem de uso
+_bodies: "OrderedDict[Hashable, _Body]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0}
+
+
+def _get(key: Hashable, version: Hashable) -> Optional[_Body]:
+    """Bytes em cache da versão atual (contando hit/miss sob o lock), ou None"""
+    with _lock:
+        body = _bodies.get(key)
+        if body is None or body.version != version:
+            _stats["misses"] += 1
+            return None
+        _bodies.move_to_end(key)
+        _stats["hits"] += 1
+        return body
+
+
+def _put(key: Hashable, body: _Body) -> None:
+    if RESPONSE_CACHE_MAX_ENTRIES <= 0:
+        return
+    with _lock:
+        _bodies[key] = body
+        _bodies.move_to_end(key)
+        while len(_bodies) > RESPONSE_CACHE_MAX_ENTRIES:
+            _bodies.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+def _negotiate(accept_encoding: str) -> str:
+    """Melhor content-coding aceito pelo cliente (br > gzip > identity)"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    for encoding in _ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return "identity"
+
+
+def _etag_matches(if_none_match: Optional[str], body: _Body) -> bool:
+    """Comparação fraca do If-None-Match (ignora W/ e a variante de codificação)"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        if tag.split("-", 1)[0] == body.etag:
+            return True
+    return False
+
+
+async def _encoded(body: _Body, encoding: str) -> bytes:
+    content = body.encoded.get(encoding)
+    if content is None:
+        identity = body.encoded["identity"]
+
+        async def compress() -> bytes:
+            return await run_blocking(_compress, encoding, identity)
+
+        content = await run_once(f"response_{body.etag}_{encoding}", compress)
+        body.encoded[encoding] = content
+    return content
+
+
+async def cached_json_response(
+    request: Request,
+    key: Hashable,
+    version: Optional[Hashable],
+    build: Callable[[], Any],
+) -> Response:
+    """
+    Resposta JSON de build() servida dos bytes em cache enquanto version não mudar
+    key: identifica endpoint + params (ex: ("stats_offense", season))
+    version: versão dos dados por trás do payload; None = não cacheável
+    """
+    if version is None:
+        return FastJSONResponse(build())
+
+    body = _get(key, version)
+    if body is None:
+        async def serialize() -> _Body:
+            body = _Body(version, await run_blocking(dumps, build()))
+            _put(key, body)
+            return body
+
+        body = await run_once(f"response_{key}_{version}", serialize)
+
+    encoding = _negotiate(request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": body.header_etag(encoding),
+        "Cache-Control": f"public, max-age={RESPONSE_MAX_AGE}, stale-while-revalidate={RESPONSE_STALE_WHILE_REVALIDATE}",
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), body):
+        with _lock:
+            _stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+
+    content = await _encoded(body, encoding)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content, media_type="application/json", headers=headers)
+
+
+def clear_response_cache() -> None:
+    """Descarta todas as respostas pré-serializadas"""
+    with _lock:
+        _bodies.clear()
+
+
+def get_response_cache_stats() -> dict:
+    """Contadores do cache de respostas"""
+    with _lock:
+        return {
+            **_stats,
+            "entries": len(_bodies),
+            "max_entries": RESPONSE_CACHE_MAX_ENTRIES,
+            "bytes": sum(len(content) for body in _bodies.values() for content in body.encoded.values()),
+            "encodings": _ENCODINGS,
+        }
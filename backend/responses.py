@@ -0,0 +1,20 @@
+"""
+Response classes da API
+
+FastJSONResponse serializa com orjson (serialization.dumps). Endpoints que
+retornam a response diretamente também pulam o jsonable_encoder do FastAPI,
+que percorreria o payload inteiro mais uma vez.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serializada em uma passada pelo orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
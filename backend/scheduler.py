@@ -0,0 +1,224 @@
+"""
+Scheduler de refresh do cache
+
+Sem ele, o primeiro request depois de um deploy (ou de um TTL expirado) paga
+pelo sweep dos 32 times do Tank01 ou pelos downloads do nflverse. O scheduler
+roda no lifespan da API:
+- startup: aquece as temporadas configuradas (a mais recente primeiro)
+- depois: a cada CACHE_REFRESH_INTERVAL, refaz as entradas tank01_*/nflverse_*
+  que expiram em menos de CACHE_REFRESH_AHEAD (+ jitter aleatório por entrada,
+  para os refreshes não sincronizarem), da temporada mais recente para trás
+
+Refresh que não atualiza a entrada conta como falha e é tentado de novo com
+backoff exponencial. Estado (última rodada, duração, falhas) em
+get_scheduler_stats(). Com vários workers, cada um roda o seu scheduler:
+deixe CACHE_REFRESH_ENABLED=true em apenas um.
+"""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+from cache import get_cache_expiry, get_ttl_for_key
+from config import (
+    CACHE_REFRESH_AHEAD,
+    CACHE_REFRESH_ENABLED,
+    CACHE_REFRESH_INTERVAL,
+    CACHE_REFRESH_JITTER,
+    CACHE_WARM_SEASON_COUNT,
+    CACHE_WARM_SEASONS,
+    PRIMARY_SOURCE,
+)
+from sources import (
+    get_defensive_stats_nflverse,
+    get_defensive_stats_tank01,
+    get_offensive_stats_nflverse,
+    get_offensive_stats_tank01,
+    is_tank01_configured,
+    refresh_nflverse_entry,
+    refresh_tank01_players,
+)
+from stats import get_available_seasons
+
+
+class _RefreshJob:
+    """Uma entrada de cache mantida quente e a coroutine que a refaz"""
+
+    def __init__(self, key: str, season: int, refresh: Callable[[], Awaitable], priority: tuple):
+        self.key = key
+        self.season = season
+        self.refresh = refresh
+        self.priority = priority  # menor roda primeiro
+        self.jitter = random.uniform(0, CACHE_REFRESH_JITTER)
+        self.retry_at = 0.0
+        self.failures = 0
+        self.last_run: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def is_due(self, now: float) -> bool:
+        if now < self.retry_at:
+            return False
+        expiry = get_cache_expiry(self.key, self.season)
+        return expiry is None or expiry - now <= CACHE_REFRESH_AHEAD + self.jitter
+
+    async def run(self) -> bool:
+        """Executa o refresh; sucesso = a entrada passou a expirar mais tarde"""
+        before = get_cache_expiry(self.key, self.season)
+        started = time.perf_counter()
+        self.last_run = time.time()
+        error = None
+        try:
+            await self.refresh()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.last_duration = time.perf_counter() - started
+
+        after = get_cache_expiry(self.key, self.season)
+        if error is None and after is not None and (before is None or after > before):
+            self.failures = 0
+            self.retry_at = 0.0
+            self.last_error = None
+            self.jitter = random.uniform(0, CACHE_REFRESH_JITTER)
+            return True
+
+        self.failures += 1
+        self.last_error = error or "entrada não foi atualizada"
+        backoff = min(CACHE_REFRESH_INTERVAL * 2 ** self.failures, get_ttl_for_key(self.key))
+        self.retry_at = time.time() + backoff
+        print(f"[scheduler] Refresh de {self.key}_{self.season} falhou ({self.last_error}), retry em {backoff}s")
+        return False
+
+    def to_dict(self, now: float) -> dict:
+        expiry = get_cache_expiry(self.key, self.season)
+        return {
+            "key": self.key,
+            "season": self.season,
+            "expires_in_seconds": int(expiry - now) if expiry is not None else None,
+            "last_run": self.last_run,
+            "last_duration_seconds": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+def _nflverse_job(key: str, season: int, order: int, rebuild: Optional[Callable[[int], Awaitable]] = None) -> _RefreshJob:
+    async def refresh() -> None:
+        await refresh_nflverse_entry(key, season)
+        if rebuild is not None:
+            # Já deixa o payload transformado (memoizado) pronto para o próximo request
+            await rebuild(season)
+
+    return _RefreshJob(key, season, refresh, (-season, order))
+
+
+def build_jobs(seasons: list[int]) -> list[_RefreshJob]:
+    """Entradas a manter quentes para as temporadas, em ordem de prioridade"""
+    seasons = sorted(set(seasons), reverse=True)
+    jobs = []
+
+    # Tank01 só é consultado (e só gasta cota) quando é a fonte primária
+    if seasons and PRIMARY_SOURCE.lower() == "tank01" and is_tank01_configured():
+        # O sweep dos 32 times alimenta as stats de todas as temporadas: vai antes
+        jobs.append(_RefreshJob("tank01_all_players", 0, refresh_tank01_players, (-seasons[0], 0)))
+        for season in seasons:
+            jobs.append(_RefreshJob(
+                f"tank01_off_stats_{season}", 0,
+                lambda s=season: get_offensive_stats_tank01(s, refresh=True), (-season, 1),
+            ))
+            jobs.append(_RefreshJob(
+                f"tank01_def_stats_{season}", 0,
+                lambda s=season: get_defensive_stats_tank01(s, refresh=True), (-season, 2),
+            ))
+
+    for season in seasons:
+        # Roster primeiro: os payloads de stats dependem dele
+        jobs.append(_nflverse_job("nflverse_rosters", season, 3))
+        jobs.append(_nflverse_job("nflverse_player_stats", season, 4, get_offensive_stats_nflverse))
+        jobs.append(_nflverse_job("nflverse_player_stats_def", season, 5, get_defensive_stats_nflverse))
+
+    jobs.sort(key=lambda job: job.priority)
+    return jobs
+
+
+_jobs: list[_RefreshJob] = []
+_task: Optional[asyncio.Task] = None
+_state = {
+    "seasons": [],
+    "runs": 0,
+    "last_run": None,  # started_at, duration_seconds, refreshed, failed
+}
+
+
+async def run_due_jobs(now: Optional[float] = None) -> dict:
+    """Roda (em ordem de prioridade) os refreshes que vencem antes do próximo check"""
+    now = now if now is not None else time.time()
+    due = [job for job in _jobs if job.is_due(now)]
+
+    started = time.perf_counter()
+    refreshed = failed = 0
+    for job in due:
+        if await job.run():
+            refreshed += 1
+        else:
+            failed += 1
+
+    run = {
+        "started_at": now,
+        "duration_seconds": round(time.perf_counter() - started, 3),
+        "refreshed": refreshed,
+        "failed": failed,
+    }
+    _state["runs"] += 1
+    _state["last_run"] = run
+    return run
+
+
+async def _loop() -> None:
+    seasons = CACHE_WARM_SEASONS or (await get_available_seasons())[:CACHE_WARM_SEASON_COUNT]
+    _state["seasons"] = sorted(seasons, reverse=True)
+    _jobs[:] = build_jobs(seasons)
+
+    # A primeira rodada é o warm-up: entradas ausentes estão todas vencidas
+    while True:
+        try:
+            await run_due_jobs()
+        except Exception as e:
+            print(f"[scheduler] Erro na rodada de refresh: {e}")
+        await asyncio.sleep(CACHE_REFRESH_INTERVAL)
+
+
+def start_scheduler() -> None:
+    """Inicia o scheduler em background (chamado no startup da API)"""
+    global _task
+    if not CACHE_REFRESH_ENABLED or (_task is not None and not _task.done()):
+        return
+    _task = asyncio.get_running_loop().create_task(_loop())
+
+
+async def stop_scheduler() -> None:
+    """Cancela o scheduler (chamado no shutdown da API)"""
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
+
+
+def get_scheduler_stats() -> dict:
+    """Estado do scheduler: última rodada, duração, falhas por entrada"""
+    now = time.time()
+    return {
+        "enabled": CACHE_REFRESH_ENABLED,
+        "running": _task is not None and not _task.done(),
+        "interval_seconds": CACHE_REFRESH_INTERVAL,
+        "ahead_seconds": CACHE_REFRESH_AHEAD,
+        "jitter_seconds": CACHE_REFRESH_JITTER,
+        **_state,
+        "jobs": [job.to_dict(now) for job in _jobs],
+    }
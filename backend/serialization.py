@@ -0,0 +1,31 @@
+"""
+Serialização JSON rápida (orjson)
+
+Respostas da API e o cache JSON são serializados em uma única passada pelo
+orjson, direto dos dicts/listas do payload, sem reconstruí-los antes.
+
+Contrato da API: NaN/Infinity chegam ao cliente como 0.0, nunca como null.
+A troca é feita uma vez, na ingestão, de forma vetorizada: helpers de coluna
+do nflverse, safe_int/safe_float do Tank01 e as colunas numéricas do engine
+de valores (calculate_all_player_values_batch). dumps não reescreve valores:
+um NaN que escapar da ingestão sairia como null (tests/test_serialization.py
+verifica o contrato de ponta a ponta).
+"""
+
+from typing import Any
+
+import orjson
+
+# Chaves não-string (ex: int) viram string, como no json da stdlib;
+# escalares/arrays numpy são serializados nativamente
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(obj: Any) -> bytes:
+    """Serializa obj para JSON (bytes UTF-8)"""
+    return orjson.dumps(obj, option=_OPTIONS)
+
+
+def loads(data: bytes) -> Any:
+    """Desserializa JSON"""
+    return orjson.loads(data)
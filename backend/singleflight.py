@@ -0,0 +1,101 @@
+"""
+Single-flight: deduplica trabalho concorrente pela mesma chave
+
+Quando vários requests encontram o cache frio ao mesmo tempo, apenas o
+primeiro ("leader") executa o fetch; os demais aguardam o mesmo resultado
+em vez de repetir o download/transformação.
+
+- run_once: para código async (um Task compartilhado por chave)
+- run_once_sync: para código bloqueante executado em threads
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_inflight: dict[str, asyncio.Task] = {}
+_inflight_sync: dict[str, "_SyncCall"] = {}
+_sync_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"leaders": 0, "followers": 0}
+
+
+def _count(role: str) -> None:
+    with _stats_lock:
+        _stats[role] += 1
+
+
+async def run_once(key: str, fn: Callable[[], Awaitable[T]]) -> T:
+    """
+    Executa fn() uma única vez por chave entre chamadas concorrentes.
+    O trabalho roda em um Task próprio: cancelar um dos chamadores
+    não cancela o fetch para os outros.
+    """
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(key)
+
+    if task is not None and not task.done() and task.get_loop() is loop:
+        _count("followers")
+    else:
+        _count("leaders")
+        task = loop.create_task(fn())
+        _inflight[key] = task
+
+        def _release(finished: asyncio.Task, key: str = key) -> None:
+            if _inflight.get(key) is finished:
+                del _inflight[key]
+
+        task.add_done_callback(_release)
+
+    return await asyncio.shield(task)
+
+
+class _SyncCall:
+    """Chamada em andamento compartilhada entre threads"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def run_once_sync(key: str, fn: Callable[[], T]) -> T:
+    """
+    Versão bloqueante de run_once para código executado em threads.
+    Threads que chegam durante a execução esperam o resultado do leader.
+    """
+    with _sync_lock:
+        call = _inflight_sync.get(key)
+        is_leader = call is None
+        if is_leader:
+            call = _SyncCall()
+            _inflight_sync[key] = call
+
+    if not is_leader:
+        _count("followers")
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    _count("leaders")
+    try:
+        call.result = fn()
+        return call.result
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _sync_lock:
+            del _inflight_sync[key]
+        call.done.set()
+
+
+def get_singleflight_stats() -> dict:
+    """Retorna contadores de leaders/followers e chamadas em andamento"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["in_flight"] = len(_inflight) + len(_inflight_sync)
+    return stats
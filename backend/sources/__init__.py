@@ -3,21 +3,43 @@ Data sources for NFL Stats API
 """
 
 from .nflverse import (
-    get_defensive_stats as get_defensive_stats_nflverse,
-    get_offensive_stats as get_offensive_stats_nflverse,
-    get_available_seasons as get_available_seasons_nflverse,
+    get_defensive_stats_async as get_defensive_stats_nflverse,
+    get_offensive_stats_async as get_offensive_stats_nflverse,
+    get_available_seasons_async as get_available_seasons_nflverse,
+    get_stats_version as get_nflverse_stats_version,
+    get_stale_stats_async as get_stale_stats_nflverse,
+    refresh_async as refresh_nflverse_entry,
+    close_client as close_nflverse_client,
 )
 from .tank01 import (
     get_defensive_stats as get_defensive_stats_tank01,
     get_offensive_stats as get_offensive_stats_tank01,
     is_configured as is_tank01_configured,
+    refresh_all_players as refresh_tank01_players,
+    close_client as close_tank01_client,
+)
+from .sleeper import (
+    get_league as get_sleeper_league,
+    get_leagues as get_sleeper_leagues,
+    close_client as close_sleeper_client,
+    SleeperUnavailableError,
 )
 
 __all__ = [
     "get_defensive_stats_nflverse",
     "get_offensive_stats_nflverse",
     "get_available_seasons_nflverse",
+    "get_nflverse_stats_version",
+    "get_stale_stats_nflverse",
+    "refresh_nflverse_entry",
+    "close_nflverse_client",
     "get_defensive_stats_tank01",
     "get_offensive_stats_tank01",
     "is_tank01_configured",
+    "refresh_tank01_players",
+    "close_tank01_client",
+    "get_sleeper_league",
+    "get_sleeper_leagues",
+    "close_sleeper_client",
+    "SleeperUnavailableError",
 ]
@@ -4,19 +4,43 @@ Fonte: https://github.com/nflverse/nflverse-data
 Licença: CC-BY-SA 4.0 (uso comercial permitido com atribuição)
 """
 
+import asyncio
+import hashlib
+import io
+import os
+import threading
+import httpx
+import numpy as np
 import pandas as pd
-from typing import Optional
+import pyarrow.parquet as pq
+from datetime import date
+from typing import Any, Awaitable, Callable, Optional
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from cache import read_cache, write_cache
+from config import REQUEST_TIMEOUT
+from cache import (
+    read_cache,
+    write_cache,
+    read_cache_frame,
+    write_cache_frame,
+    get_cache_version,
+    get_cache_path,
+    get_conditional_headers,
+    is_not_modified,
+    store_cache_validators,
+    content_hash,
+)
+from singleflight import run_once, run_once_sync
+from executor import run_blocking, run_cpu_bound
 
 # URLs do nflverse-data releases
 NFLVERSE_PLAYER_STATS_URL = "https://github.com/nflverse/nflverse-data/releases/download/player_stats/player_stats_{season}.parquet"
 NFLVERSE_PLAYER_STATS_DEF_URL = "https://github.com/nflverse/nflverse-data/releases/download/player_stats/player_stats_def_{season}.parquet"
 NFLVERSE_ROSTERS_URL = "https://github.com/nflverse/nflverse-data/releases/download/weekly_rosters/roster_weekly_{season}.parquet"
+NFLVERSE_PLAYER_STATS_DEF_ALL_URL = "https://github.com/nflverse/nflverse-data/releases/download/player_stats/player_stats_def.parquet"
 
 # Mapeamento de posições para Fantasy
 POSITION_MAP = {
@@ -44,58 +68,226 @@ DEFENSIVE_POSITIONS = list(POSITION_MAP.keys())
 OFFENSIVE_POSITIONS = ["QB", "RB", "WR", "TE", "FB"]
 
 
+def _read_parquet(source: Any, columns: list[str]) -> pd.DataFrame:
+    """
+    Lê apenas as colunas declaradas do dataset (as que existirem no arquivo)
+    source: URL, caminho ou arquivo em memória (BytesIO)
+    """
+    if isinstance(source, str) and source.startswith("http"):
+        response = httpx.get(source, timeout=REQUEST_TIMEOUT, follow_redirects=True)
+        response.raise_for_status()
+        source = io.BytesIO(response.content)
+
+    parquet_file = pq.ParquetFile(source)
+    available = set(parquet_file.schema_arrow.names)
+    table = parquet_file.read(columns=[c for c in columns if c in available], use_pandas_metadata=True)
+    return table.to_pandas()
+
+
+def _fetch_parquet(
+    key: str,
+    season: int,
+    url: str,
+    columns: list[str],
+    store: Callable[[int, pd.DataFrame], pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    GET condicional do Parquet da entrada key/season. Se o upstream não mudou
+    (304 ou mesmo conteúdo), só renova o TTL e reusa o cache, sem parse.
+    """
+    response = httpx.get(
+        url, headers=get_conditional_headers(key, season), timeout=REQUEST_TIMEOUT, follow_redirects=True
+    )
+    if is_not_modified(key, season, response):
+        return _revalidated_frame(key, season)
+    response.raise_for_status()
+    return _parse_and_store(key, store, season, response, columns)
+
+
+def _parse_and_store(
+    key: str,
+    store: Callable[[int, pd.DataFrame], pd.DataFrame],
+    season: int,
+    response: httpx.Response,
+    columns: list[str],
+) -> pd.DataFrame:
+    """Aplica store (parse + cache) ao corpo da resposta e guarda os validadores"""
+    df = store(season, _read_parquet(io.BytesIO(response.content), columns))
+    store_cache_validators(key, season, response.headers, content_hash(response.content))
+    return df
+
+
+def _revalidated_frame(key: str, season: int) -> pd.DataFrame:
+    cached = read_cache_frame(key, season)
+    return cached if cached is not None else pd.DataFrame()
+
+
+def _cached_or_fetch(key: str, season: int, fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Retorna o DataFrame do cache ou executa fetch() uma única vez por key/season,
+    mesmo com várias threads pedindo a mesma temporada ao mesmo tempo.
+    """
+    cached = read_cache_frame(key, season)
+    if cached is not None:
+        return cached
+
+    def load() -> pd.DataFrame:
+        # Outro leader pode ter acabado de preencher o cache
+        cached = read_cache_frame(key, season)
+        if cached is not None:
+            return cached
+        return fetch()
+
+    return run_once_sync(f"{key}_{season}", load)
+
+
 def fetch_player_stats(season: int) -> pd.DataFrame:
     """
     Busca stats OFENSIVAS de jogadores do nflverse
     """
-    cached = read_cache("nflverse_player_stats", season)
-    if cached is not None:
-        return pd.DataFrame(cached)
+    return _cached_or_fetch("nflverse_player_stats", season, lambda: _download_player_stats(season))
+
 
+def _download_player_stats(season: int) -> pd.DataFrame:
     url = NFLVERSE_PLAYER_STATS_URL.format(season=season)
 
     try:
-        df = pd.read_parquet(url)
-        write_cache("nflverse_player_stats", season, df.to_dict(orient="records"))
-        return df
+        return _fetch_parquet("nflverse_player_stats", season, url, PLAYER_STATS_COLUMNS, _store_player_stats)
     except Exception as e:
         print(f"[nflverse] Erro ao buscar player_stats de {season}: {e}")
         return pd.DataFrame()
 
 
+def _store_player_stats(season: int, df: pd.DataFrame) -> pd.DataFrame:
+    write_cache_frame("nflverse_player_stats", season, df)
+    return df
+
+
 def fetch_player_stats_def(season: int) -> pd.DataFrame:
     """
     Busca stats DEFENSIVAS de jogadores do nflverse
     Tenta arquivo por temporada, senão usa arquivo consolidado
     """
-    cached = read_cache("nflverse_player_stats_def", season)
-    if cached is not None:
-        return pd.DataFrame(cached)
+    return _cached_or_fetch("nflverse_player_stats_def", season, lambda: _download_player_stats_def(season))
+
 
+def _download_player_stats_def(season: int) -> pd.DataFrame:
     # Tenta arquivo específico da temporada primeiro
     url = NFLVERSE_PLAYER_STATS_DEF_URL.format(season=season)
 
     try:
-        df = pd.read_parquet(url)
-        write_cache("nflverse_player_stats_def", season, df.to_dict(orient="records"))
-        return df
+        return _fetch_parquet("nflverse_player_stats_def", season, url, PLAYER_STATS_DEF_COLUMNS, _store_player_stats_def)
     except Exception as e:
         print(f"[nflverse] Arquivo {season} não encontrado, tentando arquivo consolidado...")
 
     # Fallback: arquivo consolidado com todas as temporadas
+    return _load_consolidated_def(season)
+
+
+def _store_player_stats_def(season: int, df: pd.DataFrame) -> pd.DataFrame:
+    write_cache_frame("nflverse_player_stats_def", season, df)
+    return df
+
+
+def _load_consolidated_def(season: int) -> pd.DataFrame:
+    """Lê só a temporada desejada do arquivo consolidado e cacheia"""
     try:
-        consolidated_url = "https://github.com/nflverse/nflverse-data/releases/download/player_stats/player_stats_def.parquet"
-        df = pd.read_parquet(consolidated_url)
-        # Filtra pela temporada desejada
-        df = df[df["season"] == season]
+        df = read_consolidated_def(season, PLAYER_STATS_DEF_COLUMNS)
         if not df.empty:
-            write_cache("nflverse_player_stats_def", season, df.to_dict(orient="records"))
+            write_cache_frame("nflverse_player_stats_def", season, df)
         return df
     except Exception as e2:
         print(f"[nflverse] Erro ao buscar player_stats_def: {e2}")
         return pd.DataFrame()
 
 
+# ============================================
+# Arquivo consolidado (todas as temporadas)
+# ============================================
+# player_stats_def.parquet tem todas as temporadas. É baixado uma única vez
+# por TTL para o diretório de cache (depois revalidado com GET condicional),
+# sem ser carregado em memória; leituras
+# usam filtros do pyarrow (row groups descartados pelas estatísticas) e a
+# listagem de temporadas vem só dos metadados do arquivo.
+
+CONSOLIDATED_DEF_KEY = "nflverse_player_stats_def_all"
+
+
+def _consolidated_def_path() -> Path:
+    """Caminho local do arquivo consolidado, baixando se ausente/expirado"""
+    path = get_cache_path(CONSOLIDATED_DEF_KEY, 0, "parquet")
+    if get_cache_version(CONSOLIDATED_DEF_KEY, 0) is not None:
+        return path
+
+    def load() -> Path:
+        # Outro leader pode ter acabado de baixar
+        if get_cache_version(CONSOLIDATED_DEF_KEY, 0) is None:
+            _download_file(NFLVERSE_PLAYER_STATS_DEF_ALL_URL, path, CONSOLIDATED_DEF_KEY, 0)
+        return path
+
+    return run_once_sync(f"{CONSOLIDATED_DEF_KEY}_0", load)
+
+
+def _download_file(url: str, path: Path, key: str, season: int) -> None:
+    """
+    Baixa url para path (entrada key/season) em streaming, com arquivo temporário
+    + rename atômico. Com cópia local, o GET é condicional: 304 (ou 200 com o
+    mesmo conteúdo) só renova o TTL.
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    headers = get_conditional_headers(key, season)
+    try:
+        with httpx.stream("GET", url, headers=headers, timeout=REQUEST_TIMEOUT, follow_redirects=True) as response:
+            # Em streaming o corpo ainda não foi lido: aqui só o 304 é decidido
+            if response.status_code == 304 and is_not_modified(key, season, response):
+                return
+            response.raise_for_status()
+            digest = hashlib.sha256()
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_bytes():
+                    f.write(chunk)
+                    digest.update(chunk)
+        # Upstream sem ETag/Last-Modified: compara o hash dos bytes baixados
+        if is_not_modified(key, season, response, digest.hexdigest()):
+            return
+        os.replace(tmp_path, path)
+        store_cache_validators(key, season, response.headers, digest.hexdigest())
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def read_consolidated_def(season: int, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """Linhas de uma temporada do consolidado (só os row groups que podem contê-la)"""
+    path = _consolidated_def_path()
+    if columns is not None:
+        available = set(pq.read_schema(path).names)
+        columns = [c for c in columns if c in available]
+    table = pq.read_table(path, columns=columns, filters=[("season", "==", season)])
+    return table.to_pandas()
+
+
+def get_consolidated_seasons() -> list[int]:
+    """
+    Temporadas do consolidado (desc) a partir das estatísticas min/max dos
+    row groups; só lê a coluna season se algum row group misturar temporadas
+    """
+    parquet_file = pq.ParquetFile(_consolidated_def_path())
+    metadata = parquet_file.metadata
+    names = [metadata.schema.column(i).name for i in range(metadata.num_columns)]
+    column = names.index("season")
+
+    seasons = set()
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(column).statistics
+        if stats is None or not stats.has_min_max or stats.min != stats.max:
+            seasons = set(parquet_file.read(columns=["season"]).column("season").unique().to_pylist())
+            break
+        seasons.add(stats.min)
+
+    return sorted((int(s) for s in seasons if s is not None), reverse=True)
+
+
 def get_available_seasons() -> list[int]:
     """
     Retorna lista de temporadas disponíveis no nflverse
@@ -104,11 +296,12 @@ def get_available_seasons() -> list[int]:
     if cached is not None:
         return cached
 
+    return run_once_sync("nflverse_available_seasons_0", _download_available_seasons)
+
+
+def _download_available_seasons() -> list[int]:
     try:
-        url = "https://github.com/nflverse/nflverse-data/releases/download/player_stats/player_stats_def.parquet"
-        df = pd.read_parquet(url)
-        seasons = sorted(df["season"].unique(), reverse=True)
-        seasons_list = [int(s) for s in seasons]
+        seasons_list = get_consolidated_seasons()
         write_cache("nflverse_available_seasons", 0, seasons_list)
         return seasons_list
     except Exception as e:
@@ -120,74 +313,291 @@ def fetch_rosters(season: int) -> pd.DataFrame:
     """
     Busca rosters com info de jogadores (idade, time, etc)
     """
-    cached = read_cache("nflverse_rosters", season)
-    if cached is not None:
-        return pd.DataFrame(cached)
+    return _cached_or_fetch("nflverse_rosters", season, lambda: _download_rosters(season))
+
 
+def _download_rosters(season: int) -> pd.DataFrame:
     url = NFLVERSE_ROSTERS_URL.format(season=season)
 
     try:
-        df = pd.read_parquet(url)
-        # Pega apenas a última semana para ter dados mais recentes
-        if "week" in df.columns:
-            max_week = df["week"].max()
-            df = df[df["week"] == max_week]
-
-        # Converte colunas de data para string antes de cachear (JSON não suporta date objects)
-        for col in df.columns:
-            if df[col].dtype == 'datetime64[ns]' or df[col].dtype == 'object':
-                try:
-                    # Tenta converter para string se for date/datetime
-                    if hasattr(df[col].iloc[0] if len(df) > 0 else None, 'strftime'):
-                        df[col] = df[col].apply(lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) and hasattr(x, 'strftime') else x)
-                except Exception:
-                    pass
-
-        write_cache("nflverse_rosters", season, df.to_dict(orient="records"))
-        return df
+        return _fetch_parquet("nflverse_rosters", season, url, ROSTER_COLUMNS, _store_rosters)
     except Exception as e:
         print(f"[nflverse] Erro ao buscar rosters de {season}: {e}")
         return pd.DataFrame()
 
 
-def safe_int(value, default=0) -> int:
-    """Converte valor para int de forma segura"""
-    if pd.isna(value):
-        return default
-    try:
-        return int(value)
-    except (ValueError, TypeError):
-        return default
+def _store_rosters(season: int, df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza o roster semanal baixado e cacheia"""
+    # Pega apenas a última semana para ter dados mais recentes
+    if "week" in df.columns:
+        df = df[df["week"].to_numpy() == df["week"].max()]
 
+    df = _normalize_dates(df)
+    write_cache_frame("nflverse_rosters", season, df)
+    return df
 
-def safe_float(value, default=0.0) -> float:
-    """Converte valor para float de forma segura, lidando com NaN e Infinity"""
-    if pd.isna(value):
-        return default
-    try:
-        f = float(value)
-        # Verifica se é NaN ou Infinity (inválido para JSON)
-        if pd.isna(f) or f == float('inf') or f == float('-inf'):
-            return default
-        return f
-    except (ValueError, TypeError):
-        return default
-
-
-def calculate_age(birth_date) -> Optional[int]:
-    """Calcula idade a partir da data de nascimento"""
-    if pd.isna(birth_date):
-        return None
-    try:
-        from datetime import datetime
-        if isinstance(birth_date, str):
-            bd = datetime.strptime(birth_date, "%Y-%m-%d")
-        else:
-            bd = birth_date
-        today = datetime.now()
-        return today.year - bd.year - ((today.month, today.day) < (bd.month, bd.day))
-    except Exception:
+
+def _normalize_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Colunas de data -> string YYYY-MM-DD (formato uniforme entre parquet/arrow/json)"""
+    converted = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            converted[col] = values.dt.strftime("%Y-%m-%d")
+        elif values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) in ("date", "datetime"):
+            converted[col] = pd.to_datetime(values).dt.strftime("%Y-%m-%d")
+    return df.assign(**converted) if converted else df
+
+
+# ============================================
+# Roster: dimensão por gsis_id
+# ============================================
+# Uma linha por jogador com as colunas de ROSTER_INFO_COLUMNS + idade.
+# A idade é calculada de forma vetorizada contra uma data de referência
+# (o dia atual), que faz parte da versão: a dimensão e os payloads que a
+# usam são refeitos quando o roster muda ou quando o dia vira.
+
+# season -> ((versão do roster, data de referência), dimensão)
+_roster_dimensions: dict[int, tuple[tuple, pd.DataFrame]] = {}
+
+
+def get_age_reference_date() -> date:
+    """Data contra a qual as idades são calculadas"""
+    return date.today()
+
+
+def calculate_ages(birth_dates: pd.Series, reference: date) -> pd.Series:
+    """Idade (Int64, <NA> se ausente/inválida) de cada data de nascimento em reference"""
+    if pd.api.types.is_datetime64_any_dtype(birth_dates):
+        born = birth_dates
+    else:
+        born = pd.to_datetime(birth_dates, format="%Y-%m-%d", errors="coerce")
+    month, day = born.dt.month, born.dt.day
+    before_birthday = (month > reference.month) | ((month == reference.month) & (day > reference.day))
+    return (reference.year - born.dt.year - before_birthday.astype(int)).astype("Int64")
+
+
+def build_roster_dimension(rosters_df: pd.DataFrame, reference: date) -> pd.DataFrame:
+    """Tabela compacta gsis_id -> info do roster + age (primeira ocorrência vence)"""
+    if rosters_df.empty or "gsis_id" not in rosters_df.columns:
+        return pd.DataFrame(columns=["gsis_id"])
+    columns = [c for c in ROSTER_INFO_COLUMNS if c in rosters_df.columns]
+    dimension = rosters_df[columns].drop_duplicates("gsis_id").reset_index(drop=True)
+    if "birth_date" in dimension.columns:
+        dimension["age"] = calculate_ages(dimension["birth_date"], reference)
+    return dimension
+
+
+def get_roster_dimension(season: int, rosters_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Dimensão do roster da temporada, memoizada por (versão do roster, data de referência)
+    rosters_df: roster já carregado (senão usa fetch_rosters)
+    """
+    reference = get_age_reference_date()
+    entry = _roster_dimensions.get(season)
+    version = (get_cache_version("nflverse_rosters", season), reference)
+    if version[0] is not None and entry is not None and entry[0] == version:
+        return entry[1]
+
+    if rosters_df is None:
+        rosters_df = fetch_rosters(season)
+    dimension = build_roster_dimension(rosters_df, reference)
+
+    # A versão é lida de novo: fetch_rosters pode ter acabado de baixar/cachear
+    version = (get_cache_version("nflverse_rosters", season), reference)
+    if version[0] is not None:
+        _roster_dimensions[season] = (version, dimension)
+    return dimension
+
+
+# Todas as colunas defensivas disponíveis no nflverse
+DEFENSIVE_STAT_COLUMNS = [
+    "def_tackles", "def_tackles_solo", "def_tackles_with_assist",
+    "def_tackle_assists", "def_tackles_for_loss", "def_tackles_for_loss_yards",
+    "def_fumbles_forced", "def_sacks", "def_sack_yards",
+    "def_qb_hits", "def_interceptions", "def_interception_yards",
+    "def_pass_defended", "def_tds", "def_fumbles",
+    "def_fumble_recovery_own", "def_fumble_recovery_yards_own",
+    "def_fumble_recovery_opp", "def_fumble_recovery_yards_opp",
+    "def_safety", "def_penalty", "def_penalty_yards"
+]
+
+# Todas as colunas ofensivas disponíveis no nflverse
+OFFENSIVE_STAT_COLUMNS = [
+    # Passing
+    "completions", "attempts", "passing_yards", "passing_tds",
+    "interceptions", "sacks", "sack_yards", "sack_fumbles",
+    "sack_fumbles_lost", "passing_air_yards", "passing_yards_after_catch",
+    "passing_first_downs", "passing_epa", "passing_2pt_conversions",
+    "pacr", "dakota",
+    # Rushing
+    "carries", "rushing_yards", "rushing_tds", "rushing_fumbles",
+    "rushing_fumbles_lost", "rushing_first_downs", "rushing_epa",
+    "rushing_2pt_conversions",
+    # Receiving
+    "receptions", "targets", "receiving_yards", "receiving_tds",
+    "receiving_air_yards", "receiving_yards_after_catch",
+    "receiving_fumbles", "receiving_fumbles_lost",
+    "receiving_first_downs", "receiving_epa", "receiving_2pt_conversions",
+    "racr", "target_share", "air_yards_share", "wopr",
+    # Fantasy
+    "fantasy_points", "fantasy_points_ppr"
+]
+
+# Colunas do roster usadas para enriquecer os jogadores
+ROSTER_INFO_COLUMNS = ["gsis_id", "headshot_url", "birth_date", "years_exp", "jersey_number", "team"]
+
+# Colunas lidas (e cacheadas) de cada dataset: só o que as transformações usam
+PLAYER_ID_COLUMNS = ["player_id", "player_display_name", "player_name", "position", "recent_team", "season", "week"]
+PLAYER_STATS_COLUMNS = PLAYER_ID_COLUMNS + OFFENSIVE_STAT_COLUMNS
+PLAYER_STATS_DEF_COLUMNS = PLAYER_ID_COLUMNS + DEFENSIVE_STAT_COLUMNS
+ROSTER_COLUMNS = ROSTER_INFO_COLUMNS + ["week"]  # week: filtro da última semana
+
+
+# ============================================
+# Transformação vetorizada DataFrame -> payload
+# ============================================
+# Cada helper devolve uma coluna inteira já sanitizada (NaN/inf -> default),
+# equivalente a aplicar safe_int/safe_float linha a linha.
+
+def _float_values(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Coluna como float64, com NaN/inf -> 0.0 (ausente = zeros)"""
+    if col not in df.columns:
+        return np.zeros(len(df))
+    values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return np.where(np.isfinite(values), values, 0.0)
+
+
+def _int_values(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Coluna como int64 truncado (como int()), com NaN/inf -> 0"""
+    return np.trunc(_float_values(df, col)).astype(np.int64)
+
+
+def _optional_int_list(df: pd.DataFrame, col: str) -> list[Optional[int]]:
+    """Coluna como lista de int, com None onde o valor está ausente"""
+    if col not in df.columns:
+        return [None] * len(df)
+    values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    present = np.isfinite(values)
+    ints = np.trunc(np.where(present, values, 0.0)).astype(np.int64).tolist()
+    return [v if ok else None for v, ok in zip(ints, present.tolist())]
+
+
+def _text_values(df: pd.DataFrame, *cols: str, default: str = "") -> np.ndarray:
+    """Primeira coluna com texto não vazio entre cols (como `a or b`), senão default"""
+    result = np.full(len(df), default, dtype=object)
+    filled = np.zeros(len(df), dtype=bool)
+    for col in cols:
+        if col not in df.columns:
+            continue
+        values = df[col].to_numpy(dtype=object)
+        valid = pd.notna(values) & (values != "") & ~filled
+        result[valid] = values[valid]
+        filled |= valid
+    return result
+
+
+def _passer_rating(completions: np.ndarray, attempts: np.ndarray, yards: np.ndarray,
+                   tds: np.ndarray, ints: np.ndarray) -> np.ndarray:
+    """Passer rating NFL (sem arredondar); 0.0 para quem não tem tentativas"""
+    att = np.where(attempts > 0, attempts, 1).astype(float)
+    a = np.clip(((completions / att) - 0.3) * 5, 0, 2.375)
+    b = np.clip(((yards / att) - 3) * 0.25, 0, 2.375)
+    c = np.clip((tds / att) * 20, 0, 2.375)
+    d = np.clip(2.375 - ((ints / att) * 25), 0, 2.375)
+    return np.where(attempts > 0, ((a + b + c + d) / 6) * 100, 0.0)
+
+
+def _build_records(base: dict[str, Any], stats: dict[str, Any], order: np.ndarray) -> list[dict]:
+    """
+    Monta os registros do frontend em uma única passada.
+    base/stats: nome do campo -> coluna (array ou lista, mesma ordem de linhas)
+    order: índices das linhas a emitir, já filtradas e ordenadas
+    """
+    base_keys = list(base)
+    stat_keys = list(stats)
+    base_cols = [np.asarray(col, dtype=object)[order].tolist() for col in base.values()]
+    stat_cols = [np.asarray(col)[order].tolist() for col in stats.values()]
+
+    return [
+        {**dict(zip(base_keys, base_row)), "stats": dict(zip(stat_keys, stat_row))}
+        for base_row, stat_row in zip(zip(*base_cols), zip(*stat_cols))
+    ]
+
+
+def _sorted_desc(key: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Índices das linhas em mask ordenados por key desc (estável, como list.sort)"""
+    rows = np.flatnonzero(mask)
+    return rows[np.argsort(-key[rows], kind="stable")]
+
+
+def _group_by_player(df: pd.DataFrame, stat_cols: list[str]) -> pd.DataFrame:
+    """Soma as stats semanais e pega o primeiro nome/posição/time de cada jogador"""
+    by_player = df.groupby("player_id")
+    grouped = by_player[stat_cols].sum()
+    info_cols = [c for c in ["player_display_name", "player_name", "position", "recent_team"] if c in df.columns]
+    if info_cols:
+        grouped = grouped.join(by_player[info_cols].first())
+    return grouped.reset_index()
+
+
+def _merge_roster(grouped: pd.DataFrame, roster_dimension: pd.DataFrame) -> pd.DataFrame:
+    """Enriquece jogadores agregados com a dimensão do roster (foto, idade, número)"""
+    if roster_dimension.empty:
+        return grouped
+    return grouped.merge(roster_dimension, left_on="player_id", right_on="gsis_id", how="left")
+
+
+# Resultado das transformações por (tipo, temporada), válido enquanto as
+# entradas de cache de origem (stats + roster) não forem reescritas
+_transformed: dict[tuple[str, int], tuple[tuple, list[dict]]] = {}
+
+
+def get_stats_version(kind: str, season: int, include_stale: bool = False) -> Optional[tuple]:
+    """
+    Versão dos dados de origem de get_offensive_stats/get_defensive_stats
+    (kind: "offense" | "defense"); None se as stats não estiverem em cache
+    (ou estiverem expiradas, a não ser que include_stale=True).
+    """
+    stats_version = get_cache_version(_stats_key(kind), season, include_stale)
+    if stats_version is None:
         return None
+    # Idades dependem da data de referência da dimensão do roster
+    return (
+        stats_version,
+        get_cache_version("nflverse_rosters", season, include_stale),
+        get_age_reference_date().isoformat(),
+    )
+
+
+def _stats_key(kind: str) -> str:
+    return "nflverse_player_stats" if kind == "offense" else "nflverse_player_stats_def"
+
+
+def _memoized(kind: str, season: int, transform: Callable[[int], list[dict]]) -> list[dict]:
+    """Reaproveita a transformação enquanto a versão das entradas de origem não mudar"""
+    players = _memo_get(kind, season)
+    if players is not None:
+        return players
+
+    players = transform(season)
+    _memo_put(kind, season, players)
+    return players
+
+
+def _memo_get(kind: str, season: int, include_stale: bool = False) -> Optional[list[dict]]:
+    version = get_stats_version(kind, season, include_stale)
+    entry = _transformed.get((kind, season))
+    if version is not None and entry is not None and entry[0] == version:
+        return entry[1]
+    return None
+
+
+def _memo_put(kind: str, season: int, players: list[dict], include_stale: bool = False) -> None:
+    # A versão é lida de novo: o transform pode ter acabado de baixar/cachear
+    version = get_stats_version(kind, season, include_stale)
+    if version is not None:
+        _transformed[(kind, season)] = (version, players)
 
 
 def get_defensive_stats(season: int = 2024) -> list[dict]:
@@ -195,26 +605,20 @@ def get_defensive_stats(season: int = 2024) -> list[dict]:
     Retorna stats defensivas agregadas por jogador
     Stats exibidas na UI: TKL, SCK, TFL, PRES (qb_hits), PD, INT, FF
     """
-    stats_df = fetch_player_stats_def(season)
-    rosters_df = fetch_rosters(season)
+    return _memoized("defense", season, _transform_defensive_stats)
+
+
+def _transform_defensive_stats(season: int) -> list[dict]:
+    return _defensive_records(fetch_player_stats_def(season), get_roster_dimension(season))
 
+
+def _defensive_records(stats_df: pd.DataFrame, roster_dimension: pd.DataFrame) -> list[dict]:
+    """Payload defensivo a partir dos DataFrames (puro: roda no pool de processos)"""
     if stats_df.empty:
         return []
 
-    # Todas as colunas defensivas disponíveis no nflverse
-    def_columns = [
-        "def_tackles", "def_tackles_solo", "def_tackles_with_assist",
-        "def_tackle_assists", "def_tackles_for_loss", "def_tackles_for_loss_yards",
-        "def_fumbles_forced", "def_sacks", "def_sack_yards",
-        "def_qb_hits", "def_interceptions", "def_interception_yards",
-        "def_pass_defended", "def_tds", "def_fumbles",
-        "def_fumble_recovery_own", "def_fumble_recovery_yards_own",
-        "def_fumble_recovery_opp", "def_fumble_recovery_yards_opp",
-        "def_safety", "def_penalty", "def_penalty_yards"
-    ]
-
     # Verifica quais colunas existem
-    available_cols = [c for c in def_columns if c in stats_df.columns]
+    available_cols = [c for c in DEFENSIVE_STAT_COLUMNS if c in stats_df.columns]
 
     if not available_cols:
         print(f"[nflverse] Colunas disponíveis: {stats_df.columns.tolist()}")
@@ -222,81 +626,70 @@ def get_defensive_stats(season: int = 2024) -> list[dict]:
 
     # Filtra linhas com alguma stat defensiva
     has_def_stats = stats_df[available_cols].sum(axis=1) > 0
-    def_df = stats_df[has_def_stats].copy()
+    def_df = stats_df[has_def_stats]
 
     if def_df.empty:
         return []
 
     # Agrupa por jogador (temporada inteira)
-    agg_dict = {col: "sum" for col in available_cols}
-    for col in ["player_display_name", "player_name", "position", "recent_team"]:
-        if col in def_df.columns:
-            agg_dict[col] = "first"
-
-    grouped = def_df.groupby("player_id").agg(agg_dict).reset_index()
-
-    # Enriquece com dados do roster
-    if not rosters_df.empty and "gsis_id" in rosters_df.columns:
-        roster_info = rosters_df[["gsis_id", "headshot_url", "birth_date", "years_exp", "jersey_number", "team"]].drop_duplicates("gsis_id")
-        grouped = grouped.merge(roster_info, left_on="player_id", right_on="gsis_id", how="left")
-
-    # Converte para formato do frontend
-    result = []
-    for _, row in grouped.iterrows():
-        pos = str(row.get("position", "LB")).upper()
-        fantasy_pos = POSITION_MAP.get(pos, "LB")
-
-        # Só inclui se for posição defensiva
-        if pos not in DEFENSIVE_POSITIONS:
-            continue
-
-        # Calcula tackles totais
-        tackles = safe_int(row.get("def_tackles", 0))
-        if tackles == 0:
-            tackles = safe_int(row.get("def_tackles_solo", 0)) + safe_int(row.get("def_tackle_assists", 0))
-
-        player = {
-            "id": str(row.get("player_id", "")),
-            "name": row.get("player_display_name") or row.get("player_name", "Unknown"),
-            "team": row.get("recent_team") or row.get("team", ""),
-            "teamAbbr": row.get("recent_team") or row.get("team", ""),
-            "photoUrl": row.get("headshot_url", ""),
-            "espnPosition": pos,
-            "fantasyPosition": fantasy_pos,
-            "age": calculate_age(row.get("birth_date")) if pd.notna(row.get("birth_date")) else None,
-            "experience": safe_int(row.get("years_exp")) if pd.notna(row.get("years_exp")) else None,
-            "jerseyNumber": str(safe_int(row.get("jersey_number"))) if pd.notna(row.get("jersey_number")) else None,
-            "stats": {
-                # Stats principais (exibidas na UI)
-                "tackles": tackles,
-                "sacks": safe_float(row.get("def_sacks", 0)),
-                "tfl": safe_int(row.get("def_tackles_for_loss", 0)),
-                "qbHits": safe_int(row.get("def_qb_hits", 0)),  # PRES na UI
-                "passesDefended": safe_int(row.get("def_pass_defended", 0)),
-                "interceptions": safe_int(row.get("def_interceptions", 0)),
-                "forcedFumbles": safe_int(row.get("def_fumbles_forced", 0)),
-                # Stats adicionais (armazenadas mas não exibidas)
-                "soloTackles": safe_int(row.get("def_tackles_solo", 0)),
-                "assistTackles": safe_int(row.get("def_tackle_assists", 0)),
-                "tacklesWithAssist": safe_int(row.get("def_tackles_with_assist", 0)),
-                "tflYards": safe_int(row.get("def_tackles_for_loss_yards", 0)),
-                "sackYards": safe_float(row.get("def_sack_yards", 0)),
-                "intYards": safe_int(row.get("def_interception_yards", 0)),
-                "defensiveTds": safe_int(row.get("def_tds", 0)),
-                "fumbleRecoveryOwn": safe_int(row.get("def_fumble_recovery_own", 0)),
-                "fumbleRecoveryOpp": safe_int(row.get("def_fumble_recovery_opp", 0)),
-                "safeties": safe_int(row.get("def_safety", 0)),
-            }
-        }
-
-        # Só adiciona se tiver alguma stat relevante
-        if tackles > 0 or player["stats"]["sacks"] > 0 or player["stats"]["interceptions"] > 0:
-            result.append(player)
-
-    # Ordena por tackles (desc)
-    result.sort(key=lambda x: x["stats"]["tackles"], reverse=True)
+    grouped = _group_by_player(def_df, available_cols)
+    grouped = _merge_roster(grouped, roster_dimension)
 
-    return result
+    # Posição: só posições defensivas entram
+    if "position" in grouped.columns:
+        positions = grouped["position"].astype(str).str.upper().to_numpy(dtype=object)
+    else:
+        positions = np.full(len(grouped), "LB", dtype=object)
+    is_defensive = np.isin(positions, DEFENSIVE_POSITIONS)
+
+    # Tackles totais (fallback: solo + assistidos)
+    solo = _int_values(grouped, "def_tackles_solo")
+    assists = _int_values(grouped, "def_tackle_assists")
+    tackles = _int_values(grouped, "def_tackles")
+    tackles = np.where(tackles == 0, solo + assists, tackles)
+    sacks = _float_values(grouped, "def_sacks")
+    ints = _int_values(grouped, "def_interceptions")
+
+    # Só entra se tiver alguma stat relevante; ordena por tackles (desc)
+    relevant = is_defensive & ((tackles > 0) | (sacks > 0) | (ints > 0))
+    order = _sorted_desc(tackles, relevant)
+
+    team = _text_values(grouped, "recent_team", "team")
+    base = {
+        "id": grouped["player_id"].astype(str).tolist(),
+        "name": _text_values(grouped, "player_display_name", "player_name", default="Unknown"),
+        "team": team,
+        "teamAbbr": team,
+        "photoUrl": _text_values(grouped, "headshot_url"),
+        "espnPosition": positions,
+        "fantasyPosition": [POSITION_MAP.get(p, "LB") for p in positions.tolist()],
+        "age": _optional_int_list(grouped, "age"),
+        "experience": _optional_int_list(grouped, "years_exp"),
+        "jerseyNumber": [str(n) if n is not None else None for n in _optional_int_list(grouped, "jersey_number")],
+    }
+    stats = {
+        # Stats principais (exibidas na UI)
+        "tackles": tackles,
+        "sacks": sacks,
+        "tfl": _int_values(grouped, "def_tackles_for_loss"),
+        "qbHits": _int_values(grouped, "def_qb_hits"),  # PRES na UI
+        "passesDefended": _int_values(grouped, "def_pass_defended"),
+        "interceptions": ints,
+        "forcedFumbles": _int_values(grouped, "def_fumbles_forced"),
+        # Stats adicionais (armazenadas mas não exibidas)
+        "soloTackles": solo,
+        "assistTackles": assists,
+        "tacklesWithAssist": _int_values(grouped, "def_tackles_with_assist"),
+        "tflYards": _int_values(grouped, "def_tackles_for_loss_yards"),
+        "sackYards": _float_values(grouped, "def_sack_yards"),
+        "intYards": _int_values(grouped, "def_interception_yards"),
+        "defensiveTds": _int_values(grouped, "def_tds"),
+        "fumbleRecoveryOwn": _int_values(grouped, "def_fumble_recovery_own"),
+        "fumbleRecoveryOpp": _int_values(grouped, "def_fumble_recovery_opp"),
+        "safeties": _int_values(grouped, "def_safety"),
+    }
+
+    return _build_records(base, stats, order)
 
 
 def get_offensive_stats(season: int = 2024) -> list[dict]:
@@ -307,149 +700,310 @@ def get_offensive_stats(season: int = 2024) -> list[dict]:
     - RB: ATT, YDS, YAC, BRK_TKL, RUSH_TD, REC_YDS, REC_TD, RZ_TGT, RZ_TD, FUM
     - WR/TE: TGT, YDS, YAC, AIR_YDS, REC, REC_TD, RUSH_TD, RZ_TGT, RZ_TD, DROPS
     """
-    stats_df = fetch_player_stats(season)
-    rosters_df = fetch_rosters(season)
+    return _memoized("offense", season, _transform_offensive_stats)
+
 
+def _transform_offensive_stats(season: int) -> list[dict]:
+    return _offensive_records(fetch_player_stats(season), get_roster_dimension(season))
+
+
+def _offensive_records(stats_df: pd.DataFrame, roster_dimension: pd.DataFrame) -> list[dict]:
+    """Payload ofensivo a partir dos DataFrames (puro: roda no pool de processos)"""
     if stats_df.empty:
         return []
 
-    # Todas as colunas ofensivas disponíveis no nflverse
-    off_columns = [
-        # Passing
-        "completions", "attempts", "passing_yards", "passing_tds",
-        "interceptions", "sacks", "sack_yards", "sack_fumbles",
-        "sack_fumbles_lost", "passing_air_yards", "passing_yards_after_catch",
-        "passing_first_downs", "passing_epa", "passing_2pt_conversions",
-        "pacr", "dakota",
-        # Rushing
-        "carries", "rushing_yards", "rushing_tds", "rushing_fumbles",
-        "rushing_fumbles_lost", "rushing_first_downs", "rushing_epa",
-        "rushing_2pt_conversions",
-        # Receiving
-        "receptions", "targets", "receiving_yards", "receiving_tds",
-        "receiving_air_yards", "receiving_yards_after_catch",
-        "receiving_fumbles", "receiving_fumbles_lost",
-        "receiving_first_downs", "receiving_epa", "receiving_2pt_conversions",
-        "racr", "target_share", "air_yards_share", "wopr",
-        # Fantasy
-        "fantasy_points", "fantasy_points_ppr"
-    ]
-
-    available_cols = [c for c in off_columns if c in stats_df.columns]
+    available_cols = [c for c in OFFENSIVE_STAT_COLUMNS if c in stats_df.columns]
 
     if not available_cols:
         return []
 
     # Filtra apenas posições ofensivas
     if "position" in stats_df.columns:
-        off_df = stats_df[stats_df["position"].isin(OFFENSIVE_POSITIONS)].copy()
+        off_df = stats_df[stats_df["position"].isin(OFFENSIVE_POSITIONS)]
     else:
-        off_df = stats_df.copy()
+        off_df = stats_df
 
     if off_df.empty:
         return []
 
     # Agrupa por jogador
-    agg_dict = {col: "sum" for col in available_cols}
-    for col in ["player_display_name", "player_name", "position", "recent_team"]:
-        if col in off_df.columns:
-            agg_dict[col] = "first"
-
-    grouped = off_df.groupby("player_id").agg(agg_dict).reset_index()
-
-    # Enriquece com roster
-    if not rosters_df.empty and "gsis_id" in rosters_df.columns:
-        roster_info = rosters_df[["gsis_id", "headshot_url", "birth_date", "years_exp", "jersey_number", "team"]].drop_duplicates("gsis_id")
-        grouped = grouped.merge(roster_info, left_on="player_id", right_on="gsis_id", how="left")
-
-    result = []
-    for _, row in grouped.iterrows():
-        position = str(row.get("position", "")).upper()
-
-        # Calcula passer rating (aproximado)
-        attempts = safe_int(row.get("attempts", 0))
-        completions = safe_int(row.get("completions", 0))
-        passing_yards = safe_int(row.get("passing_yards", 0))
-        passing_tds = safe_int(row.get("passing_tds", 0))
-        ints = safe_int(row.get("interceptions", 0))
-
-        passer_rating = 0.0
-        if attempts > 0:
-            a = max(0, min(2.375, ((completions / attempts) - 0.3) * 5))
-            b = max(0, min(2.375, ((passing_yards / attempts) - 3) * 0.25))
-            c = max(0, min(2.375, (passing_tds / attempts) * 20))
-            d = max(0, min(2.375, 2.375 - ((ints / attempts) * 25)))
-            passer_rating = round(((a + b + c + d) / 6) * 100, 1)
-
-        # Total fumbles
-        total_fumbles = (
-            safe_int(row.get("rushing_fumbles", 0)) +
-            safe_int(row.get("receiving_fumbles", 0)) +
-            safe_int(row.get("sack_fumbles", 0))
+    grouped = _group_by_player(off_df, available_cols)
+    grouped = _merge_roster(grouped, roster_dimension)
+
+    if "position" in grouped.columns:
+        positions = grouped["position"].astype(str).str.upper().tolist()
+    else:
+        positions = [""] * len(grouped)
+
+    completions = _int_values(grouped, "completions")
+    attempts = _int_values(grouped, "attempts")
+    passing_yards = _int_values(grouped, "passing_yards")
+    passing_tds = _int_values(grouped, "passing_tds")
+    ints = _int_values(grouped, "interceptions")
+    rushing_yards = _int_values(grouped, "rushing_yards")
+    receiving_yards = _int_values(grouped, "receiving_yards")
+
+    # Passer rating (aproximado), arredondado como round(x, 1)
+    passer_rating = [
+        round(r, 1) for r in _passer_rating(completions, attempts, passing_yards, passing_tds, ints).tolist()
+    ]
+
+    # Total fumbles
+    total_fumbles = (
+        _int_values(grouped, "rushing_fumbles") +
+        _int_values(grouped, "receiving_fumbles") +
+        _int_values(grouped, "sack_fumbles")
+    )
+    fumbles_lost = _int_values(grouped, "rushing_fumbles_lost") + _int_values(grouped, "receiving_fumbles_lost")
+
+    # Só entra com stats significativas; ordena por fantasy points PPR (desc)
+    fantasy_points_ppr = _float_values(grouped, "fantasy_points_ppr")
+    total_yards = passing_yards + rushing_yards + receiving_yards
+    order = _sorted_desc(fantasy_points_ppr, total_yards > 0)
+
+    team = _text_values(grouped, "recent_team", "team")
+    base = {
+        "id": grouped["player_id"].astype(str).tolist(),
+        "name": _text_values(grouped, "player_display_name", "player_name", default="Unknown"),
+        "team": team,
+        "teamAbbr": team,
+        "photoUrl": _text_values(grouped, "headshot_url"),
+        "position": positions,
+        "age": _optional_int_list(grouped, "age"),
+        "experience": _optional_int_list(grouped, "years_exp"),
+        "jerseyNumber": [str(n) if n is not None else None for n in _optional_int_list(grouped, "jersey_number")],
+    }
+    stats = {
+        # Passing stats (QB)
+        "completions": completions,
+        "attempts": attempts,
+        "passingYards": passing_yards,
+        "passingTds": passing_tds,
+        "interceptions": ints,
+        "passerRating": passer_rating,
+        "passingAirYards": _int_values(grouped, "passing_air_yards"),
+        "passingYac": _int_values(grouped, "passing_yards_after_catch"),
+        "passingFirstDowns": _int_values(grouped, "passing_first_downs"),
+        "sacks": _int_values(grouped, "sacks"),
+        "sackYards": _int_values(grouped, "sack_yards"),
+
+        # Rushing stats (QB, RB)
+        "carries": _int_values(grouped, "carries"),
+        "rushingYards": rushing_yards,
+        "rushingTds": _int_values(grouped, "rushing_tds"),
+        "rushingFirstDowns": _int_values(grouped, "rushing_first_downs"),
+
+        # Receiving stats (RB, WR, TE)
+        "targets": _int_values(grouped, "targets"),
+        "receptions": _int_values(grouped, "receptions"),
+        "receivingYards": receiving_yards,
+        "receivingTds": _int_values(grouped, "receiving_tds"),
+        "receivingAirYards": _int_values(grouped, "receiving_air_yards"),
+        "receivingYac": _int_values(grouped, "receiving_yards_after_catch"),
+        "receivingFirstDowns": _int_values(grouped, "receiving_first_downs"),
+
+        # Fumbles
+        "fumbles": total_fumbles,
+        "fumblesLost": fumbles_lost,
+
+        # Advanced stats
+        "targetShare": _float_values(grouped, "target_share"),
+        "airYardsShare": _float_values(grouped, "air_yards_share"),
+        "wopr": _float_values(grouped, "wopr"),
+        "racr": _float_values(grouped, "racr"),
+        "pacr": _float_values(grouped, "pacr"),
+
+        # Fantasy
+        "fantasyPoints": _float_values(grouped, "fantasy_points"),
+        "fantasyPointsPpr": fantasy_points_ppr,
+    }
+
+    return _build_records(base, stats, order)
+
+
+# ============================================
+# API async (downloads via httpx, pandas fora do event loop)
+# ============================================
+# Downloads usam um AsyncClient compartilhado, então várias temporadas baixam
+# ao mesmo tempo sem ocupar threads; parse/cache de Parquet roda no pool de
+# threads e a transformação DataFrame -> payload no pool de processos.
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Retorna o AsyncClient compartilhado, criando-o sob demanda"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        # Releases do GitHub redirecionam para o storage de objetos
+        _client = httpx.AsyncClient(timeout=REQUEST_TIMEOUT, follow_redirects=True)
+        _client_loop = loop
+
+    return _client
+
+
+async def close_client() -> None:
+    """Fecha o AsyncClient compartilhado (chamado no shutdown da API)"""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+async def _download_parquet(
+    key: str,
+    url: str,
+    columns: list[str],
+    store: Callable[[int, pd.DataFrame], pd.DataFrame],
+    season: int,
+) -> pd.DataFrame:
+    """
+    Baixa o Parquet (GET condicional) sem bloquear e aplica store (parse + cache)
+    no pool de threads; se o upstream não mudou, só renova o TTL do cache
+    """
+    headers = await run_blocking(get_conditional_headers, key, season)
+    response = await get_client().get(url, headers=headers)
+    if await run_blocking(is_not_modified, key, season, response):
+        return await run_blocking(_revalidated_frame, key, season)
+    response.raise_for_status()
+    return await run_blocking(_parse_and_store, key, store, season, response, columns)
+
+
+async def _cached_or_fetch_async(key: str, season: int, fetch: Callable[[], Awaitable[pd.DataFrame]]) -> pd.DataFrame:
+    """Versão async de _cached_or_fetch (single-flight por key/season no event loop)"""
+    cached = await run_blocking(read_cache_frame, key, season)
+    if cached is not None:
+        return cached
+
+    async def load() -> pd.DataFrame:
+        cached = await run_blocking(read_cache_frame, key, season)
+        if cached is not None:
+            return cached
+        return await fetch()
+
+    return await run_once(f"{key}_{season}", load)
+
+
+async def _download_player_stats_async(season: int) -> pd.DataFrame:
+    try:
+        return await _download_parquet(
+            "nflverse_player_stats",
+            NFLVERSE_PLAYER_STATS_URL.format(season=season),
+            PLAYER_STATS_COLUMNS,
+            _store_player_stats,
+            season,
         )
+    except Exception as e:
+        print(f"[nflverse] Erro ao buscar player_stats de {season}: {e}")
+        return pd.DataFrame()
 
-        player = {
-            "id": str(row.get("player_id", "")),
-            "name": row.get("player_display_name") or row.get("player_name", "Unknown"),
-            "team": row.get("recent_team") or row.get("team", ""),
-            "teamAbbr": row.get("recent_team") or row.get("team", ""),
-            "photoUrl": row.get("headshot_url", ""),
-            "position": position,
-            "age": calculate_age(row.get("birth_date")) if pd.notna(row.get("birth_date")) else None,
-            "experience": safe_int(row.get("years_exp")) if pd.notna(row.get("years_exp")) else None,
-            "jerseyNumber": str(safe_int(row.get("jersey_number"))) if pd.notna(row.get("jersey_number")) else None,
-            "stats": {
-                # Passing stats (QB)
-                "completions": completions,
-                "attempts": attempts,
-                "passingYards": passing_yards,
-                "passingTds": passing_tds,
-                "interceptions": ints,
-                "passerRating": passer_rating,
-                "passingAirYards": safe_int(row.get("passing_air_yards", 0)),
-                "passingYac": safe_int(row.get("passing_yards_after_catch", 0)),
-                "passingFirstDowns": safe_int(row.get("passing_first_downs", 0)),
-                "sacks": safe_int(row.get("sacks", 0)),
-                "sackYards": safe_int(row.get("sack_yards", 0)),
-
-                # Rushing stats (QB, RB)
-                "carries": safe_int(row.get("carries", 0)),
-                "rushingYards": safe_int(row.get("rushing_yards", 0)),
-                "rushingTds": safe_int(row.get("rushing_tds", 0)),
-                "rushingFirstDowns": safe_int(row.get("rushing_first_downs", 0)),
-
-                # Receiving stats (RB, WR, TE)
-                "targets": safe_int(row.get("targets", 0)),
-                "receptions": safe_int(row.get("receptions", 0)),
-                "receivingYards": safe_int(row.get("receiving_yards", 0)),
-                "receivingTds": safe_int(row.get("receiving_tds", 0)),
-                "receivingAirYards": safe_int(row.get("receiving_air_yards", 0)),
-                "receivingYac": safe_int(row.get("receiving_yards_after_catch", 0)),
-                "receivingFirstDowns": safe_int(row.get("receiving_first_downs", 0)),
-
-                # Fumbles
-                "fumbles": total_fumbles,
-                "fumblesLost": safe_int(row.get("rushing_fumbles_lost", 0)) + safe_int(row.get("receiving_fumbles_lost", 0)),
-
-                # Advanced stats
-                "targetShare": safe_float(row.get("target_share", 0)),
-                "airYardsShare": safe_float(row.get("air_yards_share", 0)),
-                "wopr": safe_float(row.get("wopr", 0)),
-                "racr": safe_float(row.get("racr", 0)),
-                "pacr": safe_float(row.get("pacr", 0)),
-
-                # Fantasy
-                "fantasyPoints": safe_float(row.get("fantasy_points", 0)),
-                "fantasyPointsPpr": safe_float(row.get("fantasy_points_ppr", 0)),
-            }
-        }
-
-        # Só adiciona se tiver stats significativas
-        total_yards = player["stats"]["passingYards"] + player["stats"]["rushingYards"] + player["stats"]["receivingYards"]
-        if total_yards > 0:
-            result.append(player)
-
-    # Ordena por fantasy points PPR (desc)
-    result.sort(key=lambda x: x["stats"]["fantasyPointsPpr"], reverse=True)
 
-    return result
+async def _download_player_stats_def_async(season: int) -> pd.DataFrame:
+    try:
+        return await _download_parquet(
+            "nflverse_player_stats_def",
+            NFLVERSE_PLAYER_STATS_DEF_URL.format(season=season),
+            PLAYER_STATS_DEF_COLUMNS,
+            _store_player_stats_def,
+            season,
+        )
+    except Exception:
+        print(f"[nflverse] Arquivo {season} não encontrado, tentando arquivo consolidado...")
+
+    return await run_blocking(_load_consolidated_def, season)
+
+
+async def _download_rosters_async(season: int) -> pd.DataFrame:
+    try:
+        return await _download_parquet(
+            "nflverse_rosters", NFLVERSE_ROSTERS_URL.format(season=season), ROSTER_COLUMNS, _store_rosters, season
+        )
+    except Exception as e:
+        print(f"[nflverse] Erro ao buscar rosters de {season}: {e}")
+        return pd.DataFrame()
+
+
+async def _get_stats_async(
+    kind: str,
+    season: int,
+    stats_key: str,
+    download_stats: Callable[[int], Awaitable[pd.DataFrame]],
+    records: Callable[[pd.DataFrame, pd.DataFrame], list[dict]],
+) -> list[dict]:
+    """Stats + roster baixados em paralelo, transformação no pool de processos (memoizada)"""
+    players = await run_blocking(_memo_get, kind, season)
+    if players is not None:
+        return players
+
+    async def build() -> list[dict]:
+        stats_df, rosters_df = await asyncio.gather(
+            _cached_or_fetch_async(stats_key, season, lambda: download_stats(season)),
+            _cached_or_fetch_async("nflverse_rosters", season, lambda: _download_rosters_async(season)),
+        )
+        roster_dimension = await run_blocking(get_roster_dimension, season, rosters_df)
+        players = await run_cpu_bound(records, stats_df, roster_dimension)
+        await run_blocking(_memo_put, kind, season, players)
+        return players
+
+    return await run_once(f"nflverse_{kind}_{season}", build)
+
+
+async def get_offensive_stats_async(season: int = 2024) -> list[dict]:
+    """get_offensive_stats com downloads async e transformação no pool de processos"""
+    return await _get_stats_async(
+        "offense", season, "nflverse_player_stats", _download_player_stats_async, _offensive_records
+    )
+
+
+async def get_defensive_stats_async(season: int = 2024) -> list[dict]:
+    """get_defensive_stats com downloads async e transformação no pool de processos"""
+    return await _get_stats_async(
+        "defense", season, "nflverse_player_stats_def", _download_player_stats_def_async, _defensive_records
+    )
+
+
+async def refresh_async(key: str, season: int) -> None:
+    """
+    Re-baixa a entrada key/season mesmo ainda válida (usado pelo scheduler).
+    O GET é condicional: sem mudança upstream, só o TTL é renovado.
+    """
+    downloads = {
+        "nflverse_player_stats": _download_player_stats_async,
+        "nflverse_player_stats_def": _download_player_stats_def_async,
+        "nflverse_rosters": _download_rosters_async,
+    }
+    await run_once(f"{key}_{season}", lambda: downloads[key](season))
+
+
+async def get_stale_stats_async(kind: str, season: int) -> Optional[list[dict]]:
+    """
+    Payload de kind ("offense" | "defense") a partir do que estiver em cache,
+    mesmo expirado, sem baixar nada; None se as stats não estiverem em cache
+    """
+    players = await run_blocking(_memo_get, kind, season, True)
+    if players is not None:
+        return players
+
+    stats_df, rosters_df = await asyncio.gather(
+        run_blocking(read_cache_frame, _stats_key(kind), season, True),
+        run_blocking(read_cache_frame, "nflverse_rosters", season, True),
+    )
+    if stats_df is None:
+        return None
+
+    if rosters_df is None:
+        rosters_df = pd.DataFrame()
+    roster_dimension = await run_blocking(build_roster_dimension, rosters_df, get_age_reference_date())
+    records = _offensive_records if kind == "offense" else _defensive_records
+    players = await run_cpu_bound(records, stats_df, roster_dimension)
+    await run_blocking(_memo_put, kind, season, players, True)
+    return players
+
+
+async def get_available_seasons_async() -> list[int]:
+    """get_available_seasons executado no executor do nflverse"""
+    return await run_blocking(get_available_seasons)
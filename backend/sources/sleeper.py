@@ -0,0 +1,170 @@
+"""
+Sleeper API data source (configurações das ligas)
+API: https://docs.sleeper.com/
+
+Endpoints utilizados:
+- /league/{league_id} - Nome, scoring_settings e roster_positions da liga
+
+Um AsyncClient com keep-alive e timeout atende todas as ligas. Cada liga fica
+em cache por SLEEPER_LEAGUE_TTL (sleeper_league_*); expirada, vira um GET
+condicional. Requests concorrentes para a mesma liga compartilham o fetch, e
+get_leagues busca várias ligas em paralelo (limite SLEEPER_MAX_CONCURRENCY).
+
+Só 404/410 ou 200 com corpo null significam liga inexistente. Rate limit (429),
+timeout (408), 5xx e erros de rede servem a versão expirada do cache; sem
+cache, levantam SleeperUnavailableError (a API responde 503).
+"""
+
+import asyncio
+import httpx
+from typing import Optional
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import SLEEPER_BASE_URL, SLEEPER_MAX_CONCURRENCY, SLEEPER_TIMEOUT
+from cache import (
+    read_cache,
+    write_cache,
+    get_conditional_headers,
+    is_not_modified,
+    store_cache_validators,
+    content_hash,
+)
+from singleflight import run_once
+
+
+# Cliente HTTP compartilhado (pool de conexões), recriado se o event loop mudar
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Retorna o AsyncClient compartilhado, criando-o sob demanda"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=SLEEPER_BASE_URL,
+            timeout=SLEEPER_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=SLEEPER_MAX_CONCURRENCY,
+                max_keepalive_connections=SLEEPER_MAX_CONCURRENCY,
+            ),
+        )
+        _client_loop = loop
+
+    return _client
+
+
+async def close_client() -> None:
+    """Fecha o AsyncClient compartilhado (chamado no shutdown da API)"""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+# Respostas que significam "liga não existe" (as demais falhas são transitórias)
+NOT_FOUND_STATUSES = {404, 410}
+
+
+class SleeperUnavailableError(Exception):
+    """Sleeper não respondeu (rede, 408/429, 5xx) e a liga não está em cache"""
+
+
+def _cache_key(league_id: str) -> str:
+    return f"sleeper_league_{league_id}"
+
+
+def _is_league_id(league_id: str) -> bool:
+    """IDs do Sleeper são numéricos (vão na URL e no nome do arquivo de cache)"""
+    return league_id.isascii() and league_id.isdigit()
+
+
+async def _fetch_league(league_id: str) -> Optional[dict]:
+    """
+    Busca a liga no Sleeper (GET condicional se houver validators)
+    Em erro de rede/408/429/5xx, serve a versão expirada do cache se existir.
+    """
+    cache_key = _cache_key(league_id)
+    try:
+        response = await get_client().get(
+            f"/league/{league_id}",
+            headers=get_conditional_headers(cache_key, 0),
+        )
+        if is_not_modified(cache_key, 0, response):
+            cached = read_cache(cache_key, 0)
+            if cached:
+                return cached
+            response = await get_client().get(f"/league/{league_id}")
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+        if status in NOT_FOUND_STATUSES:
+            return None
+        print(f"[sleeper] Erro ao buscar liga {league_id}: {e}")
+        stale = read_cache(cache_key, 0, include_stale=True)
+        if stale:
+            return stale
+        raise SleeperUnavailableError(f"Sleeper unavailable for league {league_id}") from e
+
+    # Liga inexistente: o Sleeper responde 200 com corpo null
+    data = response.json()
+    if not isinstance(data, dict):
+        return None
+
+    write_cache(cache_key, 0, data)
+    store_cache_validators(cache_key, 0, response.headers, content_hash(response.content))
+    return data
+
+
+async def get_league(league_id: str) -> Optional[dict]:
+    """
+    Configurações da liga (cache de SLEEPER_LEAGUE_TTL)
+    Retorna None se a liga não existir; SleeperUnavailableError se o Sleeper
+    falhar e não houver cache.
+    """
+    if not _is_league_id(league_id):
+        return None
+    cache_key = _cache_key(league_id)
+    cached = read_cache(cache_key, 0)
+    if cached:
+        return cached
+
+    # Requests concorrentes para a mesma liga compartilham o fetch
+    return await run_once(cache_key, lambda: _fetch_league(league_id))
+
+
+async def get_leagues(league_ids: list[str]) -> tuple[dict[str, Optional[dict]], list[str]]:
+    """
+    Várias ligas de uma vez: cache primeiro, o resto em paralelo
+    Retorna (league_id -> configurações (None = não encontrada), na ordem pedida;
+    IDs que o Sleeper não respondeu e não estão em cache).
+    """
+    semaphore = asyncio.Semaphore(max(1, SLEEPER_MAX_CONCURRENCY))
+    league_ids = list(dict.fromkeys(league_ids))
+    unavailable: list[str] = []
+
+    async def fetch(league_id: str) -> Optional[dict]:
+        if not _is_league_id(league_id):
+            return None
+        cached = read_cache(_cache_key(league_id), 0)
+        if cached:
+            return cached
+        async with semaphore:
+            try:
+                return await get_league(league_id)
+            except SleeperUnavailableError:
+                unavailable.append(league_id)
+                return None
+
+    leagues = await asyncio.gather(*(fetch(league_id) for league_id in league_ids))
+    found = {
+        league_id: league for league_id, league in zip(league_ids, leagues)
+        if league_id not in unavailable
+    }
+    return found, [league_id for league_id in league_ids if league_id in unavailable]
@@ -4,8 +4,15 @@ API: https://rapidapi.com/tank01/api/nfl-live-in-game-real-time-statistics-nfl
 
 Endpoints utilizados:
 - /getNFLTeamRoster?teamAbv=XXX&getStats=true - Roster com stats
+
+Os 32 rosters são buscados em paralelo (limite TANK01_MAX_CONCURRENCY)
+usando um único AsyncClient com keep-alive. Um sweep com times falhando
+fica em cache só por TANK01_PARTIAL_TTL (tank01_partial_players), para não
+refazer as 32 chamadas a cada request enquanto um time continua falhando.
 """
 
+import asyncio
+import random
 import httpx
 from typing import Optional
 import sys
@@ -13,8 +20,19 @@ from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import RAPIDAPI_KEY, TANK01_BASE_URL, REQUEST_TIMEOUT
+from config import (
+    RAPIDAPI_KEY,
+    TANK01_BASE_URL,
+    REQUEST_TIMEOUT,
+    TANK01_MAX_CONCURRENCY,
+    TANK01_MAX_RETRIES,
+    TANK01_RETRY_BACKOFF,
+)
 from cache import read_cache, write_cache
+from singleflight import run_once
+
+ALL_PLAYERS_KEY = "tank01_all_players"
+PARTIAL_PLAYERS_KEY = "tank01_partial_players"
 
 # Todos os times NFL
 NFL_TEAMS = [
@@ -51,6 +69,47 @@ def get_headers() -> dict:
     }
 
 
+# Cliente HTTP compartilhado (pool de conexões), recriado se o event loop mudar
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Retorna o AsyncClient compartilhado, criando-o sob demanda"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            headers=get_headers(),
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=TANK01_MAX_CONCURRENCY,
+                max_keepalive_connections=TANK01_MAX_CONCURRENCY,
+            ),
+        )
+        _client_loop = loop
+
+    return _client
+
+
+async def close_client() -> None:
+    """Fecha o AsyncClient compartilhado (chamado no shutdown da API)"""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Erros de rede, 429 e 5xx valem retry; demais 4xx não"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
 def safe_int(value, default=0) -> int:
     """Converte valor para int de forma segura"""
     if value is None:
@@ -84,50 +143,104 @@ async def fetch_team_roster_with_stats(team: str) -> list[dict]:
 
     url = f"{TANK01_BASE_URL}/getNFLTeamRoster"
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            url,
-            headers=get_headers(),
-            params={"teamAbv": team, "getStats": "true"},
-            timeout=REQUEST_TIMEOUT
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data.get("body", {}).get("roster", [])
+    response = await get_client().get(
+        url,
+        params={"teamAbv": team, "getStats": "true"},
+    )
+    response.raise_for_status()
+    data = response.json()
+    return data.get("body", {}).get("roster", [])
 
 
-async def fetch_all_players_with_stats() -> list[dict]:
+async def _fetch_team_with_retry(team: str, semaphore: asyncio.Semaphore) -> list[dict]:
     """
-    Busca todos os jogadores de todos os times com stats
-    Faz 32 chamadas (1 por time)
+    Busca o roster de um time com retry e backoff exponencial (com jitter).
+    O semáforo limita apenas as requisições em andamento, não as esperas.
+    """
+    for attempt in range(TANK01_MAX_RETRIES + 1):
+        try:
+            async with semaphore:
+                return await fetch_team_roster_with_stats(team)
+        except Exception as e:
+            if attempt == TANK01_MAX_RETRIES or not _is_retryable(e):
+                raise
+            delay = TANK01_RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.8, 1.2)
+            print(f"[tank01] {team}: tentativa {attempt + 1} falhou ({type(e).__name__}), retry em {delay:.2f}s")
+            await asyncio.sleep(delay)
+    return []
+
+
+async def _fetch_all_players_with_stats() -> tuple[list[dict], list[str]]:
+    """
+    Busca os 32 rosters em paralelo
+    Retorna (jogadores, times que falharam). Resultados parciais ficam no
+    cache curto (TANK01_PARTIAL_TTL) e não substituem o completo.
     """
-    cache_key = "tank01_all_players"
-    cached = read_cache(cache_key, 0)
+    cached = read_cache(ALL_PLAYERS_KEY, 0)
     if cached is not None:
-        return cached
+        return cached, []
 
-    all_players = []
+    partial = read_cache(PARTIAL_PLAYERS_KEY, 0)
+    if partial is not None:
+        return partial["players"], partial["failed_teams"]
 
-    for team in NFL_TEAMS:
-        try:
-            print(f"[tank01] Buscando roster de {team}...")
-            roster = await fetch_team_roster_with_stats(team)
+    # Requests concorrentes com cache frio compartilham o mesmo sweep
+    return await run_once(ALL_PLAYERS_KEY, _sweep_all_teams)
+
+
+async def _sweep_all_teams() -> tuple[list[dict], list[str]]:
+    """Faz o fan-out dos 32 rosters e cacheia (parcial: só pelo TTL curto)"""
+    semaphore = asyncio.Semaphore(max(1, TANK01_MAX_CONCURRENCY))
+    rosters = await asyncio.gather(
+        *(_fetch_team_with_retry(team, semaphore) for team in NFL_TEAMS),
+        return_exceptions=True,
+    )
+
+    all_players = []
+    failed_teams = []
+
+    # Mantém a ordem de NFL_TEAMS independente da ordem de chegada
+    for team, roster in zip(NFL_TEAMS, rosters):
+        if isinstance(roster, BaseException):
+            print(f"[tank01] Erro ao buscar {team}: {roster}")
+            failed_teams.append(team)
+        else:
             all_players.extend(roster)
-        except Exception as e:
-            print(f"[tank01] Erro ao buscar {team}: {e}")
 
-    if all_players:
-        write_cache(cache_key, 0, all_players)
+    if failed_teams:
+        print(f"[tank01] Resultado parcial: {len(NFL_TEAMS) - len(failed_teams)}/{len(NFL_TEAMS)} times")
+        write_cache(PARTIAL_PLAYERS_KEY, 0, {"players": all_players, "failed_teams": failed_teams})
+    elif all_players:
+        write_cache(ALL_PLAYERS_KEY, 0, all_players)
 
-    return all_players
+    return all_players, failed_teams
+
+
+async def refresh_all_players() -> list[dict]:
+    """
+    Refaz o sweep dos 32 times mesmo com o cache válido (usado pelo scheduler);
+    o cache anterior só é substituído se todos os times responderem
+    """
+    players, _ = await run_once(ALL_PLAYERS_KEY, _sweep_all_teams)
+    return players
+
+
+async def fetch_all_players_with_stats() -> list[dict]:
+    """
+    Busca todos os jogadores de todos os times com stats
+    Faz 32 chamadas (1 por time) em paralelo
+    """
+    players, _ = await _fetch_all_players_with_stats()
+    return players
 
 
-async def get_defensive_stats(season: int = 2024) -> list[dict]:
+async def get_defensive_stats(season: int = 2024, refresh: bool = False) -> list[dict]:
     """
     Retorna stats defensivas usando Tank01 API
+    refresh: ignora o cache da temporada e regrava a partir dos rosters em cache
     """
     cache_key = f"tank01_def_stats_{season}"
-    cached = read_cache(cache_key, 0)
+    cached = None if refresh else read_cache(cache_key, 0)
     if cached is not None:
         return cached
 
@@ -135,7 +248,7 @@ async def get_defensive_stats(season: int = 2024) -> list[dict]:
         raise ValueError("Tank01 API not configured. Set RAPIDAPI_KEY environment variable.")
 
     # Busca todos os jogadores com stats
-    players_raw = await fetch_all_players_with_stats()
+    players_raw, failed_teams = await _fetch_all_players_with_stats()
 
     result = []
 
@@ -204,19 +317,20 @@ async def get_defensive_stats(season: int = 2024) -> list[dict]:
     # Ordena por tackles (desc)
     result.sort(key=lambda x: x["stats"]["tackles"], reverse=True)
 
-    # Cache o resultado
-    if result:
+    # Cache o resultado (só se todos os times responderam)
+    if result and not failed_teams:
         write_cache(cache_key, 0, result)
 
     return result
 
 
-async def get_offensive_stats(season: int = 2024) -> list[dict]:
+async def get_offensive_stats(season: int = 2024, refresh: bool = False) -> list[dict]:
     """
     Retorna stats ofensivas usando Tank01 API
+    refresh: ignora o cache da temporada e regrava a partir dos rosters em cache
     """
     cache_key = f"tank01_off_stats_{season}"
-    cached = read_cache(cache_key, 0)
+    cached = None if refresh else read_cache(cache_key, 0)
     if cached is not None:
         return cached
 
@@ -224,7 +338,7 @@ async def get_offensive_stats(season: int = 2024) -> list[dict]:
         raise ValueError("Tank01 API not configured. Set RAPIDAPI_KEY environment variable.")
 
     # Busca todos os jogadores com stats
-    players_raw = await fetch_all_players_with_stats()
+    players_raw, failed_teams = await _fetch_all_players_with_stats()
 
     result = []
 
@@ -339,8 +453,8 @@ async def get_offensive_stats(season: int = 2024) -> list[dict]:
     # Ordena por total yards
     result.sort(key=lambda x: x["stats"]["passingYards"] + x["stats"]["rushingYards"] + x["stats"]["receivingYards"], reverse=True)
 
-    # Cache o resultado
-    if result:
+    # Cache o resultado (só se todos os times responderam)
+    if result and not failed_teams:
         write_cache(cache_key, 0, result)
 
     return result
@@ -5,20 +5,26 @@ Estratégia:
 1. Tenta fonte primária (Tank01 para dados live)
 2. Se falhar → fallback para fonte secundária (nflverse para dados históricos)
 3. Cache inteligente com TTLs diferentes por fonte
+4. Stale-while-revalidate: cache expirado é servido na hora e atualizado em
+   background; se o upstream falhar, o cache expirado continua servindo
 
 Response inclui metadata:
 - source: "tank01" | "nflverse"
 - cached: bool
-- cache_age_seconds: int
+- cache_age_seconds: int (acima do TTL da fonte = dado expirado)
 """
 
-from typing import Optional
+import asyncio
+from typing import Awaitable, Callable, Optional
 from config import PRIMARY_SOURCE, DEBUG
-from cache import get_cache_path, get_cache_age_seconds, read_cache_with_metadata
+from cache import find_cache_path, get_cache_age_seconds, get_cache_version, read_cache
+from singleflight import run_once
 from sources import (
     get_defensive_stats_nflverse,
     get_offensive_stats_nflverse,
     get_available_seasons_nflverse,
+    get_nflverse_stats_version,
+    get_stale_stats_nflverse,
     get_defensive_stats_tank01,
     get_offensive_stats_tank01,
     is_tank01_configured,
@@ -34,13 +40,16 @@ class StatsResult:
         source: str,
         cached: bool = False,
         cache_age_seconds: int = 0,
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        version: Optional[str] = None,
     ):
         self.players = players
         self.source = source
         self.cached = cached
         self.cache_age_seconds = cache_age_seconds
         self.error = error
+        # Identifica a entrada de cache que gerou players (None = não cacheado)
+        self.version = version
 
     def to_dict(self) -> dict:
         return {
@@ -52,6 +61,44 @@ class StatsResult:
         }
 
 
+def _cache_entry(source: str, kind: str, season: int) -> tuple[str, int]:
+    """(key, season) da entrada de cache de stats da fonte"""
+    if source == "tank01":
+        return f"tank01_{'off' if kind == 'offense' else 'def'}_stats_{season}", 0
+    return ("nflverse_player_stats" if kind == "offense" else "nflverse_player_stats_def"), season
+
+
+def _source_version(source: str, kind: str, season: int, include_stale: bool = False) -> Optional[str]:
+    """Versão da entrada de cache da fonte (None se ausente ou expirada, salvo include_stale)"""
+    if source == "tank01":
+        version = get_cache_version(*_cache_entry(source, kind, season), include_stale)
+        return str(version) if version is not None else None
+    source_version = get_nflverse_stats_version(kind, season, include_stale)  # (stats, rosters, ref)
+    return ":".join(str(v) for v in source_version) if source_version else None
+
+
+def _build_result(players: list[dict], source: str, kind: str, season: int, stale: bool = False) -> StatsResult:
+    """
+    Monta o StatsResult com metadata do cache da fonte
+    kind: "offense" | "defense"
+    stale: players vieram de uma entrada expirada (cached=True, idade acima do TTL)
+    """
+    cache_key, cache_season = _cache_entry(source, kind, season)
+    version = _source_version(source, kind, season, include_stale=stale)
+
+    cache_path = find_cache_path(cache_key, cache_season)
+    age = get_cache_age_seconds(cache_path)
+    cached = age >= 0 and version is not None  # Entrada em cache (dentro do TTL, ou expirada se stale)
+
+    return StatsResult(
+        players=players,
+        source=source,
+        cached=cached,
+        cache_age_seconds=max(0, age),
+        version=f"{source}:{kind}:{season}:{version}" if version is not None else None,
+    )
+
+
 async def get_defensive_stats(season: int = 2024) -> StatsResult:
     """
     Busca stats defensivas com fallback automático
@@ -59,7 +106,14 @@ async def get_defensive_stats(season: int = 2024) -> StatsResult:
     Ordem de tentativa (baseada em PRIMARY_SOURCE):
     1. tank01 (se configurado) → dados live, TTL 1h
     2. nflverse → dados históricos, TTL 24h
+
+    Chamadas concorrentes para a mesma temporada compartilham um único fetch.
+    Cache expirado é servido na hora (com refresh em background).
     """
+    return await _serve_stats("defense", season, _get_defensive_stats)
+
+
+async def _get_defensive_stats(season: int) -> StatsResult:
     primary = PRIMARY_SOURCE.lower()
 
     # Se Tank01 está configurado e é a fonte primária, tenta primeiro
@@ -71,18 +125,7 @@ async def get_defensive_stats(season: int = 2024) -> StatsResult:
             players = await get_defensive_stats_tank01(season)
 
             if players:
-                # Verifica se veio do cache
-                cache_key = f"tank01_def_stats_{season}"
-                cache_path = get_cache_path(cache_key, 0)
-                age = get_cache_age_seconds(cache_path)
-                cached = age >= 0 and age < 3600  # Considera cacheado se age < TTL
-
-                return StatsResult(
-                    players=players,
-                    source="tank01",
-                    cached=cached,
-                    cache_age_seconds=max(0, age)
-                )
+                return _build_result(players, "tank01", "defense", season)
 
         except Exception as e:
             print(f"[orchestrator] Tank01 falhou: {e}")
@@ -93,20 +136,8 @@ async def get_defensive_stats(season: int = 2024) -> StatsResult:
         if DEBUG:
             print(f"[orchestrator] Usando nflverse para defense stats (season={season})")
 
-        players = get_defensive_stats_nflverse(season)
-
-        # Verifica metadata do cache (usa season como key suffix)
-        cache_key = "nflverse_player_stats_def"
-        cache_path = get_cache_path(cache_key, season)
-        age = get_cache_age_seconds(cache_path)
-        cached = age >= 0 and age < 86400  # Considera cacheado se age < TTL
-
-        return StatsResult(
-            players=players,
-            source="nflverse",
-            cached=cached,
-            cache_age_seconds=max(0, age)
-        )
+        players = await get_defensive_stats_nflverse(season)
+        return _build_result(players, "nflverse", "defense", season)
 
     except Exception as e:
         print(f"[orchestrator] nflverse falhou: {e}")
@@ -120,7 +151,13 @@ async def get_defensive_stats(season: int = 2024) -> StatsResult:
 async def get_offensive_stats(season: int = 2024) -> StatsResult:
     """
     Busca stats ofensivas com fallback automático
+    Chamadas concorrentes para a mesma temporada compartilham um único fetch.
+    Cache expirado é servido na hora (com refresh em background).
     """
+    return await _serve_stats("offense", season, _get_offensive_stats)
+
+
+async def _get_offensive_stats(season: int) -> StatsResult:
     primary = PRIMARY_SOURCE.lower()
 
     # Se Tank01 está configurado e é a fonte primária
@@ -132,17 +169,7 @@ async def get_offensive_stats(season: int = 2024) -> StatsResult:
             players = await get_offensive_stats_tank01(season)
 
             if players:
-                cache_key = f"tank01_off_stats_{season}"
-                cache_path = get_cache_path(cache_key, 0)
-                age = get_cache_age_seconds(cache_path)
-                cached = age >= 0 and age < 3600
-
-                return StatsResult(
-                    players=players,
-                    source="tank01",
-                    cached=cached,
-                    cache_age_seconds=max(0, age)
-                )
+                return _build_result(players, "tank01", "offense", season)
 
         except Exception as e:
             print(f"[orchestrator] Tank01 falhou: {e}")
@@ -153,19 +180,8 @@ async def get_offensive_stats(season: int = 2024) -> StatsResult:
         if DEBUG:
             print(f"[orchestrator] Usando nflverse para offense stats (season={season})")
 
-        players = get_offensive_stats_nflverse(season)
-
-        cache_key = "nflverse_player_stats"
-        cache_path = get_cache_path(cache_key, season)
-        age = get_cache_age_seconds(cache_path)
-        cached = age >= 0 and age < 86400
-
-        return StatsResult(
-            players=players,
-            source="nflverse",
-            cached=cached,
-            cache_age_seconds=max(0, age)
-        )
+        players = await get_offensive_stats_nflverse(season)
+        return _build_result(players, "nflverse", "offense", season)
 
     except Exception as e:
         print(f"[orchestrator] nflverse falhou: {e}")
@@ -176,12 +192,137 @@ async def get_offensive_stats(season: int = 2024) -> StatsResult:
         )
 
 
-def get_available_seasons() -> list[int]:
+# ============================================
+# Stale-while-revalidate / stale-if-error
+# ============================================
+# A primeira fonte (na ordem de tentativa) com stats em cache decide: se a
+# entrada está válida, o fluxo normal responde do cache; se expirou, ela é
+# servida na hora e um único refresh roda em background. Sem cache nenhum,
+# o request espera o fetch; se o fetch falhar, o cache expirado é usado.
+
+# Refreshes em andamento (key do single-flight -> task), também evita GC das tasks
+_refreshes: dict[str, asyncio.Task] = {}
+
+
+def _source_order() -> list[str]:
+    """Fontes na ordem em que _get_*_stats as tenta"""
+    if PRIMARY_SOURCE.lower() == "tank01" and is_tank01_configured():
+        return ["tank01", "nflverse"]
+    return ["nflverse"]
+
+
+async def _stale_result(kind: str, season: int) -> Optional[StatsResult]:
+    """
+    Resultado da primeira fonte com stats em cache, se essa entrada estiver
+    expirada; None se ela estiver válida ou se nenhuma fonte tiver cache
+    """
+    for source in _source_order():
+        if _source_version(source, kind, season, include_stale=True) is None:
+            continue
+        if _source_version(source, kind, season) is not None:
+            return None
+
+        try:
+            if source == "tank01":
+                players = read_cache(*_cache_entry(source, kind, season), include_stale=True)
+            else:
+                players = await get_stale_stats_nflverse(kind, season)
+        except Exception as e:
+            print(f"[orchestrator] Falha ao ler cache expirado de {source}: {e}")
+            continue
+        if players:
+            return _build_result(players, source, kind, season, stale=True)
+    return None
+
+
+def _refresh_in_background(key: str, fetch: Callable[[], Awaitable[StatsResult]]) -> None:
+    """Dispara fetch() uma única vez por key, sem bloquear o request"""
+    if key in _refreshes:
+        return
+
+    async def refresh() -> None:
+        try:
+            result = await run_once(key, fetch)
+            if result.error:
+                print(f"[orchestrator] Refresh de {key} falhou, mantendo cache expirado: {result.error}")
+        finally:
+            _refreshes.pop(key, None)
+
+    _refreshes[key] = asyncio.create_task(refresh())
+
+
+async def _serve_stats(
+    kind: str,
+    season: int,
+    fetch: Callable[[int], Awaitable[StatsResult]],
+) -> StatsResult:
+    key = f"stats_{kind}_{season}"
+
+    stale = await _stale_result(kind, season)
+    if stale is not None:
+        if DEBUG:
+            print(f"[orchestrator] Servindo {kind} stats expiradas (season={season}), refresh em background")
+        _refresh_in_background(key, lambda: fetch(season))
+        return stale
+
+    result = await run_once(key, lambda: fetch(season))
+    if not result.players:
+        # Stale-if-error: a entrada pode ter expirado entre a checagem e o fetch
+        stale = await _stale_result(kind, season)
+        if stale is not None:
+            stale.error = result.error
+            return stale
+    return result
+
+
+# ============================================
+# Player Index (lookup O(1) por player_id)
+# ============================================
+# (source, kind, season) -> (version, player_id -> player)
+# Reconstruído só quando a entrada de cache por trás do resultado muda
+
+_player_indexes: dict[tuple[str, str, int], tuple[str, dict[str, dict]]] = {}
+
+
+def get_player_index(result: StatsResult, kind: str, season: int) -> dict[str, dict]:
+    """Retorna o índice player_id -> jogador do resultado (cacheado por versão)"""
+    key = (result.source, kind, season)
+    entry = _player_indexes.get(key)
+    if result.version is not None and entry is not None and entry[0] == result.version:
+        return entry[1]
+
+    index: dict[str, dict] = {}
+    for player in result.players:
+        player_id = player.get("id")
+        if player_id and player_id not in index:  # Primeira ocorrência vence (como a busca linear)
+            index[player_id] = player
+
+    if result.version is not None:
+        _player_indexes[key] = (result.version, index)
+    return index
+
+
+async def find_player(season: int, player_id: str) -> tuple[Optional[dict], bool]:
+    """
+    Busca um jogador da temporada por id (ofensa primeiro, depois defesa)
+    Retorna (player, is_defense); player é None se não encontrado
+    """
+    offense_result = await get_offensive_stats(season)
+    player = get_player_index(offense_result, "offense", season).get(player_id)
+    if player is not None:
+        return player, False
+
+    defense_result = await get_defensive_stats(season)
+    player = get_player_index(defense_result, "defense", season).get(player_id)
+    return player, player is not None
+
+
+async def get_available_seasons() -> list[int]:
     """
     Retorna lista de temporadas disponíveis
     Usa nflverse como fonte canônica (Tank01 não tem dados históricos)
     """
-    return get_available_seasons_nflverse()
+    return await get_available_seasons_nflverse()
 
 
 # ============================================
@@ -189,48 +330,29 @@ def get_available_seasons() -> list[int]:
 # ============================================
 # Tank01 has issues with historical seasons (returns stale data)
 # nflverse is the reliable source for historical stats
+# All nflverse work runs on the dedicated executor (see executor.py)
 
-def get_historical_offensive_stats(season: int) -> StatsResult:
+async def get_historical_offensive_stats(season: int) -> StatsResult:
     """
     Fetches historical offensive stats using nflverse directly.
     Use this for multi-season queries where accurate historical data is needed.
     """
     try:
-        players = get_offensive_stats_nflverse(season)
-        cache_key = "nflverse_player_stats"
-        cache_path = get_cache_path(cache_key, season)
-        age = get_cache_age_seconds(cache_path)
-        cached = age >= 0 and age < 86400
-
-        return StatsResult(
-            players=players,
-            source="nflverse",
-            cached=cached,
-            cache_age_seconds=max(0, age)
-        )
+        players = await get_offensive_stats_nflverse(season)
+        return _build_result(players, "nflverse", "offense", season)
     except Exception as e:
         print(f"[historical] nflverse offense failed: {e}")
         return StatsResult(players=[], source="none", error=str(e))
 
 
-def get_historical_defensive_stats(season: int) -> StatsResult:
+async def get_historical_defensive_stats(season: int) -> StatsResult:
     """
     Fetches historical defensive stats using nflverse directly.
     Use this for multi-season queries where accurate historical data is needed.
     """
     try:
-        players = get_defensive_stats_nflverse(season)
-        cache_key = "nflverse_player_stats_def"
-        cache_path = get_cache_path(cache_key, season)
-        age = get_cache_age_seconds(cache_path)
-        cached = age >= 0 and age < 86400
-
-        return StatsResult(
-            players=players,
-            source="nflverse",
-            cached=cached,
-            cache_age_seconds=max(0, age)
-        )
+        players = await get_defensive_stats_nflverse(season)
+        return _build_result(players, "nflverse", "defense", season)
     except Exception as e:
         print(f"[historical] nflverse defense failed: {e}")
         return StatsResult(players=[], source="none", error=str(e))
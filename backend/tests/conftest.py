@@ -0,0 +1,185 @@
+"""
+Fixtures compartilhadas dos testes do backend
+
+Uso (a partir de backend/):
+    python -m pytest -q
+"""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Os testes nunca disparam o agendador de refresh nem a Tank01
+os.environ.setdefault("CACHE_REFRESH_ENABLED", "false")
+os.environ.setdefault("PRIMARY_SOURCE", "nflverse")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    """Downloads do nflverse apontam para uma porta local fechada (falha imediata)"""
+    from sources import nflverse
+
+    for name in dir(nflverse):
+        if name.startswith("NFLVERSE_") and name.endswith("_URL"):
+            monkeypatch.setattr(nflverse, name, "http://127.0.0.1:9/" + getattr(nflverse, name).rsplit("/", 1)[-1])
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Cache isolado (disco em tmp_path, memória limpa antes e depois)"""
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    cache.clear_cache()
+    yield tmp_path
+    cache.clear_cache()
+
+
+def expire(key: str, season: int) -> None:
+    """Faz a entrada key/season parecer expirada (escrita e revalidação antigas)"""
+    path = cache.find_cache_path(key, season)
+    old = path.stat().st_mtime - 10 * cache.get_ttl_for_key(key)
+    os.utime(path, (old, old))
+    cache._memory_invalidate(key, season)
+    metadata = cache.read_cache_metadata(key, season)
+    if metadata:
+        metadata["validated_at"] = 0.0
+        cache.write_cache_metadata(key, season, metadata)
+
+
+class Upstream:
+    """
+    Servidor HTTP local: routes[path] = (status, headers, body), ou respond()
+    sobrescrito para rotas dinâmicas. requests guarda (path, headers) de cada
+    request recebido.
+    """
+
+    def __init__(self):
+        self.routes: dict[str, tuple[int, dict, bytes]] = {}
+        self.requests: list[tuple[str, dict]] = []
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                upstream.requests.append((self.path, dict(self.headers)))
+                status, headers, body = upstream.respond(self.path)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def respond(self, path: str) -> tuple[int, dict, bytes]:
+        return self.routes.get(path, (404, {}, b""))
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def upstream():
+    server = Upstream()
+    yield server
+    server.close()
+
+
+SEASON = 2023
+
+
+def seed_season(season: int = SEASON, players: int = 60, seed: int = 1) -> list[str]:
+    """
+    Grava stats/rosters sintéticos do nflverse no cache (sem rede).
+    Retorna os player_ids semeados.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    ids = [f"p{i:02d}" for i in range(players)]
+    cache.write_cache_frame("nflverse_player_stats", season, pd.DataFrame({
+        "player_id": ids,
+        "player_display_name": [f"Player {i}" for i in range(players)],
+        "position": rng.choice(["QB", "RB", "WR", "TE"], players),
+        "season": season,
+        "week": 1,
+        "fantasy_points_ppr": rng.uniform(10, 400, players).round(1),
+        "passing_yards": rng.uniform(0, 300, players).round(),
+        "rushing_yards": rng.uniform(1, 300, players).round(),
+        "receiving_yards": rng.uniform(1, 300, players).round(),
+    }))
+    defenders = players // 3
+    def_ids = [f"d{i:02d}" for i in range(defenders)]
+    solo = rng.integers(5, 90, defenders)
+    assists = rng.integers(0, 40, defenders)
+    cache.write_cache_frame("nflverse_player_stats_def", season, pd.DataFrame({
+        "player_id": def_ids,
+        "player_display_name": [f"Defender {i}" for i in range(defenders)],
+        "position": rng.choice(["DE", "LB", "CB", "S"], defenders),
+        "season": season,
+        "week": 1,
+        "def_tackles_solo": solo,
+        "def_tackle_assists": assists,
+        "def_tackles": solo + assists,
+        "def_sacks": rng.integers(0, 10, defenders).astype(float),
+        "def_interceptions": rng.integers(0, 4, defenders),
+    }))
+    cache.write_cache_frame("nflverse_rosters", season, pd.DataFrame({
+        "gsis_id": ids + def_ids,
+        "week": 1,
+        "team": "KC",
+    }))
+    return ids + def_ids
+
+
+@pytest.fixture
+def client(cache_dir):
+    """TestClient da API com uma temporada semeada no cache isolado"""
+    from fastapi.testclient import TestClient
+
+    import main
+
+    seed_season()
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def sleeper(upstream, monkeypatch):
+    """
+    Sleeper local: sleeper.leagues[league_id] = configurações da liga;
+    sleeper.statuses[league_id] = status de erro (ex: 429) para a liga
+    """
+    import json
+
+    from sources import sleeper as sleeper_source
+
+    monkeypatch.setattr(sleeper_source, "SLEEPER_BASE_URL", upstream.url)
+    leagues: dict[str, dict] = {}
+    statuses: dict[str, int] = {}
+
+    def respond(path: str) -> tuple[int, dict, bytes]:
+        league_id = path.removeprefix("/league/")
+        if league_id in statuses:
+            return statuses[league_id], {}, b""
+        # Como o Sleeper: liga inexistente = 200 com corpo null
+        return 200, {"Content-Type": "application/json"}, json.dumps(leagues.get(league_id)).encode()
+
+    monkeypatch.setattr(upstream, "respond", respond)
+    upstream.leagues = leagues
+    upstream.statuses = statuses
+    return upstream
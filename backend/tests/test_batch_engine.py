@@ -0,0 +1,47 @@
+"""Paridade do engine batch (NumPy) com o pipeline escalar do Dynasty Pulse"""
+
+import random
+
+import pytest
+
+from benchmarks.value_engine import make_players
+from dynasty_pulse import calculate_all_player_values, calculate_all_player_values_batch
+
+
+def with_gaps(players: list[dict], seed: int) -> list[dict]:
+    """
+    Stats ausentes ou vazias, stats faltando e idades None em parte do pool
+    (stats com valor None nunca chegam aqui: a ingestão grava 0.0)
+    """
+    rng = random.Random(seed)
+    for player in players:
+        roll = rng.random()
+        if roll < 0.05:
+            player.pop("stats")
+        elif roll < 0.1:
+            player["stats"] = {}
+        elif roll < 0.3:
+            for key in rng.sample(sorted(player["stats"]), 3):
+                del player["stats"][key]
+        if rng.random() < 0.1:
+            player["age"] = None
+    return players
+
+
+@pytest.mark.parametrize("superflex, tep", [(False, False), (True, False), (False, True), (True, True)])
+@pytest.mark.parametrize("seed", [1, 7])
+def test_batch_matches_scalar(superflex, tep, seed):
+    offensive, defensive = make_players(1500, seed=seed)
+    offensive, defensive = with_gaps(offensive, seed), with_gaps(defensive, seed + 1)
+    # Jogadores que os dois engines descartam: sem id ou posição fora do pool
+    offensive.append({"id": "", "position": "QB", "stats": {"games": 10}})
+    offensive.append({"id": "fb-1", "position": "FB", "stats": {"games": 10}})
+    defensive.append({"id": "ol-1", "fantasyPosition": "OL", "stats": {"games": 10}})
+
+    scalar = calculate_all_player_values(offensive, defensive, superflex, tep)
+    batch = calculate_all_player_values_batch(offensive, defensive, superflex, tep)
+
+    assert list(batch) == list(scalar)
+    assert {breakdown["position"] for breakdown in batch.values()} >= {"QB", "K", "TE", "DL", "LB", "DB"}
+    for player_id, breakdown in scalar.items():
+        assert batch[player_id] == breakdown, player_id
@@ -0,0 +1,31 @@
+"""Formatos do cache de DataFrames (parquet/arrow/json) e fallback para JSON"""
+
+import pandas as pd
+import pytest
+
+import cache
+
+KEY = "nflverse_player_stats"
+FRAME = pd.DataFrame({"player_id": ["a", "b"], "yards": [10.5, 0.0]})
+
+
+@pytest.mark.parametrize("fmt, suffix", [("parquet", ".parquet"), ("arrow", ".arrow"), ("json", ".json")])
+def test_write_cache_frame_formats(cache_dir, capsys, fmt, suffix):
+    cache.write_cache_frame(KEY, 2023, FRAME, fmt)
+    assert cache.find_cache_path(KEY, 2023).suffix == suffix
+    # JSON pedido não é tratado como falha do formato colunar
+    assert "falhou" not in capsys.readouterr().out
+
+    cache._memory_invalidate()  # relê do disco
+    pd.testing.assert_frame_equal(cache.read_cache_frame(KEY, 2023), FRAME)
+
+
+def test_mixed_column_falls_back_to_json(cache_dir, capsys):
+    mixed = pd.DataFrame({"player_id": ["a", "b"], "team": ["KC", 7]})
+    cache.write_cache_frame(KEY, 2023, mixed, "parquet")
+    assert "parquet falhou" in capsys.readouterr().out
+    assert cache.find_cache_path(KEY, 2023).suffix == ".json"
+
+    cache._memory_invalidate()  # relê do disco
+    assert cache.read_cache_frame(KEY, 2023).to_dict(orient="records") == mixed.to_dict(orient="records")
+
@@ -0,0 +1,52 @@
+"""Pools do executor sobrevivem a shutdown + novo startup no mesmo processo"""
+
+import asyncio
+import os
+
+import executor
+from conftest import seed_season
+
+
+def test_run_blocking_after_shutdown():
+    assert asyncio.run(executor.run_blocking(sum, [1, 2])) == 3
+    executor.shutdown_executor()
+    assert asyncio.run(executor.run_blocking(sum, [3, 4])) == 7
+    executor.shutdown_executor()
+
+
+def test_run_cpu_bound_after_shutdown(monkeypatch):
+    monkeypatch.setattr(executor, "NFLVERSE_PROCESS_WORKERS", 1)
+    assert asyncio.run(executor.run_cpu_bound(os.getpid)) != os.getpid()
+    executor.shutdown_executor()
+    assert asyncio.run(executor.run_cpu_bound(abs, -5)) == 5
+    executor.shutdown_executor()
+
+
+def test_app_restart_in_same_process(cache_dir):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    # Cada startup busca uma temporada nova (sem resposta cacheada): o trabalho
+    # passa pelo executor recriado depois do shutdown do ciclo anterior
+    for season in (2022, 2023):
+        seed_season(season)
+        with TestClient(main.app) as client:
+            assert client.get(f"/api/stats/offense?season={season}").json()["count"] > 0
+
+
+def test_failed_tasks_are_not_completed(monkeypatch):
+    for key in executor._metrics:
+        monkeypatch.setitem(executor._metrics, key, 0 if key != "total_wait_seconds" else 0.0)
+
+    async def run():
+        await executor.run_blocking(sum, [1])
+        try:
+            await executor.run_blocking(int, "x")
+        except ValueError:
+            pass
+
+    asyncio.run(run())
+    stats = executor.get_executor_stats()
+    assert (stats["completed"], stats["failed"], stats["running"], stats["queued"]) == (1, 1, 0, 0)
+    executor.shutdown_executor()
@@ -0,0 +1,42 @@
+"""Matriz de stats por liga: o vetor padrão tem que reproduzir o PPG base"""
+
+import numpy as np
+
+from dynasty_pulse.league_points import STANDARD_VECTOR, build_stat_matrix, scoring_vector
+
+OFFENSE = [
+    {"id": "qb1", "position": "QB", "stats": {"games": 17, "passingYards": 4200, "passingTds": 30, "interceptions": 10,
+                                              "rushingYards": 300, "rushingTds": 3, "fumblesLost": 2}},
+    {"id": "te1", "position": "TE", "stats": {"games": 15, "receptions": 80, "receivingYards": 900, "receivingTds": 6}},
+    {"id": "rb1", "position": "RB", "stats": {"rushingYards": 1100, "rushingTds": 9, "receptions": 40}},
+]
+
+DEFENSE = [
+    # Fonte com tackles solo/assist separados
+    {"id": "lb1", "fantasyPosition": "LB", "stats": {"games": 17, "soloTackles": 90, "assistTackles": 40, "tackles": 130,
+                                                     "sacks": 3, "tfl": 8, "qbHits": 6, "passesDefended": 4}},
+    # Fonte só com o total de tackles
+    {"id": "db1", "fantasyPosition": "DB", "stats": {"games": 16, "tackles": 70, "interceptions": 4, "passesDefended": 12}},
+    {"id": "dl1", "fantasyPosition": "DL", "stats": {"games": 0, "soloTackles": 0, "tackles": 25, "sacks": 9,
+                                                     "forcedFumbles": 2, "fumbleRecoveryOpp": 1, "defensiveTds": 1}},
+]
+
+
+def test_standard_vector_reproduces_base_ppg():
+    matrix = build_stat_matrix(OFFENSE, DEFENSE)
+    assert matrix.player_ids == ["qb1", "te1", "rb1", "lb1", "db1", "dl1"]
+    np.testing.assert_allclose(matrix.ppg(STANDARD_VECTOR), matrix.base_ppg)
+
+
+def test_tackles_only_feed_counts_tackles_as_solo():
+    matrix = build_stat_matrix([], DEFENSE)
+    ppg = matrix.ppg(scoring_vector({"idp_tkl_solo": 1.0}))
+    assert ppg[matrix.index["db1"]] == 70 / 16
+    assert ppg[matrix.index["lb1"]] == 90 / 17
+
+
+def test_te_bonus_only_applies_to_tes():
+    matrix = build_stat_matrix(OFFENSE, [])
+    ppg = matrix.ppg(scoring_vector({"bonus_rec_te": 1.0}))
+    assert ppg[matrix.index["te1"]] == 80 / 15
+    assert ppg[matrix.index["qb1"]] == ppg[matrix.index["rb1"]] == 0.0
@@ -0,0 +1,65 @@
+"""Revalidação condicional do consolidado do nflverse (download em streaming)"""
+
+import io
+
+import pandas as pd
+import pytest
+
+import cache
+from conftest import expire
+from sources import nflverse
+
+KEY = nflverse.CONSOLIDATED_DEF_KEY
+
+
+def parquet_bytes(seasons: list[int]) -> bytes:
+    buffer = io.BytesIO()
+    pd.DataFrame({"season": seasons, "player_id": [f"p{i}" for i in range(len(seasons))]}).to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def consolidated(cache_dir, upstream, monkeypatch):
+    monkeypatch.setattr(nflverse, "NFLVERSE_PLAYER_STATS_DEF_ALL_URL", f"{upstream.url}/player_stats_def.parquet")
+    return upstream
+
+
+def serve(upstream, body: bytes, headers: dict = None) -> None:
+    upstream.routes["/player_stats_def.parquet"] = (200, headers or {}, body)
+
+
+def test_expired_changed_without_etag_downloads_new_file(consolidated):
+    serve(consolidated, parquet_bytes([2023, 2023]))
+    assert nflverse.get_consolidated_seasons() == [2023]
+
+    expire(KEY, 0)
+    serve(consolidated, parquet_bytes([2024, 2023]))
+    assert nflverse.get_consolidated_seasons() == [2024, 2023]
+    assert nflverse.read_consolidated_def(2024)["player_id"].tolist() == ["p0"]
+    assert cache.get_cache_version(KEY, 0) is not None
+    assert not list(cache.CACHE_DIR.glob(".*.tmp"))
+
+
+def test_expired_unchanged_without_etag_only_renews_ttl(consolidated):
+    serve(consolidated, parquet_bytes([2023]))
+    nflverse.get_consolidated_seasons()
+    expire(KEY, 0)
+    stale_version = cache.get_cache_version(KEY, 0, include_stale=True)
+
+    assert nflverse.get_consolidated_seasons() == [2023]
+    # Mesmo arquivo (mesma versão), de novo dentro do TTL
+    assert cache.get_cache_version(KEY, 0) == stale_version
+    assert len(consolidated.requests) == 2
+
+
+def test_expired_with_etag_sends_conditional_request(consolidated):
+    body = parquet_bytes([2023])
+    serve(consolidated, body, {"ETag": '"v1"'})
+    nflverse.get_consolidated_seasons()
+    expire(KEY, 0)
+    stale_version = cache.get_cache_version(KEY, 0, include_stale=True)
+
+    consolidated.routes["/player_stats_def.parquet"] = (304, {"ETag": '"v1"'}, b"")
+    assert nflverse.get_consolidated_seasons() == [2023]
+    assert consolidated.requests[-1][1].get("If-None-Match") == '"v1"'
+    assert cache.get_cache_version(KEY, 0) == stale_version
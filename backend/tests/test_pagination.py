@@ -0,0 +1,132 @@
+"""Paginação por cursor (limit/cursor), top-N e projeção de campos (fields=)"""
+
+import pytest
+from fastapi import HTTPException
+
+from conftest import SEASON, seed_season
+from pagination import ListQuery, parse_fields, project
+
+
+def make_query(limit=None, cursor=None, fields=None) -> ListQuery:
+    return ListQuery(limit=limit, cursor=cursor, fields=fields)
+
+
+def test_page_of_walks_cursors():
+    items = list(range(7))
+    pages, cursor = [], None
+    while True:
+        page, cursor = make_query(limit=3, cursor=cursor).page_of(items)
+        pages.append(page)
+        if cursor is None:
+            break
+    assert pages == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_page_of_without_limit_is_whole_list():
+    assert make_query().page_of([1, 2, 3]) == ([1, 2, 3], None)
+    # Cursor no fim exato da lista: página vazia, sem próxima
+    assert make_query(limit=2, cursor="3").page_of([1, 2, 3]) == ([], None)
+
+
+@pytest.mark.parametrize("cursor", ["-1", "abc", "1.a-b", ".ab"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as error:
+        make_query(cursor=cursor)
+    assert error.value.status_code == 400
+
+
+def test_cursor_out_of_range():
+    with pytest.raises(HTTPException) as error:
+        make_query(limit=2, cursor="4").page_of([1, 2, 3])
+    assert error.value.status_code == 400
+
+
+def test_cursor_carries_data_version():
+    items = list(range(7))
+    page, cursor = make_query(limit=3).page_of(items, version="v1")
+    assert page == [0, 1, 2] and cursor.startswith("3.")
+    assert make_query(limit=3, cursor=cursor).page_of(items, version="v1") == ([3, 4, 5], cursor.replace("3.", "6."))
+
+    # Dados mudaram (ou lista encolheu) desde a página anterior: 409, não 400
+    for stale in [cursor, "3"]:
+        with pytest.raises(HTTPException) as error:
+            make_query(limit=3, cursor=stale).page_of(items[:2], version="v2")
+        assert error.value.status_code == 409
+
+
+def test_key_identifies_page_and_projection():
+    assert make_query(limit=5).key != make_query(limit=5, cursor="5").key
+    assert make_query(limit=5, cursor="5.aa").key != make_query(limit=5, cursor="5.bb").key
+    assert make_query(limit=5).key != make_query(limit=5, fields="name").key
+
+
+def test_parse_fields_and_project():
+    plan = parse_fields("player_id, stats.tackles,stats.sacks,name,")
+    assert plan == {"player_id": None, "stats": {"tackles", "sacks"}, "name": None}
+    # Campo inteiro prevalece sobre o aninhado
+    assert parse_fields("stats.tackles,stats") == {"stats": None}
+    assert parse_fields("") is None and parse_fields(",") is None
+
+    items = [{"player_id": "a", "name": "A", "stats": {"tackles": 5, "sacks": 1, "ints": 0}, "team": "X"}]
+    assert project(items, plan) == [{"player_id": "a", "stats": {"tackles": 5, "sacks": 1}, "name": "A"}]
+    assert project(items, None) is items
+
+
+def test_payload_counts():
+    query = make_query(limit=2, fields="id")
+    payload = query.payload([{"id": i, "x": i} for i in range(5)])
+    assert payload == {"count": 2, "total": 5, "next_cursor": "2", "players": [{"id": 0}, {"id": 1}]}
+    assert query.wants("id") and not query.wants("x")
+
+
+@pytest.mark.parametrize("path", [
+    f"/api/stats/offense?season={SEASON}",
+    f"/api/stats/defense?season={SEASON}",
+    f"/api/dynasty-pulse/values?season={SEASON}",
+])
+def test_api_cursor_walk_matches_full_list(client, path):
+    full = client.get(path).json()
+    assert full["next_cursor"] is None and full["count"] == full["total"]
+
+    players, cursor = [], None
+    while True:
+        url = f"{path}&limit=7" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(url).json()
+        assert page["total"] == full["total"] and page["count"] <= 7
+        players.extend(page["players"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # Páginas seguidas reconstroem a lista inteira, na mesma ordem e sem repetir
+    assert players == full["players"]
+
+
+def test_api_top_n_and_fields(client):
+    path = f"/api/dynasty-pulse/values?season={SEASON}"
+    full = client.get(path).json()["players"]
+    top = client.get(f"{path}&limit=3&fields=player_id,display_value").json()
+    assert top["players"] == [
+        {"player_id": player["player_id"], "display_value": player["display_value"]} for player in full[:3]
+    ]
+
+
+def test_api_invalid_cursor(client):
+    base = f"/api/stats/offense?season={SEASON}&limit=5"
+    tag = client.get(base).json()["next_cursor"].partition(".")[2]
+    assert client.get(f"{base}&cursor=nope").status_code == 400
+    assert client.get(f"{base}&cursor=100000.{tag}").status_code == 400
+    assert client.get(f"/api/stats/offense?season={SEASON}&limit=0").status_code == 422
+
+
+@pytest.mark.parametrize("path", [
+    f"/api/stats/offense?season={SEASON}",
+    f"/api/dynasty-pulse/values?season={SEASON}",
+])
+def test_api_cursor_is_stale_after_refresh(client, path):
+    cursor = client.get(f"{path}&limit=5").json()["next_cursor"]
+    assert client.get(f"{path}&limit=5&cursor={cursor}").status_code == 200
+
+    # Stats regravadas (refresh): a ordem mudou, o cursor antigo não vale mais
+    seed_season(players=40, seed=2)
+    assert client.get(f"{path}&limit=5&cursor={cursor}").status_code == 409
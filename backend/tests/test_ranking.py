@@ -0,0 +1,142 @@
+"""Ranks posicionais, percentis e consultas por rank (ValueTable.at_rank)"""
+
+import numpy as np
+import pytest
+
+from conftest import SEASON
+from dynasty_pulse.batch import position_codes
+from dynasty_pulse.ranking import parse_rank, rank_players
+from value_table import ValueTable
+
+
+def make_table(players: list[tuple[str, str, int]]) -> ValueTable:
+    return ValueTable(None, {
+        player_id: {"player_id": player_id, "position": position, "final_value": value}
+        for player_id, position, value in players
+    })
+
+
+def test_rank_players_single_sort():
+    values = np.array([10.0, 50.0, 30.0, 50.0, 20.0])
+    codes = position_codes(["WR", "QB", "WR", "WR", "QB"])
+    ranks = rank_players(values, codes)
+
+    # Empate mantém a ordem do pool
+    assert ranks["order"].tolist() == [1, 3, 2, 4, 0]
+    assert ranks["overall_rank"].tolist() == [5, 1, 3, 2, 4]
+    assert ranks["pos_rank"].tolist() == [3, 1, 2, 1, 2]
+    assert ranks["groups"][codes[0]].tolist() == [3, 2, 0]
+    assert ranks["percentile"][3] == 100.0
+    # O 1º de cada posição é sempre elite, mesmo em grupos pequenos
+    assert ranks["percentile_tier"].tolist() == ["replacement", "elite", "depth", "elite", "replacement"]
+
+
+def test_percentile_tier_cutoffs():
+    codes = position_codes(["WR"] * 100)
+    ranks = rank_players(np.arange(100, 0, -1, dtype=float), codes)
+    tiers = ranks["percentile_tier"]
+    assert set(tiers[:5]) == {"elite"} and tiers[5] == "star"
+    assert tiers[14] == "star" and tiers[15] == "starter"
+    assert tiers[49] == "depth" and tiers[50] == "replacement"
+
+
+@pytest.mark.parametrize("label, expected", [
+    ("WR24", ("WR", 24)),
+    ("wr3", ("WR", 3)),
+    (" 7 ", (None, 7)),
+    ("WR0", None),
+    ("W-R1", None),
+    ("24WR", None),
+])
+def test_parse_rank(label, expected):
+    assert parse_rank(label) == expected
+
+
+def test_value_table_at_rank():
+    table = make_table([("a", "WR", 100), ("b", "QB", 300), ("c", "WR", 200), ("d", "TE", 50)])
+    assert [p["player_id"] for p in table.ranked()] == ["b", "c", "a", "d"]
+    assert table.at_rank(1)["player_id"] == "b"
+    assert table.at_rank(2, "wr")["player_id"] == "a"
+    assert table.at_rank(2, "WR")["pos_rank"] == 2
+    assert table.values["c"]["overall_rank"] == 2
+    assert table.at_rank(3, "WR") is None
+    assert table.at_rank(0) is None
+    assert table.at_rank(1, "K") is None
+
+
+def test_rank_endpoint(client):
+    players = client.get(f"/api/dynasty-pulse/values?season={SEASON}").json()["players"]
+    assert [p["overall_rank"] for p in players] == list(range(1, len(players) + 1))
+    wrs = [p for p in players if p["position"] == "WR"]
+
+    response = client.get(f"/api/dynasty-pulse/values/rank/wr2?season={SEASON}")
+    assert response.status_code == 200
+    assert response.json()["player"]["player_id"] == wrs[1]["player_id"]
+    assert client.get(f"/api/dynasty-pulse/values/rank/5?season={SEASON}").json()["player"]["overall_rank"] == 5
+    assert client.get(f"/api/dynasty-pulse/values/rank/WR999?season={SEASON}").status_code == 404
+    assert client.get(f"/api/dynasty-pulse/values/rank/W-R?season={SEASON}").status_code == 400
+
+
+def test_league_player_ranks_match_league_values(client, sleeper):
+    # TE premium + meio PPR: a ordem ajustada difere da ordem base
+    sleeper.leagues["1001"] = {
+        "name": "TEP",
+        "total_rosters": 12,
+        "scoring_settings": {"rec": 0.5, "bonus_rec_te": 1.5, "pass_td": 6.0},
+        "roster_positions": ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "BN"],
+    }
+    fields = "player_id,overall_rank,pos_rank,percentile,percentile_tier,final_value"
+    league = client.get(f"/api/dynasty-pulse/league/1001/values?season={SEASON}&fields={fields}").json()["players"]
+    assert [p["overall_rank"] for p in league] == list(range(1, len(league) + 1))
+    base = client.get(f"/api/dynasty-pulse/values?season={SEASON}&fields=player_id,overall_rank").json()["players"]
+    base_rank = {p["player_id"]: p["overall_rank"] for p in base}
+    assert any(p["overall_rank"] != base_rank[p["player_id"]] for p in league)
+
+    for expected in league[:10] + league[-3:]:
+        player = client.get(f"/api/dynasty-pulse/league/1001/player/{expected['player_id']}?season={SEASON}").json()["player"]
+        assert {field: player[field] for field in expected} == expected
+
+
+def test_multi_season_position_filter_keeps_pool_ranks(client, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "get_default_seasons", lambda num_seasons: [SEASON])
+    url = "/api/dynasty-pulse/values/multi-season?fields=player_id,position,overall_rank,pos_rank,percentile"
+    pool = client.get(url).json()["players"]
+    wrs = client.get(f"{url}&position=wr").json()
+
+    expected = [player for player in pool if player["position"] == "WR"]
+    assert wrs["players"] == expected and wrs["total"] == len(expected)
+    assert [player["pos_rank"] for player in wrs["players"]] == list(range(1, len(expected) + 1))
+    assert any(player["overall_rank"] != player["pos_rank"] for player in wrs["players"])
+
+
+def test_league_player_outside_table_uses_league_replacement(client, sleeper, monkeypatch):
+    import main
+
+    # Liga rasa: replacement levels bem diferentes do REPLACEMENT_LEVEL padrão
+    sleeper.leagues["1002"] = {
+        "name": "Shallow",
+        "total_rosters": 4,
+        "scoring_settings": {"rec": 1.0},
+        "roster_positions": ["QB", "RB", "WR", "TE", "BN"],
+    }
+    top = client.get(f"/api/dynasty-pulse/league/1002/values?season={SEASON}&position=QB&limit=1").json()["players"][0]
+    url = f"/api/dynasty-pulse/league/1002/player/{top['player_id']}?season={SEASON}"
+    in_table = client.get(url).json()["player"]
+    assert in_table["base_value"] > 0
+
+    # Mesmo jogador fora do pool valorado: mesmo valor base da liga, sem ranks
+    get_value_table = main.get_value_table
+
+    async def without_player(*args):
+        table = await get_value_table(*args)
+        monkeypatch.setattr(table, "index", {})
+        return table
+
+    monkeypatch.setattr(main, "get_value_table", without_player)
+    fallback = client.get(url).json()["player"]
+    assert fallback["base_value"] == in_table["base_value"]
+    assert fallback["vorp"] == in_table["vorp"]
+    assert fallback["overall_rank"] is None and fallback["percentile_tier"] is None
+    assert client.get(f"/api/dynasty-pulse/league/1002/player/nobody?season={SEASON}").status_code == 404
@@ -0,0 +1,68 @@
+"""Respostas pré-serializadas: ETag/304, variantes comprimidas e contadores"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import response_cache
+from serialization import loads
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    monkeypatch.setattr(response_cache, "_stats", {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0})
+    response_cache.clear_response_cache()
+    state = {"version": 1, "builds": 0}
+    app = FastAPI()
+
+    @app.get("/payload")
+    async def payload(request: Request):
+        def build():
+            state["builds"] += 1
+            return {"version": state["version"], "players": list(range(500))}
+
+        return await response_cache.cached_json_response(request, ("payload",), state["version"], build)
+
+    with TestClient(app) as client:
+        client.state = state
+        yield client
+    response_cache.clear_response_cache()
+
+
+def test_etag_and_not_modified(app_client):
+    first = app_client.get("/payload", headers={"Accept-Encoding": "identity"})
+    etag = first.headers["ETag"]
+    assert loads(first.content)["version"] == 1
+
+    assert app_client.get("/payload", headers={"If-None-Match": etag}).status_code == 304
+    gz = app_client.get("/payload", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["Content-Encoding"] in ("gzip", "br")
+    assert app_client.state["builds"] == 1
+
+    # Nova versão dos dados: novo build, ETag antigo deixa de valer
+    app_client.state["version"] = 2
+    second = app_client.get("/payload", headers={"If-None-Match": etag})
+    assert second.status_code == 200 and second.headers["ETag"] != etag
+    assert app_client.state["builds"] == 2
+
+
+def test_gzip_body_matches_identity(app_client):
+    identity = app_client.get("/payload", headers={"Accept-Encoding": "identity"}).content
+    raw = app_client.get("/payload", headers={"Accept-Encoding": "gzip;q=1, br;q=0"})
+    assert raw.headers["Content-Encoding"] == "gzip"
+    # httpx decodifica o gzip: o corpo tem que ser o mesmo JSON
+    assert raw.content == identity
+
+
+def test_counters_are_consistent_under_concurrency(app_client):
+    requests = 64
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(lambda _: app_client.get("/payload").status_code, range(requests)))
+    assert statuses == [200] * requests
+
+    stats = response_cache.get_response_cache_stats()
+    assert stats["hits"] + stats["misses"] == requests
+    assert stats["entries"] == 1
+    assert app_client.state["builds"] == 1
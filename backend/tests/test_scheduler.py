@@ -0,0 +1,162 @@
+"""Scheduler de refresh: vencimento, backoff e ordem dos jobs (relógio e expiry falsos)"""
+
+import asyncio
+
+import pytest
+
+import scheduler
+
+AHEAD = 600
+INTERVAL = 300
+TTL = 3600
+
+
+class FakeClock:
+    """Substitui o módulo time do scheduler"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(scheduler, "time", fake)
+    monkeypatch.setattr(scheduler, "CACHE_REFRESH_AHEAD", AHEAD)
+    monkeypatch.setattr(scheduler, "CACHE_REFRESH_INTERVAL", INTERVAL)
+    monkeypatch.setattr(scheduler, "CACHE_REFRESH_JITTER", 0)
+    monkeypatch.setattr(scheduler, "get_ttl_for_key", lambda key: TTL)
+    return fake
+
+
+@pytest.fixture
+def expiry(monkeypatch):
+    """expiry[(key, season)] = momento em que a entrada expira (ausente = sem cache)"""
+    expiries: dict[tuple[str, int], float] = {}
+    monkeypatch.setattr(scheduler, "get_cache_expiry", lambda key, season: expiries.get((key, season)))
+    return expiries
+
+
+def make_job(clock, expiry, outcome="refresh"):
+    """Job cujo refresh renova a entrada por TTL, falha ou não muda nada"""
+    calls = []
+
+    async def refresh():
+        calls.append(clock.now)
+        if outcome == "error":
+            raise RuntimeError("upstream down")
+        if outcome == "refresh":
+            expiry[("nflverse_rosters", 2024)] = clock.now + TTL
+
+    job = scheduler._RefreshJob("nflverse_rosters", 2024, refresh, (0, 0))
+    job.calls = calls
+    return job
+
+
+def test_is_due(clock, expiry):
+    job = make_job(clock, expiry)
+    assert job.is_due(clock.now)  # sem cache: vence já
+
+    expiry[("nflverse_rosters", 2024)] = clock.now + AHEAD + 1
+    assert not job.is_due(clock.now)
+    assert job.is_due(clock.now + 1)
+
+    # Jitter adianta o refresh da entrada
+    job.jitter = 10
+    assert job.is_due(clock.now - 9)
+
+    # Em backoff não vence, mesmo expirada
+    job.retry_at = clock.now + 50
+    assert not job.is_due(clock.now + 49)
+    assert job.is_due(clock.now + 50)
+
+
+def test_successful_refresh_resets_failures(clock, expiry):
+    job = make_job(clock, expiry)
+    job.failures, job.last_error = 2, "old"
+    assert asyncio.run(job.run())
+    assert (job.failures, job.retry_at, job.last_error) == (0, 0.0, None)
+    assert not job.is_due(clock.now)
+
+
+@pytest.mark.parametrize("outcome, error", [
+    ("error", "RuntimeError: upstream down"),
+    ("unchanged", "entrada não foi atualizada"),
+])
+def test_failed_refresh_backs_off_exponentially(clock, expiry, outcome, error):
+    job = make_job(clock, expiry, outcome)
+    expiry[("nflverse_rosters", 2024)] = clock.now + 10
+
+    retries = []
+    for _ in range(5):
+        assert not asyncio.run(job.run())
+        retries.append(job.retry_at - clock.now)
+        assert not job.is_due(clock.now)
+        clock.now = job.retry_at
+        assert job.is_due(clock.now)
+
+    assert job.last_error == error and job.failures == 5
+    # INTERVAL * 2^falhas, limitado pelo TTL da entrada
+    assert retries == [600, 1200, 2400, TTL, TTL]
+
+
+def test_run_due_jobs_runs_due_jobs_in_priority_order(clock, expiry, monkeypatch):
+    order = []
+
+    def job(key, priority, expires_in):
+        async def refresh():
+            order.append(key)
+            expiry[(key, 0)] = clock.now + TTL
+
+        expiry[(key, 0)] = clock.now + expires_in
+        return scheduler._RefreshJob(key, 0, refresh, priority)
+
+    jobs = [job("fresh", (0, 0), AHEAD + 100), job("late", (0, 2), 5), job("early", (0, 1), 0)]
+    monkeypatch.setattr(scheduler, "_jobs", sorted(jobs, key=lambda j: j.priority))
+    monkeypatch.setattr(scheduler, "_state", {"seasons": [], "runs": 0, "last_run": None})
+
+    run = asyncio.run(scheduler.run_due_jobs(clock.now))
+    assert order == ["early", "late"]
+    assert (run["refreshed"], run["failed"]) == (2, 0)
+    assert asyncio.run(scheduler.run_due_jobs(clock.now))["refreshed"] == 0
+
+
+def job_keys(jobs):
+    return [(job.key, job.season) for job in jobs]
+
+
+def test_build_jobs_order_without_tank01(monkeypatch):
+    monkeypatch.setattr(scheduler, "PRIMARY_SOURCE", "nflverse")
+    monkeypatch.setattr(scheduler, "is_tank01_configured", lambda: True)
+    assert job_keys(scheduler.build_jobs([2022, 2024, 2023, 2024])) == [
+        (key, season)
+        for season in (2024, 2023, 2022)
+        for key in ("nflverse_rosters", "nflverse_player_stats", "nflverse_player_stats_def")
+    ]
+
+
+@pytest.mark.parametrize("configured", [True, False])
+def test_build_jobs_tank01_gating(monkeypatch, configured):
+    monkeypatch.setattr(scheduler, "PRIMARY_SOURCE", "Tank01")
+    monkeypatch.setattr(scheduler, "is_tank01_configured", lambda: configured)
+    keys = job_keys(scheduler.build_jobs([2023, 2024]))
+
+    tank01 = [key for key in keys if key[0].startswith("tank01")]
+    if not configured:
+        assert tank01 == []
+        return
+    # Sweep dos times antes de tudo; depois, por temporada: tank01, roster, stats
+    assert keys[:4] == [
+        ("tank01_all_players", 0),
+        ("tank01_off_stats_2024", 0),
+        ("tank01_def_stats_2024", 0),
+        ("nflverse_rosters", 2024),
+    ]
+    assert ("tank01_off_stats_2023", 0) in keys[4:] and len(tank01) == 5
+    assert scheduler.build_jobs([]) == []
@@ -0,0 +1,65 @@
+"""Contrato NaN/Infinity -> 0.0 (sanitizado na ingestão, serializado em uma passada)"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+import cache
+from conftest import SEASON
+from dynasty_pulse import calculate_all_player_values_batch
+from serialization import dumps, loads
+
+
+def walk_floats(obj):
+    if isinstance(obj, dict):
+        for value in obj.values():
+            yield from walk_floats(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from walk_floats(item)
+    elif isinstance(obj, float):
+        yield obj
+
+
+def test_dumps_roundtrip_numpy_and_int_keys():
+    payload = {1: np.float64(1.5), "a": np.arange(3), "b": [np.int64(2)]}
+    assert loads(dumps(payload)) == {"1": 1.5, "a": [0, 1, 2], "b": [2]}
+
+
+def test_value_engine_outputs_finite_values():
+    players = [
+        {"id": "a", "position": "WR", "stats": {"receivingYards": math.inf, "games": 17}},
+        {"id": "b", "position": "RB", "stats": {"rushingYards": math.nan, "games": math.nan}},
+    ]
+    values = calculate_all_player_values_batch(players, [])
+    assert all(math.isfinite(v) for v in walk_floats(values))
+    assert values["a"]["ppg"] == 0.0
+
+
+def test_nan_and_inf_reach_the_api_as_zero(client):
+    frame = cache.read_cache_frame("nflverse_player_stats", SEASON).copy()
+    frame.loc[0, "receiving_yards"] = np.inf
+    frame.loc[1, "rushing_yards"] = np.nan
+    frame["receiving_tds"] = pd.Series([np.nan] * len(frame))
+    cache.write_cache_frame("nflverse_player_stats", SEASON, frame)
+
+    for url in (
+        f"/api/stats/offense?season={SEASON}",
+        f"/api/dynasty-pulse/values?season={SEASON}",
+    ):
+        body = client.get(url).json()
+        assert all(math.isfinite(v) for v in walk_floats(body))
+        players = body["players"]
+        assert players
+        assert all(value is not None for player in players for value in player.get("stats", {}).values())
+
+    offense = {p["id"]: p["stats"] for p in client.get(f"/api/stats/offense?season={SEASON}").json()["players"]}
+    assert offense["p00"]["receivingYards"] == 0
+    assert offense["p00"]["receivingTds"] == 0
+
+
+def test_cache_json_roundtrip(cache_dir):
+    cache.write_cache("nflverse_available_seasons", 0, [2024, 2023])
+    cache._memory_invalidate()
+    assert cache.read_cache("nflverse_available_seasons", 0) == [2024, 2023]
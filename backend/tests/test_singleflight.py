@@ -0,0 +1,120 @@
+"""Single-flight: trabalho concorrente pela mesma chave roda uma única vez"""
+
+import asyncio
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from singleflight import run_once, run_once_sync
+from sources import nflverse
+
+
+def test_run_once_coalesces_concurrent_callers():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"players": 3}
+
+    async def main():
+        return await asyncio.gather(*(run_once("cold", fetch) for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_run_once_reruns_after_completion_and_shares_errors():
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def main():
+        first = await asyncio.gather(*(run_once("err", failing) for _ in range(3)), return_exceptions=True)
+        second = await asyncio.gather(run_once("err", failing), return_exceptions=True)
+        return first + second
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    # Um fetch para os três concorrentes, outro para a chamada seguinte
+    assert len(calls) == 2
+
+
+def test_cancelling_a_caller_does_not_cancel_the_fetch():
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        cancelled = asyncio.create_task(run_once("shared", fetch))
+        waiting = asyncio.create_task(run_once("shared", fetch))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await waiting
+
+    assert asyncio.run(main()) == "done"
+
+
+def test_run_once_sync_coalesces_threads():
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return "frame"
+
+    def call(_):
+        barrier.wait()
+        return run_once_sync("sync_cold", fetch)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(call, range(8)))
+    assert results == ["frame"] * 8
+    assert len(calls) == 1
+
+
+def test_run_once_sync_propagates_leader_error():
+    barrier = threading.Barrier(4)
+
+    def fetch():
+        time.sleep(0.05)
+        raise ValueError("bad parquet")
+
+    def call(_):
+        barrier.wait()
+        try:
+            run_once_sync("sync_err", fetch)
+        except ValueError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(call, range(4))) == ["bad parquet"] * 4
+
+
+def test_cold_nflverse_download_happens_once(cache_dir, upstream, monkeypatch):
+    buffer = io.BytesIO()
+    pd.DataFrame({"player_id": ["p1"], "season": [2023], "week": [1], "passing_yards": [300.0]}).to_parquet(buffer)
+    upstream.routes["/player_stats_2023.parquet"] = (200, {}, buffer.getvalue())
+    monkeypatch.setattr(nflverse, "NFLVERSE_PLAYER_STATS_URL", upstream.url + "/player_stats_{season}.parquet")
+
+    barrier = threading.Barrier(6)
+
+    def call(_):
+        barrier.wait()
+        return nflverse.fetch_player_stats(2023)
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        frames = list(pool.map(call, range(6)))
+    assert all(frame["player_id"].tolist() == ["p1"] for frame in frames)
+    assert len(upstream.requests) == 1
@@ -0,0 +1,91 @@
+"""Ligas do Sleeper: validação de IDs, cache e endpoint em lote"""
+
+import asyncio
+
+import pytest
+
+from config import SLEEPER_MAX_BATCH
+from conftest import SEASON, expire
+from sources import sleeper as sleeper_source
+
+LEAGUE = {
+    "name": "Test League",
+    "total_rosters": 12,
+    "scoring_settings": {"rec": 1.0, "pass_td": 4.0},
+    "roster_positions": ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "BN"],
+}
+
+
+@pytest.mark.parametrize("league_id", ["../../etc", "abc", "12a", "１２"])
+def test_source_rejects_non_numeric_ids(cache_dir, sleeper, league_id):
+    assert asyncio.run(sleeper_source.get_league(league_id)) is None
+    assert asyncio.run(sleeper_source.get_leagues([league_id])) == ({league_id: None}, [])
+    assert sleeper.requests == []
+
+
+def test_league_is_fetched_once_then_cached(cache_dir, sleeper):
+    sleeper.leagues["1001"] = LEAGUE
+
+    async def fetch_concurrently():
+        return await asyncio.gather(*(sleeper_source.get_league("1001") for _ in range(5)))
+
+    assert all(league == LEAGUE for league in asyncio.run(fetch_concurrently()))
+    assert asyncio.run(sleeper_source.get_leagues(["1001", "1001", "404"])) == ({"1001": LEAGUE, "404": None}, [])
+    assert [path for path, _ in sleeper.requests] == ["/league/1001", "/league/404"]
+
+
+def test_batch_endpoint_validates_league_ids(client, sleeper):
+    url = "/api/dynasty-pulse/leagues/values"
+    assert client.post(url, json={"league_ids": ["../../x"]}).status_code == 422
+    assert client.post(url, json={"league_ids": ["1"] * (SLEEPER_MAX_BATCH + 1)}).status_code == 422
+    assert client.post(url, json={"league_ids": []}).status_code == 422
+    assert client.get("/api/dynasty-pulse/league/abc/info").status_code == 422
+    assert client.get(f"/api/dynasty-pulse/league/1x/values?season={SEASON}").status_code == 422
+    assert sleeper.requests == []
+
+
+def test_batch_endpoint(client, sleeper):
+    sleeper.leagues["1001"] = LEAGUE
+    body = client.post(
+        "/api/dynasty-pulse/leagues/values?limit=3&fields=player_id,overall_rank",
+        json={"league_ids": ["1001", "2002"], "season": SEASON},
+    ).json()
+    assert body["not_found"] == ["2002"] and body["unavailable"] == []
+    assert [league["league_id"] for league in body["leagues"]] == ["1001"]
+    assert [p["overall_rank"] for p in body["leagues"][0]["players"]] == [1, 2, 3]
+    assert client.get("/api/dynasty-pulse/league/2002/info").status_code == 404
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_gone_league_is_not_found(cache_dir, sleeper, status):
+    sleeper.statuses["1001"] = status
+    assert asyncio.run(sleeper_source.get_league("1001")) is None
+
+
+@pytest.mark.parametrize("status", [408, 429, 503])
+def test_transient_errors_serve_stale_league(cache_dir, sleeper, status):
+    sleeper.leagues["1001"] = LEAGUE
+    assert asyncio.run(sleeper_source.get_league("1001")) == LEAGUE
+
+    # Expirada e o Sleeper falhando: a versão em cache continua valendo
+    expire("sleeper_league_1001", 0)
+    sleeper.statuses["1001"] = status
+    assert asyncio.run(sleeper_source.get_league("1001")) == LEAGUE
+    assert len(sleeper.requests) == 2
+
+
+def test_rate_limited_league_is_unavailable_not_missing(client, sleeper):
+    sleeper.leagues["1001"] = LEAGUE
+    sleeper.statuses["3003"] = 429
+
+    with pytest.raises(sleeper_source.SleeperUnavailableError):
+        asyncio.run(sleeper_source.get_league("3003"))
+    assert client.get("/api/dynasty-pulse/league/3003/info").status_code == 503
+
+    body = client.post(
+        "/api/dynasty-pulse/leagues/values?limit=1",
+        json={"league_ids": ["1001", "3003", "2002"], "season": SEASON},
+    ).json()
+    assert [league["league_id"] for league in body["leagues"]] == ["1001"]
+    assert body["not_found"] == ["2002"]
+    assert body["unavailable"] == ["3003"]
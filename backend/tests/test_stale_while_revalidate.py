@@ -0,0 +1,57 @@
+"""Stale-while-revalidate / stale-if-error das stats (orquestrador)"""
+
+import io
+import time
+
+import cache
+from conftest import SEASON, expire
+from sources import nflverse
+
+STATS_KEY = "nflverse_player_stats"
+URL = f"/api/stats/offense?season={SEASON}"
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_expired_stats_are_served_when_upstream_fails(client):
+    fresh = client.get(URL).json()
+    expire(STATS_KEY, SEASON)
+
+    # Upstream inacessível (fixture offline): o cache expirado continua servindo
+    for _ in range(2):
+        stale = client.get(URL).json()
+        assert stale["players"] == fresh["players"]
+        assert stale["cached"] is True
+        assert stale["cache_age_seconds"] >= cache.TTL_NFLVERSE
+
+
+def test_expired_stats_are_served_then_refreshed_in_background(client, upstream, monkeypatch):
+    before = client.get(URL).json()["players"]
+    frame = cache.read_cache_frame(STATS_KEY, SEASON).copy()
+    frame["receiving_yards"] = 999.0
+    buffer = io.BytesIO()
+    frame.to_parquet(buffer, index=False)
+    upstream.routes[f"/player_stats_{SEASON}.parquet"] = (200, {}, buffer.getvalue())
+    monkeypatch.setattr(nflverse, "NFLVERSE_PLAYER_STATS_URL", upstream.url + "/player_stats_{season}.parquet")
+
+    expire(STATS_KEY, SEASON)
+    started = time.monotonic()
+    stale = client.get(URL).json()
+    # Resposta imediata com os dados antigos; o download roda em background
+    assert stale["players"] == before
+    assert time.monotonic() - started < 2
+
+    def refreshed() -> bool:
+        players = client.get(URL).json()["players"]
+        return bool(players) and all(p["stats"]["receivingYards"] == 999 for p in players)
+
+    assert wait_for(refreshed)
+    assert len(upstream.requests) == 1
+    assert cache.get_cache_version(STATS_KEY, SEASON) is not None
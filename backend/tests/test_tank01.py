@@ -0,0 +1,61 @@
+"""Sweep dos 32 rosters da Tank01: cache completo e cache curto do parcial"""
+
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import cache
+from conftest import expire
+from sources import tank01
+
+
+@pytest.fixture
+def rapidapi(cache_dir, upstream, monkeypatch):
+    """Tank01 local: upstream.failing = times que respondem 403"""
+    monkeypatch.setattr(tank01, "RAPIDAPI_KEY", "test-key")
+    monkeypatch.setattr(tank01, "TANK01_BASE_URL", upstream.url)
+    monkeypatch.setattr(tank01, "TANK01_MAX_RETRIES", 0)
+    upstream.failing = set()
+
+    def respond(path: str) -> tuple[int, dict, bytes]:
+        team = parse_qs(urlsplit(path).query)["teamAbv"][0]
+        if team in upstream.failing:
+            return 403, {}, b"{}"
+        roster = [{"playerID": f"{team}1", "pos": "LB", "team": team}]
+        return 200, {"Content-Type": "application/json"}, json.dumps({"body": {"roster": roster}}).encode()
+
+    monkeypatch.setattr(upstream, "respond", respond)
+    return upstream
+
+
+def sweep() -> tuple[list[dict], list[str]]:
+    return asyncio.run(tank01._fetch_all_players_with_stats())
+
+
+def test_full_sweep_is_cached(rapidapi):
+    players, failed = sweep()
+    assert len(players) == 32 and failed == []
+    assert sweep()[0] == players
+    assert len(rapidapi.requests) == 32
+
+
+def test_partial_sweep_is_cached_briefly(rapidapi):
+    rapidapi.failing = {"KC"}
+    players, failed = sweep()
+    assert len(players) == 31 and failed == ["KC"]
+
+    # Cold requests dentro do TTL curto não refazem as 32 chamadas
+    assert sweep() == (players, ["KC"])
+    assert len(rapidapi.requests) == 32
+    assert cache.read_cache(tank01.ALL_PLAYERS_KEY, 0) is None
+    assert cache.get_ttl_for_key(tank01.PARTIAL_PLAYERS_KEY) == cache.TTL_TANK01_PARTIAL < cache.TTL_TANK01
+
+    # Expirado o parcial, um novo sweep completo substitui o cache
+    expire(tank01.PARTIAL_PLAYERS_KEY, 0)
+    rapidapi.failing = set()
+    players, failed = sweep()
+    assert len(players) == 32 and failed == []
+    assert len(rapidapi.requests) == 64
+    assert sweep()[1] == []
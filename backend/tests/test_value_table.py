@@ -0,0 +1,37 @@
+"""Tabela de valores: busca das stats da temporada e memoização por versão"""
+
+import asyncio
+from types import SimpleNamespace
+
+import value_table
+from conftest import SEASON, seed_season
+
+
+def test_season_stats_fetches_offense_and_defense_concurrently(monkeypatch):
+    started = {}
+
+    async def fake_fetch(kind: str, other: str):
+        started[kind].set()
+        # Sequencial, o outro lado nunca começaria antes do timeout
+        await asyncio.wait_for(started[other].wait(), timeout=1)
+        return SimpleNamespace(players=[], version=(kind, 1))
+
+    async def run():
+        started.update(offense=asyncio.Event(), defense=asyncio.Event())
+        return await value_table._season_stats(SEASON)
+
+    monkeypatch.setattr(value_table, "get_offensive_stats", lambda season: fake_fetch("offense", "defense"))
+    monkeypatch.setattr(value_table, "get_defensive_stats", lambda season: fake_fetch("defense", "offense"))
+    offense, defense, version = asyncio.run(run())
+    assert version == (("offense", 1), ("defense", 1))
+
+
+def test_value_table_is_memoized_per_stats_version(cache_dir):
+    seed_season()
+
+    async def tables():
+        return await value_table.get_value_table(SEASON), await value_table.get_value_table(SEASON)
+
+    first, second = asyncio.run(tables())
+    assert first is second
+    assert first.players and first.version is not None
@@ -0,0 +1,192 @@
+"""
+Value Table - Valores Dynasty Pulse materializados por variante de liga
+
+calculate_all_player_values recalcula PPG, VORP, tiers, fator de idade e
+janela dynasty de todos os jogadores, mas as entradas só mudam quando o
+cache de stats é reescrito. A tabela é calculada uma vez por
+(season, superflex, tep) e reaproveitada enquanto a versão das stats
+(StatsResult.version de ofensa e defesa) for a mesma.
+
+O caminho quente vira um filtro + fatia de uma lista já ordenada, e a
+construção usa o engine vetorizado (dynasty_pulse.batch). As colunas
+final_value/posição servem aos ajustes de liga (ScoringProfile.apply), e
+a mesma ordenação dá overall_rank/pos_rank/percentile de cada jogador
+(consulta por rank, ex: "WR24", em O(1) via at_rank).
+
+Pelo mesmo critério de versão, a matriz de stats da temporada
+(dynasty_pulse.league_points) é montada uma vez e serve os pontos exatos
+de qualquer número de ligas, e dela saem os replacement levels de cada
+formato de roster (RosterShape). Tabelas de ligas com roster_shape ficam
+num LRU (VALUE_TABLE_MAX_LEAGUE_SHAPES), já que cada formato de liga é uma
+variante nova.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from config import VALUE_TABLE_MAX_LEAGUE_SHAPES
+from dynasty_pulse import StatMatrix, build_stat_matrix, calculate_all_player_values_batch
+from dynasty_pulse.batch import position_codes
+from dynasty_pulse.ranking import rank_fields, rank_players
+from dynasty_pulse.replacement import RosterShape
+from executor import run_blocking
+from singleflight import run_once
+from stats import get_defensive_stats, get_offensive_stats
+
+
+class ValueTable:
+    """Valores de uma variante (season, superflex, tep), pré-ordenados"""
+
+    def __init__(self, version: Optional[tuple], values: dict[str, dict]):
+        self.version = version
+        # player_id -> breakdown (mesma ordem de calculate_all_player_values)
+        self.values = values
+
+        # Colunas na ordem de values (não ordenadas), para ajustes vetorizados
+        self.rows = list(values.values())
+        self.index = {player_id: i for i, player_id in enumerate(values)}
+        self.final_values = np.array([p.get("final_value", 0) for p in self.rows], dtype=float)
+        self.position_codes = position_codes([p.get("position") or "" for p in self.rows])
+        self._row_index: dict[str, list[int]] = {}
+        for i, player in enumerate(self.rows):
+            self._row_index.setdefault(player.get("position"), []).append(i)
+
+        # Uma ordenação (final_value desc, estável, igual ao endpoint antigo)
+        # dá a lista ordenada e os ranks, gravados em cada breakdown
+        self.ranks = rank_players(self.final_values, self.position_codes)
+        for i, player in enumerate(self.rows):
+            player.update(rank_fields(self.ranks, i))
+        self.players = [self.rows[i] for i in self.ranks["order"]]
+        self.by_position: dict[str, list[dict]] = {}
+        for player in self.players:
+            self.by_position.setdefault(player.get("position"), []).append(player)
+
+    def ranked(self, position: Optional[str] = None) -> list[dict]:
+        """Jogadores por valor (maior primeiro), opcionalmente de uma posição"""
+        if position:
+            return self.by_position.get(position.upper(), [])
+        return self.players
+
+    def at_rank(self, rank: int, position: Optional[str] = None) -> Optional[dict]:
+        """Jogador em um rank 1-based (ex: at_rank(24, "WR") = WR24), ou None"""
+        ranked = self.ranked(position)
+        return ranked[rank - 1] if 1 <= rank <= len(ranked) else None
+
+    def columns(self, position: Optional[str] = None) -> tuple[list[dict], np.ndarray, np.ndarray]:
+        """(jogadores, final_value, códigos de posição) na ordem de values, opcionalmente de uma posição"""
+        if not position:
+            return self.rows, self.final_values, self.position_codes
+        index = np.array(self._row_index.get(position.upper(), []), dtype=np.intp)
+        return [self.rows[i] for i in index], self.final_values[index], self.position_codes[index]
+
+
+# (season, superflex, tep) -> ValueTable (replacement padrão)
+_tables: dict[tuple[int, bool, bool], ValueTable] = {}
+# (season, superflex, tep, shape) -> ValueTable, em ordem de uso
+_league_tables: "OrderedDict[tuple, ValueTable]" = OrderedDict()
+
+
+def _build_table(version: Optional[tuple], offensive_players: list[dict], defensive_players: list[dict],
+                 superflex: bool, tep: bool, replacement: Optional[np.ndarray] = None) -> ValueTable:
+    values = calculate_all_player_values_batch(
+        offensive_players=offensive_players,
+        defensive_players=defensive_players,
+        is_superflex=superflex,
+        is_tep=tep,
+        replacement=replacement,
+    )
+    return ValueTable(version, values)
+
+
+def _get_table(key: tuple) -> Optional[ValueTable]:
+    if len(key) == 3:
+        return _tables.get(key)
+    table = _league_tables.get(key)
+    if table is not None:
+        _league_tables.move_to_end(key)
+    return table
+
+
+def _put_table(key: tuple, table: ValueTable) -> None:
+    if len(key) == 3:
+        _tables[key] = table
+        return
+    _league_tables[key] = table
+    _league_tables.move_to_end(key)
+    while len(_league_tables) > VALUE_TABLE_MAX_LEAGUE_SHAPES:
+        _league_tables.popitem(last=False)
+
+
+async def _season_stats(season: int):
+    """(ofensa, defesa, versão) da temporada; versão None = stats fora do cache"""
+    # Busca ofensa e defesa em paralelo: cache frio custa a mais lenta, não a soma
+    offense_result, defense_result = await asyncio.gather(
+        get_offensive_stats(season),
+        get_defensive_stats(season),
+    )
+
+    version = (offense_result.version, defense_result.version)
+    if None in version:
+        version = None  # Stats fora do cache: não memoiza
+    return offense_result, defense_result, version
+
+
+async def get_value_table(
+    season: int,
+    superflex: bool = False,
+    tep: bool = False,
+    shape: Optional[RosterShape] = None,
+) -> ValueTable:
+    """
+    Retorna a tabela de valores da variante, recalculando apenas quando
+    o cache de stats de origem mudou (ou não está em cache)
+    shape: roster_shape da liga; o VORP usa os replacement levels derivados
+    do pool da temporada em vez de REPLACEMENT_LEVEL
+    """
+    offense_result, defense_result, version = await _season_stats(season)
+
+    key = (season, superflex, tep) if shape is None else (season, superflex, tep, shape)
+    table = _get_table(key)
+    if version is not None and table is not None and table.version == version:
+        return table
+
+    replacement = None
+    if shape is not None:
+        replacement = (await get_stat_matrix(season)).replacement_levels(shape)
+
+    async def build() -> ValueTable:
+        built = await run_blocking(
+            _build_table, version, offense_result.players, defense_result.players, superflex, tep, replacement
+        )
+        if version is not None:
+            _put_table(key, built)
+        return built
+
+    return await run_once(f"value_table_{key}_{version}", build)
+
+
+# season -> (versão, StatMatrix)
+_matrices: dict[int, tuple[tuple, StatMatrix]] = {}
+
+
+async def get_stat_matrix(season: int) -> StatMatrix:
+    """
+    Matriz de stats da temporada (pontos exatos por liga), recalculada
+    apenas quando o cache de stats de origem mudou
+    """
+    offense_result, defense_result, version = await _season_stats(season)
+
+    cached = _matrices.get(season)
+    if version is not None and cached is not None and cached[0] == version:
+        return cached[1]
+
+    async def build() -> StatMatrix:
+        matrix = await run_blocking(build_stat_matrix, offense_result.players, defense_result.players)
+        if version is not None:
+            _matrices[season] = (version, matrix)
+        return matrix
+
+    return await run_once(f"stat_matrix_{season}_{version}", build)